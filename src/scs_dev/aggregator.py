@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Created on 15 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The aggregator utility is used to reduce a stream of samples to windowed statistics, before publication. Samples are
+presented as a sequence of JSON documents on stdin, and a window document is written to stdout for each window.
+
+In the window document, each numeric leaf of the samples is replaced by its mean, min, max, stdev and count over the
+window, and the rec is the end of the window. Other leaves take their latest value in the window. Windows are aligned
+to the step - for example, one-minute windows end on the minute - and are timed by the rec field of the samples.
+
+By default, windows are tumbling: each sample falls in exactly one window. If a step is specified, windows are sliding:
+a window of the given length is emitted at every step. A window is emitted when the first sample after its end is
+received, and any incomplete window is emitted when the input closes. Statistics are updated incrementally, as each
+sample is received.
+
+Typically, the aggregator is placed between a sampler and a topic publisher, with raw samples logged by the csv_logger
+utility.
+
+SYNOPSIS
+aggregator.py -w WINDOW [-s STEP] [-v]
+
+EXAMPLES
+./gases_sampler.py -i5 | ./csv_logger.py -e gases | ./aggregator.py -w60 | ./aws_topic_publisher.py -cG -p
+
+./climate_sampler.py -i10 | ./aggregator.py -w600 -s60
+
+DOCUMENT EXAMPLE - INPUT
+{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:05.000+00:00", "val": {"hmd": 59.6, "tmp": 23.8}}
+{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:35.000+00:00", "val": {"hmd": 59.8, "tmp": 23.9}}
+
+DOCUMENT EXAMPLE - OUTPUT (WINDOW 60)
+{"tag": "scs-ap1-6", "rec": "2018-04-04T14:51:00.000+00:00",
+"val": {"hmd": {"mean": 59.7, "min": 59.6, "max": 59.8, "stdev": 0.14, "count": 2},
+"tmp": {"mean": 23.85, "min": 23.8, "max": 23.9, "stdev": 0.07, "count": 2}}}
+
+SEE ALSO
+scs_dev/aws_topic_publisher
+scs_dev/csv_logger
+scs_dev/node
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+
+from scs_dev.cmd.cmd_aggregator import CmdAggregator
+from scs_dev.data.window_aggregator import WindowAggregator
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    aggregator = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdAggregator()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print("aggregator: %s" % cmd, file=sys.stderr)
+        sys.stderr.flush()
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        aggregator = WindowAggregator(cmd.window, cmd.step)
+
+        if cmd.verbose:
+            print("aggregator: %s" % aggregator, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for line in sys.stdin:
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError:
+                continue
+
+            for document in aggregator.append(jdict):
+                print(JSONify.dumps(document))
+                sys.stdout.flush()
+
+        for document in aggregator.flush():
+            print(JSONify.dumps(document))
+            sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("aggregator: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if cmd.verbose and aggregator:
+            print("aggregator: %s" % aggregator, file=sys.stderr)
@@ -12,25 +12,60 @@ infrastructure.
 Documents for publication are gained from stdin by default, otherwise from the specified Unix domain socket (UDS).
 Likewise, documents gained from subscription are written to stdout, or a specified UDS.
 
+Documents on stdin may be newline-delimited JSON, or the binary frames written by aws_topic_publisher with the
+"frames" (-f) flag, or a mixture of the two from several writers - the form is recognised at each frame boundary.
+A framed publication carries its topic separately from its payload, so that the line need not be scanned for its end,
+nor the envelope parsed to find the topic. Framed and unframed documents are parsed before they are published, or
+echoed and spooled in the newline-delimited JSON form.
+
 Subscriptions can be specified either by a project channel name, or by an explicit messaging topic path. Documents
 gained by subscription may be delivered either to stdout, or to a specified Unix domain socket.
 
+Each subscription has its own long-lived delivery channel, with a bounded buffer. Received documents are serialised
+once, and passed to the channel without waiting for the receiver, so a slow or absent receiver does not hold up the
+MQTT client. If the receiver is not available, delivery is retried with back-off. If the buffer is full, the oldest
+undelivered document is dropped. In verbose mode, delivered and dropped counts are reported on exit.
+
 The aws_mqtt_client utility requires the AWS client authorisation to operate.
 
+By default, each document is published before the next is read, and a failed publication is retried until it
+succeeds. If a queue length is specified, documents are instead placed on a bounded in-memory outbound queue, which is
+drained by a number of concurrent publishers - the in-flight limit. A publication awaiting its acknowledgement then
+holds up only its own publisher. Optionally, the queue can be drained at a fixed maximum rate. If the queue is full, the
+oldest queued document is dropped. On exit, queued documents continue to be published for up to ten seconds - any
+that remain are dropped. In verbose mode, the queue depth, publication latency, retry count and drop count are
+reported to stderr.
+
+Alternatively, if a spool directory is specified, documents are written to a durable, segmented on-disk spool as soon
+as they are received, and are published from the spool by a background publisher. Documents are removed from the spool
+only when their publication has been acknowledged, so a broker or network outage results in a backlog on disk, rather
+than back-pressure on the processes supplying data. The spool survives a restart of the client, and its size is capped -
+when the cap is reached, the oldest documents are discarded.
+
 Only one MQTT client should run at any one time, per TCP/IP host.
 
 SYNOPSIS
 aws_mqtt_client.py [-p UDS_PUB] [-s] { -c { C | G | P | S | X } (UDS_SUB_1) |
-[SUB_TOPIC_1 (UDS_SUB_1) .. SUB_TOPIC_N (UDS_SUB_N)] } [-e] [-l LED_UDS] [-v]
+[SUB_TOPIC_1 (UDS_SUB_1) .. SUB_TOPIC_N (UDS_SUB_N)] } [{ -q QUEUE_LENGTH [-f IN_FLIGHT] [-r RATE] | -w SPOOL_DIR }]
+[-e] [-l LED_UDS] [-v]
 
 EXAMPLES
 ( cat < /home/pi/SCS/pipes/mqtt_publication_pipe & ) | \
 /home/pi/SCS/scs_dev/src/scs_dev/aws_mqtt_client.py -v -cX  > /home/pi/SCS/pipes/control_subscription_pipe
 
+( cat < /home/pi/SCS/pipes/mqtt_publication_pipe & ) | \
+/home/pi/SCS/scs_dev/src/scs_dev/aws_mqtt_client.py -v -q 1000 -f 4 -r 10 -cX \
+> /home/pi/SCS/pipes/control_subscription_pipe
+
+( cat < /home/pi/SCS/pipes/mqtt_publication_pipe & ) | \
+/home/pi/SCS/scs_dev/src/scs_dev/aws_mqtt_client.py -v -w /home/pi/SCS/spool/aws -cX \
+> /home/pi/SCS/pipes/control_subscription_pipe
+
 FILES
 ~/SCS/aws/aws_client_auth.json
 
 SEE ALSO
+scs_dev/aws_topic_publisher
 scs_dev/led_controller
 scs_mfr/mqtt_conf
 scs_mfr/aws_client_auth
@@ -58,6 +93,11 @@ from scs_core.data.publication import Publication
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_mqtt_client import CmdMQTTClient
+from scs_dev.comms.delivery_channel import DeliveryChannel
+from scs_dev.comms.frame_link import Frame, FrameReader
+from scs_dev.publisher.publication_queue import PublicationQueue
+from scs_dev.publisher.publication_spool import PublicationSpool
+from scs_dev.publisher.spool_publisher import SpoolPublisher
 from scs_dev.reporter.mqtt_reporter import MQTTReporter
 
 from scs_host.comms.domain_socket import DomainSocket
@@ -76,13 +116,13 @@ class AWSMQTTHandler(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, mqtt_reporter, comms=None, echo=False):
+    def __init__(self, mqtt_reporter, channel, echo=False):
         """
         Constructor
         """
-        self.__reporter = mqtt_reporter
-        self.__comms = comms
-        self.__echo = echo
+        self.__reporter = mqtt_reporter                 # MQTTReporter
+        self.__channel = channel                        # DeliveryChannel
+        self.__echo = echo                              # bool
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -94,29 +134,32 @@ class AWSMQTTHandler(object):
         payload_jdict = json.loads(payload, object_pairs_hook=OrderedDict)
 
         pub = Publication(message.topic, payload_jdict)
+        jstr = JSONify.dumps(pub)
 
-        try:
-            self.__comms.connect()
-            self.__comms.write(JSONify.dumps(pub), False)
-
-        except ConnectionRefusedError:
-            self.__reporter.print("connection refused for %s" % self.__comms.address)
-
-        finally:
-            self.__comms.close()
+        self.__channel.deliver(jstr)
 
         if self.__echo:
-            print(JSONify.dumps(pub))
+            print(jstr)
             sys.stdout.flush()
 
-            self.__reporter.print("received: %s" % JSONify.dumps(pub))
+            self.__reporter.print("received: %s" % jstr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        self.__channel.open()
+
+
+    def close(self):
+        self.__channel.close()
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return "AWSMQTTHandler:{reporter:%s, comms:%s, echo:%s}" % \
-               (self.__reporter, self.__comms, self.__echo)
+        return "AWSMQTTHandler:{reporter:%s, channel:%s, echo:%s}" % \
+               (self.__reporter, self.__channel, self.__echo)
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -124,7 +167,11 @@ class AWSMQTTHandler(object):
 if __name__ == '__main__':
 
     client = None
+    handlers = []
     pub_comms = None
+    queue = None
+    spool = None
+    spool_publisher = None
     reporter = None
 
 
@@ -165,7 +212,7 @@ if __name__ == '__main__':
             print("aws_mqtt_client: %s" % auth, file=sys.stderr)
 
         # comms...
-        pub_comms = DomainSocket(cmd.uds_pub_addr) if cmd.uds_pub_addr else StdIO()
+        pub_comms = DomainSocket(cmd.uds_pub_addr) if cmd.uds_pub_addr else FrameReader(sys.stdin.buffer)
 
         # reporter...
         reporter = MQTTReporter(cmd.verbose, cmd.led_uds)
@@ -196,8 +243,9 @@ if __name__ == '__main__':
             # handler...
             sub_comms = DomainSocket(cmd.channel_uds) if cmd.channel_uds else StdIO()
 
-            handler = AWSMQTTHandler(reporter, sub_comms, cmd.echo)
+            handler = AWSMQTTHandler(reporter, DeliveryChannel(sub_comms, bool(cmd.channel_uds)), cmd.echo)
 
+            handlers.append(handler)
             subscribers.append(MQTTSubscriber(topic, handler.handle))
 
         else:
@@ -205,11 +253,12 @@ if __name__ == '__main__':
                 sub_comms = DomainSocket(subscription.address) if subscription.address else StdIO()
 
                 # handler...
-                handler = AWSMQTTHandler(reporter, sub_comms, cmd.echo)
+                handler = AWSMQTTHandler(reporter, DeliveryChannel(sub_comms, bool(subscription.address)), cmd.echo)
 
                 if cmd.verbose:
                     print("aws_mqtt_client: %s" % handler, file=sys.stderr)
 
+                handlers.append(handler)
                 subscribers.append(MQTTSubscriber(subscription.topic, handler.handle))
 
         # client...
@@ -218,6 +267,23 @@ if __name__ == '__main__':
         if cmd.verbose:
             print("aws_mqtt_client: %s" % client, file=sys.stderr)
 
+        # queue...
+        if cmd.queue_length is not None:
+            queue = PublicationQueue(client.publish, reporter, cmd.queue_length, cmd.in_flight, cmd.rate)
+
+            if cmd.verbose:
+                print("aws_mqtt_client: %s" % queue, file=sys.stderr)
+
+        # spool...
+        if cmd.spool is not None:
+            spool = PublicationSpool(cmd.spool)
+            spool.open()
+
+            spool_publisher = SpoolPublisher(client.publish, reporter, spool)
+
+            if cmd.verbose:
+                print("aws_mqtt_client: %s" % spool_publisher, file=sys.stderr)
+
         if cmd.verbose:
             sys.stderr.flush()
 
@@ -227,6 +293,10 @@ if __name__ == '__main__':
 
         reporter.set_led("A")
 
+        # subscription delivery...
+        for handler in handlers:
+            handler.open()
+
         # data source...
         pub_comms.connect()
 
@@ -247,13 +317,25 @@ if __name__ == '__main__':
                     reporter.print("connect: %s" % ex)
                     exit(1)
 
-        for message in pub_comms.read():
+            if queue:
+                queue.start()
+
+            if spool_publisher:
+                spool_publisher.start()
+
+        for received in pub_comms.read():
+            frame = received if isinstance(received, Frame) else Frame(None, received)
+            message = frame.text
+
             # receive...
-            try:
-                datum = json.loads(message, object_pairs_hook=OrderedDict)
-            except ValueError:
-                reporter.print("bad datum: %s" % message)
-                continue
+            datum = None
+
+            if frame.topic is None:
+                try:
+                    datum = json.loads(message, object_pairs_hook=OrderedDict)
+                except ValueError:
+                    reporter.print("bad datum: %s" % message)
+                    continue
 
             if cmd.echo:
                 print(message)
@@ -262,8 +344,25 @@ if __name__ == '__main__':
             if conf.inhibit_publishing:
                 continue
 
+            # spool...
+            if spool:
+                spool.append(message)
+                continue
+
             # publish...
-            publication = Publication.construct_from_jdict(datum)
+            if frame.topic is None:
+                publication = Publication.construct_from_jdict(datum)
+
+            else:
+                try:
+                    publication = Publication(frame.topic, json.loads(frame.payload, object_pairs_hook=OrderedDict))
+                except ValueError:
+                    reporter.print("bad datum: %s" % message)
+                    continue
+
+            if queue:
+                queue.put(publication)
+                continue
 
             while True:
                 try:
@@ -293,9 +392,30 @@ if __name__ == '__main__':
             print("aws_mqtt_client: KeyboardInterrupt", file=sys.stderr)
 
     finally:
+        if queue:
+            queue.stop()
+
+            if cmd.verbose:
+                print("aws_mqtt_client: %s" % queue.report, file=sys.stderr)
+
+        if spool_publisher:
+            spool_publisher.stop()
+
+        if spool:
+            spool.close()
+
+            if cmd.verbose:
+                print("aws_mqtt_client: %s" % spool.report, file=sys.stderr)
+
         if client:
             client.disconnect()
 
+        for handler in handlers:
+            handler.close()
+
+            if cmd.verbose:
+                print("aws_mqtt_client: %s" % handler, file=sys.stderr)
+
         if pub_comms:
             pub_comms.close()
 
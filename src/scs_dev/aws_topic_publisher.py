@@ -10,15 +10,28 @@ The aws_topic_publisher utility is used to prepare data for publication by the a
 aws_topic_publisher acts by taking data from stdin, wrapping it in a JSON document whose only field has the name of
 the given topic, and presenting the result on stdout.
 
+In passthrough mode, each input line is wrapped in the topic envelope as it stands, rather than being parsed and
+serialised again. Documents are validated as JSON at a sampling rate, set with the --sample flag: a document that is
+not sampled is only checked to be a JSON object. Passthrough mode is suited to input from trusted scs_dev utilities.
+
+If the "frames" (-f) flag is used, publications are written as binary frames, each holding the topic and the
+payload, rather than as newline-delimited JSON, so that the publication envelope is never built. Each frame is written
+atomically, so several publishers may share a pipe. A publication too long for a frame is written as JSON. Framing is
+only understood by the aws_mqtt_client utility, which reads either form. See scs_dev/comms/frame_link for details.
+
 Messaging topics can be specified either by a project channel name, or by an explicit topic path. If a project channel
 name is used, the aws_topic_publisher utility requires system ID and AWS project configurations to be set.
 
 SYNOPSIS
-aws_topic_publisher.py { -t TOPIC | -c { C | G | P | S | X } } [-v]
+aws_topic_publisher.py { -t TOPIC | -c { C | G | P | S | X } } [-p [-s PERIOD]] [-f] [-v]
 
 EXAMPLES
 ./control_receiver.py -r -v | ./aws_topic_publisher.py -v -cX > ~/SCS/pipes/mqtt_publication_pipe
 
+./gases_sampler.py -i10 | ./aws_topic_publisher.py -cG -p -s1000 > ~/SCS/pipes/mqtt_publication_pipe
+
+./gases_sampler.py -i10 | ./aws_topic_publisher.py -cG -p -f > ~/SCS/pipes/mqtt_publication_pipe
+
 FILES
 ~/SCS/aws/aws_project.json
 ~/SCS/conf/system_id.json
@@ -42,6 +55,7 @@ DOCUMENT EXAMPLE - OUTPUT
 
 SEE ALSO
 scs_dev/aws_mqtt_client
+scs_dev/aws_topic_publisher_host
 scs_mfr/aws_project
 scs_mfr/system_id
 """
@@ -59,6 +73,8 @@ from scs_core.aws.config.project import Project
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_aws_topic_publisher import CmdAWSTopicPublisher
+from scs_dev.comms.frame_link import FrameWriter
+from scs_dev.data.publication_envelope import PublicationEnvelope
 
 from scs_host.sys.host import Host
 
@@ -80,6 +96,9 @@ if __name__ == '__main__':
     if cmd.verbose:
         print("aws_topic_publisher: %s" % cmd, file=sys.stderr)
 
+    envelope = None
+    writer = None
+
     try:
         # ------------------------------------------------------------------------------------------------------------
         # resources...
@@ -112,11 +131,38 @@ if __name__ == '__main__':
             print("aws_topic_publisher: %s" % topic, file=sys.stderr)
             sys.stderr.flush()
 
+        # PublicationEnvelope...
+        envelope = PublicationEnvelope(topic, validation_period=cmd.sample) if cmd.passthrough else None
+
+        # FrameWriter...
+        writer = FrameWriter(sys.stdout.buffer.raw) if cmd.frames else None
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
         for line in sys.stdin:
+            # framed...
+            if writer:
+                payload = envelope.payload(line) if envelope else FrameWriter.json_payload(line)
+
+                if payload is not None:
+                    writer.write(payload, topic)
+
+                continue
+
+            # passthrough...
+            if envelope:
+                publication = envelope.wrap(line)
+
+                if publication is None:
+                    continue
+
+                print(publication)
+                sys.stdout.flush()
+                continue
+
+            # parsed...
             try:
                 jdict = json.loads(line, object_pairs_hook=OrderedDict)
             except ValueError:
@@ -136,3 +182,10 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         if cmd.verbose:
             print("aws_topic_publisher: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if cmd.verbose and envelope:
+            print("aws_topic_publisher: %s" % envelope, file=sys.stderr)
+
+        if cmd.verbose and writer:
+            print("aws_topic_publisher: %s" % writer, file=sys.stderr)
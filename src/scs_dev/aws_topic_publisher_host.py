@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Created on 11 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The aws_topic_publisher_host utility is used to prepare data for publication by the aws_mqtt_client script, for any
+number of topics, within a single process. It is an alternative to running one aws_topic_publisher utility per
+channel: the system ID and AWS project configurations are loaded once, and the publications for every channel are
+presented as a single stream on stdout.
+
+Each source is a named pipe or a file, given together with the project channel name - or the explicit topic path - for
+its documents. The sources are read at once, and each document is wrapped in a JSON document whose only field has the
+name of the topic, exactly as by the aws_topic_publisher utility. Documents from any one source are published in
+order. A named pipe is held open, so that its writer may be restarted.
+
+The named pipes written by the sampler_host utility, when run with a directory, may be used as sources directly.
+
+In passthrough mode, each input line is wrapped in the topic envelope as it stands, rather than being parsed and
+serialised again. See the aws_topic_publisher utility for details.
+
+SYNOPSIS
+aws_topic_publisher_host.py [-p [-s PERIOD]] [-v] { C | G | P | S | X | TOPIC }=PATH [...]
+
+EXAMPLES
+./aws_topic_publisher_host.py -v C=~/SCS/pipes/scs-climate G=~/SCS/pipes/scs-gases S=~/SCS/pipes/scs-status \
+> ~/SCS/pipes/mqtt_publication_pipe
+
+FILES
+~/SCS/aws/aws_project.json
+~/SCS/conf/system_id.json
+
+DOCUMENT EXAMPLE - INPUT (G)
+{"tag": "scs-be2-2", "rec": "2018-04-04T13:05:52.675+00:00", "val": {"sht": {"hmd": 57.0, "tmp": 21.3}}}
+
+DOCUMENT EXAMPLE - OUTPUT
+{"south-coast-science-dev/production-test/loc/1/gases":
+{"tag": "scs-be2-2", "rec": "2018-04-04T13:05:52.675+00:00", "val": {"sht": {"hmd": 57.0, "tmp": 21.3}}}}
+
+SEE ALSO
+scs_dev/aws_mqtt_client
+scs_dev/aws_topic_publisher
+scs_dev/sampler_host
+scs_mfr/aws_project
+scs_mfr/system_id
+
+BUGS
+Unix domain sockets are not supported as sources.
+"""
+
+import sys
+
+from scs_core.aws.config.project import Project
+
+from scs_core.sys.system_id import SystemID
+
+from scs_dev.cmd.cmd_aws_topic_publisher_host import CmdAWSTopicPublisherHost
+from scs_dev.publisher.topic_multiplexer import TopicMultiplexer
+
+from scs_host.sys.host import Host
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    multiplexer = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdAWSTopicPublisherHost()
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print("aws_topic_publisher_host: %s" % cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        # topics...
+        if any(Project.is_valid_channel(channel) for channel, _ in cmd.sources):
+            # SystemID...
+            system_id = SystemID.load(Host)
+
+            if system_id is None:
+                print("aws_topic_publisher_host: SystemID not available.", file=sys.stderr)
+                exit(1)
+
+            if cmd.verbose:
+                print("aws_topic_publisher_host: %s" % system_id, file=sys.stderr)
+
+            # Project...
+            project = Project.load(Host)
+
+            if project is None:
+                print("aws_topic_publisher_host: Project not available.", file=sys.stderr)
+                exit(1)
+
+            sources = [(project.channel_path(channel, system_id) if Project.is_valid_channel(channel) else channel,
+                        path) for channel, path in cmd.sources]
+
+        else:
+            sources = cmd.sources
+
+        # TopicMultiplexer...
+        multiplexer = TopicMultiplexer(sources, cmd.passthrough, cmd.sample)
+
+        if cmd.verbose:
+            print("aws_topic_publisher_host: %s" % multiplexer, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        multiplexer.open()
+
+        for publications in multiplexer.publications():
+            for publication in publications:
+                sys.stdout.write(publication + '\n')
+
+            sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("aws_topic_publisher_host: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if multiplexer:
+            multiplexer.close()
+
+            if cmd.verbose:
+                print("aws_topic_publisher_host: %s" % multiplexer, file=sys.stderr)
@@ -22,6 +22,10 @@ controlled by an independent scheduling process via a Unix semaphore.
 South Coast Science equipment may carry one or two SHT sensors. The configuration is specified by the
 scs_mfr/sht_conf utility.
 
+Readings of the SHT are shared with any other sampler that reads the same sensor - such as the gases_sampler, where
+only one SHT is fitted. A reading taken by another sampler is reused if it is less than one second old, so that
+samplers on the same schedule read the sensor once between them.
+
 SYNOPSIS
 climate_sampler.py [{ -s SEMAPHORE | -i INTERVAL [-n SAMPLES] }] [-v]
 
@@ -48,7 +52,6 @@ https://en.wikipedia.org/wiki/ISO_8601
 
 import sys
 
-from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sync.timed_runner import TimedRunner
@@ -57,6 +60,8 @@ from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_sampler import CmdSampler
 from scs_dev.sampler.climate_sampler import ClimateSampler
+from scs_dev.sampler.sample_encoder import SampleEncoder
+from scs_dev.sampler.sht_cache import SHTCache
 
 from scs_dfe.climate.sht_conf import SHTConf
 
@@ -103,7 +108,7 @@ if __name__ == '__main__':
             print("climate_sampler: %s" % sht_conf, file=sys.stderr)
 
         # SHT...
-        sht = sht_conf.ext_sht()
+        sht = SHTCache(sht_conf.ext_sht(), sht_conf.ext_addr)
 
         # sampler...
         runner = TimedRunner(cmd.interval, cmd.samples) if cmd.semaphore is None \
@@ -115,6 +120,9 @@ if __name__ == '__main__':
             print("climate_sampler: %s" % sampler, file=sys.stderr)
             sys.stderr.flush()
 
+        # encoder...
+        encoder = SampleEncoder()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
@@ -125,7 +133,7 @@ if __name__ == '__main__':
                 print("%s:      climate: %s" % (now.as_time(), sample.rec.as_time()), file=sys.stderr)
                 sys.stderr.flush()
 
-            print(JSONify.dumps(sample))
+            print(encoder.encode(sample))
             sys.stdout.flush()
 
 
@@ -0,0 +1,83 @@
+"""
+Created on 15 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdAggregator(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog -w WINDOW [-s STEP] [-v]", version="%prog 1.0")
+
+        # compulsory...
+        self.__parser.add_option("--window", "-w", type="float", nargs=1, action="store", dest="window",
+                                 help="window length in seconds")
+
+        # optional...
+        self.__parser.add_option("--step", "-s", type="float", nargs=1, action="store", dest="step",
+                                 help="sliding windows, emitted every STEP seconds (default tumbling)")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.__opts.window is None or self.__opts.window <= 0:
+            return False
+
+        if self.__opts.step is not None:
+            if self.__opts.step <= 0 or self.__opts.step > self.__opts.window:
+                return False
+
+            steps = self.__opts.window / self.__opts.step
+
+            if abs(steps - round(steps)) > 1e-9:            # the window must be a whole number of steps
+                return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def window(self):
+        return self.__opts.window
+
+
+    @property
+    def step(self):
+        return self.__opts.step
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdAggregator:{window:%s, step:%s, verbose:%s, args:%s}" % \
+               (self.window, self.step, self.verbose, self.args)
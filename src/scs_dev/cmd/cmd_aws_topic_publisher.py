@@ -18,8 +18,8 @@ class CmdAWSTopicPublisher(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } } [-v]",
-                                              version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } } "
+                                                    "[-p [-s PERIOD]] [-f] [-v]", version="%prog 1.0")
 
         # compulsory...
         self.__parser.add_option("--topic", "-t", type="string", nargs=1, action="store", dest="topic",
@@ -29,6 +29,16 @@ class CmdAWSTopicPublisher(object):
                                  help="publication channel")
 
         # optional...
+        self.__parser.add_option("--passthrough", "-p", action="store_true", dest="passthrough", default=False,
+                                 help="wrap each document without parsing it")
+
+        self.__parser.add_option("--sample", "-s", type="int", nargs=1, action="store", dest="sample",
+                                 help="in passthrough mode, validate one document in every PERIOD (default 100, "
+                                      "0 for none)")
+
+        self.__parser.add_option("--frames", "-f", action="store_true", dest="frames", default=False,
+                                 help="write binary frames, for aws_mqtt_client, rather than JSON")
+
         self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
                                  help="report narrative to stderr")
 
@@ -47,6 +57,9 @@ class CmdAWSTopicPublisher(object):
         if self.channel and not Project.is_valid_channel(self.channel):
             return False
 
+        if self.sample is not None and (not self.passthrough or self.sample < 0):
+            return False
+
         return True
 
 
@@ -62,6 +75,21 @@ class CmdAWSTopicPublisher(object):
         return self.__opts.channel
 
 
+    @property
+    def passthrough(self):
+        return self.__opts.passthrough
+
+
+    @property
+    def sample(self):
+        return self.__opts.sample
+
+
+    @property
+    def frames(self):
+        return self.__opts.frames
+
+
     @property
     def verbose(self):
         return self.__opts.verbose
@@ -79,5 +107,6 @@ class CmdAWSTopicPublisher(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdAWSTopicPublisher:{topic:%s, channel:%s, verbose:%s, args:%s}" % \
-                    (self.topic, self.channel, self.verbose, self.args)
+        return "CmdAWSTopicPublisher:{topic:%s, channel:%s, passthrough:%s, sample:%s, frames:%s, verbose:%s, " \
+               "args:%s}" % \
+                    (self.topic, self.channel, self.passthrough, self.sample, self.frames, self.verbose, self.args)
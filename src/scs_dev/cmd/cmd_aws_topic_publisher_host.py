@@ -0,0 +1,94 @@
+"""
+Created on 11 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+from scs_core.aws.config.project import Project
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdAWSTopicPublisherHost(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-p [-s PERIOD]] [-v] { C | G | P | S | X | TOPIC }=PATH "
+                                                    "[...]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--passthrough", "-p", action="store_true", dest="passthrough", default=False,
+                                 help="wrap each document without parsing it")
+
+        self.__parser.add_option("--sample", "-s", type="int", nargs=1, action="store", dest="sample",
+                                 help="in passthrough mode, validate one document in every PERIOD (default 100, "
+                                      "0 for none)")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if not self.__args:
+            return False
+
+        for arg in self.__args:
+            channel, separator, path = arg.partition('=')
+
+            if not separator or not path:
+                return False
+
+            if '/' not in channel and not Project.is_valid_channel(channel):
+                return False
+
+        if self.sample is not None and (not self.passthrough or self.sample < 0):
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def sources(self):
+        return [tuple(arg.partition('=')[::2]) for arg in self.__args]      # list of (channel or topic, path)
+
+
+    @property
+    def passthrough(self):
+        return self.__opts.passthrough
+
+
+    @property
+    def sample(self):
+        return self.__opts.sample
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdAWSTopicPublisherHost:{sources:%s, passthrough:%s, sample:%s, verbose:%s, args:%s}" % \
+                    (self.sources, self.passthrough, self.sample, self.verbose, self.args)
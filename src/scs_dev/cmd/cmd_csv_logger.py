@@ -16,9 +16,25 @@ class CmdCSVLogger(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [-e] [-v] TOPIC", version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog [-c | -z] [-x] [-w [-b BATCH]] [-e] [-v] TOPIC",
+                                              version="%prog 1.0")
 
         # optional...
+        self.__parser.add_option("--columnar", "-c", action="store_true", dest="columnar", default=False,
+                                 help="log in columnar format, rather than CSV")
+
+        self.__parser.add_option("--compress", "-z", action="store_true", dest="compress", default=False,
+                                 help="compress closed CSV logs in the background")
+
+        self.__parser.add_option("--extend", "-x", action="store_true", dest="extend", default=False,
+                                 help="extend the schema when new fields appear, starting a new log file")
+
+        self.__parser.add_option("--write-behind", "-w", action="store_true", dest="write_behind", default=False,
+                                 help="buffer documents, and write them to storage in batches on a separate thread")
+
+        self.__parser.add_option("--batch", "-b", type="int", nargs=1, action="store", dest="batch",
+                                 help="write-behind batch size in rows (default 100)")
+
         self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
                                  help="echo stdin to stdout")
 
@@ -34,11 +50,42 @@ class CmdCSVLogger(object):
         if len(self.__args) < 1:
             return False
 
+        if self.columnar and self.compress:
+            return False
+
+        if self.batch is not None and (not self.write_behind or self.batch < 1):
+            return False
+
         return True
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
+    @property
+    def columnar(self):
+        return self.__opts.columnar
+
+
+    @property
+    def write_behind(self):
+        return self.__opts.write_behind
+
+
+    @property
+    def batch(self):
+        return self.__opts.batch
+
+
+    @property
+    def extend(self):
+        return self.__opts.extend
+
+
+    @property
+    def compress(self):
+        return self.__opts.compress
+
+
     @property
     def echo(self):
         return self.__opts.echo
@@ -66,5 +113,7 @@ class CmdCSVLogger(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdCSVLogger:{echo:%s, verbose:%s, topic:%s, args:%s}" % \
-                    (self.echo, self.verbose, self.topic, self.args)
+        return "CmdCSVLogger:{columnar:%s, compress:%s, extend:%s, write_behind:%s, batch:%s, echo:%s, " \
+               "verbose:%s, topic:%s, args:%s}" % \
+                    (self.columnar, self.compress, self.extend, self.write_behind, self.batch, self.echo,
+                     self.verbose, self.topic, self.args)
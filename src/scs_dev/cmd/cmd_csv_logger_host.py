@@ -0,0 +1,97 @@
+"""
+Created on 3 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdCSVLoggerHost(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-u UDS] [-c | -z] [-x] [-e] [-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--uds", "-u", type="string", nargs=1, action="store", dest="uds",
+                                 help="receive tagged documents from Unix domain socket UDS (instead of stdin)")
+
+        self.__parser.add_option("--columnar", "-c", action="store_true", dest="columnar", default=False,
+                                 help="log in columnar format, rather than CSV")
+
+        self.__parser.add_option("--compress", "-z", action="store_true", dest="compress", default=False,
+                                 help="compress closed CSV logs in the background")
+
+        self.__parser.add_option("--extend", "-x", action="store_true", dest="extend", default=False,
+                                 help="extend the schema when new fields appear, starting a new log file")
+
+        self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
+                                 help="echo received documents to stdout")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.columnar and self.compress:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def uds(self):
+        return self.__opts.uds
+
+
+    @property
+    def columnar(self):
+        return self.__opts.columnar
+
+
+    @property
+    def extend(self):
+        return self.__opts.extend
+
+
+    @property
+    def compress(self):
+        return self.__opts.compress
+
+
+    @property
+    def echo(self):
+        return self.__opts.echo
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdCSVLoggerHost:{uds:%s, columnar:%s, compress:%s, extend:%s, echo:%s, verbose:%s, args:%s}" % \
+                    (self.uds, self.columnar, self.compress, self.extend, self.echo, self.verbose, self.args)
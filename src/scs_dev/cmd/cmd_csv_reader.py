@@ -4,6 +4,7 @@ Created on 2 Aug 2016
 @author: Bruno Beloff (bruno.beloff@southcoastscience.com)
 """
 
+import glob
 import optparse
 
 
@@ -16,25 +17,80 @@ class CmdCSVReader(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [-v] [FILENAME]", version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog [-s START] [-e END] [-l LIMIT] [-v] [FILENAME ...]",
+                                              version="%prog 1.0")
 
         # optional...
+        self.__parser.add_option("--start", "-s", type="string", nargs=1, action="store", dest="start",
+                                 help="read rows recorded at or after ISO 8601 datetime START")
+
+        self.__parser.add_option("--end", "-e", type="string", nargs=1, action="store", dest="end",
+                                 help="read rows recorded before ISO 8601 datetime END")
+
+        self.__parser.add_option("--limit", "-l", type="int", nargs=1, action="store", dest="limit",
+                                 help="stop after LIMIT documents")
+
         self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
                                  help="report sent samples to stderr")
 
         self.__opts, self.__args = self.__parser.parse_args()
 
 
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.windowed and self.filename is None:
+            return False
+
+        if self.limit is not None and self.limit < 1:
+            return False
+
+        return True
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
+    @property
+    def start(self):
+        return self.__opts.start
+
+
+    @property
+    def end(self):
+        return self.__opts.end
+
+
+    @property
+    def limit(self):
+        return self.__opts.limit
+
+
+    @property
+    def windowed(self):
+        return self.start is not None or self.end is not None
+
+
     @property
     def verbose(self):
         return self.__opts.verbose
 
 
+    @property
+    def filenames(self):
+        filenames = []
+
+        for arg in self.__args:
+            matches = sorted(glob.glob(arg)) if glob.has_magic(arg) else None
+            filenames.extend(matches if matches else [arg])
+
+        return filenames
+
+
     @property
     def filename(self):
-        return self.__args[0] if len(self.__args) > 0 else None
+        filenames = self.filenames
+
+        return filenames[0] if len(filenames) > 0 else None
 
 
     @property
@@ -49,4 +105,5 @@ class CmdCSVReader(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdCSVReader:{verbose:%s, filename:%s, args:%s}" % (self.verbose, self.filename, self.args)
+        return "CmdCSVReader:{start:%s, end:%s, limit:%s, verbose:%s, filenames:%s, args:%s}" % \
+               (self.start, self.end, self.limit, self.verbose, self.filenames, self.args)
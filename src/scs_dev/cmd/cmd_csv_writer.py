@@ -16,9 +16,12 @@ class CmdCSVWriter(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [-a] [-e] [-v] [FILENAME]", version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog [-x] [-a] [-e] [-v] [FILENAME]", version="%prog 1.0")
 
         # optional...
+        self.__parser.add_option("--extend", "-x", action="store_true", dest="extend", default=False,
+                                 help="extend the header when new fields appear, starting a new file segment")
+
         self.__parser.add_option("--append", "-a", action="store_true", dest="append", default=False,
                                  help="append rows to existing file")
 
@@ -33,6 +36,11 @@ class CmdCSVWriter(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
+    @property
+    def extend(self):
+        return self.__opts.extend
+
+
     @property
     def append(self):
         return self.__opts.append
@@ -61,5 +69,5 @@ class CmdCSVWriter(object):
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return "CmdCSVWriter:{append:%s, echo:%s, verbose:%s, filename:%s, args:%s}" % \
-                    (self.append, self.echo, self.verbose, self.filename, self.args)
+        return "CmdCSVWriter:{extend:%s, append:%s, echo:%s, verbose:%s, filename:%s, args:%s}" % \
+                    (self.extend, self.append, self.echo, self.verbose, self.filename, self.args)
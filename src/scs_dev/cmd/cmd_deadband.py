@@ -0,0 +1,102 @@
+"""
+Created on 16 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdDeadband(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-c CONF_FILE] [-a ABS] [-r REL] [-b HEARTBEAT] [-v] "
+                                                    "TOPIC", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--conf", "-c", type="string", nargs=1, action="store", dest="conf",
+                                 help="read the settings for TOPIC from CONF_FILE")
+
+        self.__parser.add_option("--abs", "-a", type="float", nargs=1, action="store", dest="absolute",
+                                 help="default absolute threshold")
+
+        self.__parser.add_option("--rel", "-r", type="float", nargs=1, action="store", dest="relative",
+                                 help="default relative threshold")
+
+        self.__parser.add_option("--heartbeat", "-b", type="float", nargs=1, action="store", dest="heartbeat",
+                                 help="pass a document at least every HEARTBEAT seconds")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.topic is None:
+            return False
+
+        for value in (self.__opts.absolute, self.__opts.relative):
+            if value is not None and value < 0:
+                return False
+
+        if self.__opts.heartbeat is not None and self.__opts.heartbeat <= 0:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topic(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def conf(self):
+        return self.__opts.conf
+
+
+    @property
+    def absolute(self):
+        return self.__opts.absolute
+
+
+    @property
+    def relative(self):
+        return self.__opts.relative
+
+
+    @property
+    def heartbeat(self):
+        return self.__opts.heartbeat
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdDeadband:{topic:%s, conf:%s, absolute:%s, relative:%s, heartbeat:%s, verbose:%s, args:%s}" % \
+               (self.topic, self.conf, self.absolute, self.relative, self.heartbeat, self.verbose, self.args)
@@ -0,0 +1,87 @@
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdLogExporter(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-j] [-s START] [-e END] [-v] FILENAME",
+                                              version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--json", "-j", action="store_true", dest="json", default=False,
+                                 help="export JSON documents, rather than CSV")
+
+        self.__parser.add_option("--start", "-s", type="string", nargs=1, action="store", dest="start",
+                                 help="export rows recorded at or after ISO 8601 datetime START")
+
+        self.__parser.add_option("--end", "-e", type="string", nargs=1, action="store", dest="end",
+                                 help="export rows recorded before ISO 8601 datetime END")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.filename is None:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def json(self):
+        return self.__opts.json
+
+
+    @property
+    def start(self):
+        return self.__opts.start
+
+
+    @property
+    def end(self):
+        return self.__opts.end
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def filename(self):
+        return self.__args[0] if len(self.__args) > 0 else None
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdLogExporter:{json:%s, start:%s, end:%s, verbose:%s, filename:%s, args:%s}" % \
+                    (self.json, self.start, self.end, self.verbose, self.filename, self.args)
@@ -19,7 +19,9 @@ class CmdMQTTClient(object):
         self.__parser = optparse.OptionParser(usage="%prog [-p UDS_PUB] "
                                                     "[-s] { -c { C | G | P | S | X } (UDS_SUB_1) | "
                                                     "[SUB_TOPIC_1 (UDS_SUB_1) .. SUB_TOPIC_N (UDS_SUB_N)] } "
-                                                    "[-e] [-l LED_UDS] [-v]", version="%prog 1.0")
+                                                    "[{ -q QUEUE_LENGTH [-f IN_FLIGHT] [-r RATE] | -w SPOOL_DIR }] "
+                                                    "[-e] [-l LED_UDS] [-v]",
+                                              version="%prog 1.0")
 
         # optional...
         self.__parser.add_option("--pub-addr", "-p", type="string", nargs=1, action="store", dest="uds_pub_addr",
@@ -31,6 +33,18 @@ class CmdMQTTClient(object):
         self.__parser.add_option("--channel", "-c", type="string", nargs=1, action="store", dest="channel",
                                  help="subscribe to channel")
 
+        self.__parser.add_option("--queue", "-q", type="int", nargs=1, action="store", dest="queue_length",
+                                 help="publish via an outbound queue of QUEUE_LENGTH publications")
+
+        self.__parser.add_option("--in-flight", "-f", type="int", nargs=1, action="store", dest="in_flight",
+                                 help="allow IN_FLIGHT concurrent publications (default 1)")
+
+        self.__parser.add_option("--rate", "-r", type="float", nargs=1, action="store", dest="rate",
+                                 help="drain the queue at no more than RATE publications per second")
+
+        self.__parser.add_option("--spool", "-w", type="string", nargs=1, action="store", dest="spool",
+                                 help="publish via a durable spool in directory SPOOL_DIR")
+
         self.__parser.add_option("--echo", "-e", action="store_true", dest="echo", default=False,
                                  help="echo input to stdout (if not writing subscriptions to stdout)")
 
@@ -46,6 +60,21 @@ class CmdMQTTClient(object):
     # ----------------------------------------------------------------------------------------------------------------
 
     def is_valid(self):
+        if self.queue_length is None and (self.__opts.in_flight is not None or self.rate is not None):
+            return False
+
+        if self.queue_length is not None and self.queue_length < 1:
+            return False
+
+        if self.in_flight < 1:
+            return False
+
+        if self.rate is not None and self.rate <= 0:
+            return False
+
+        if self.queue_length is not None and self.spool is not None:
+            return False
+
         if self.echo and self.subscriptions and not self.__opts.uds_sub:
             return False
 
@@ -97,6 +126,26 @@ class CmdMQTTClient(object):
         return self.__opts.uds_pub_addr
 
 
+    @property
+    def queue_length(self):
+        return self.__opts.queue_length
+
+
+    @property
+    def in_flight(self):
+        return 1 if self.__opts.in_flight is None else self.__opts.in_flight
+
+
+    @property
+    def rate(self):
+        return self.__opts.rate
+
+
+    @property
+    def spool(self):
+        return self.__opts.spool
+
+
     @property
     def echo(self):
         return self.__opts.echo
@@ -126,8 +175,10 @@ class CmdMQTTClient(object):
     def __str__(self, *args, **kwargs):
         subscriptions = '[' + ', '.join(str(subscription) for subscription in self.subscriptions) + ']'
 
-        return "CmdMQTTClient:{subscriptions:%s, channel:%s, uds_pub_addr:%s, echo:%s, led:%s, verbose:%s, args:%s}" % \
-               (subscriptions, self.channel, self.uds_pub_addr, self.echo, self.led_uds, self.verbose, self.args)
+        return "CmdMQTTClient:{subscriptions:%s, channel:%s, uds_pub_addr:%s, queue_length:%s, in_flight:%s, " \
+               "rate:%s, spool:%s, echo:%s, led:%s, verbose:%s, args:%s}" % \
+               (subscriptions, self.channel, self.uds_pub_addr, self.queue_length, self.in_flight,
+                self.rate, self.spool, self.echo, self.led_uds, self.verbose, self.args)
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -16,11 +16,11 @@ class CmdNode(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog [-i] [-v] [PATH]", version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog [-i] [-v] [PATH ...]", version="%prog 1.0")
 
         # optional...
         self.__parser.add_option("--ignore", "-i", action="store_true", dest="ignore", default=False,
-                                 help="ignore data where node is missing")
+                                 help="ignore data where any node is missing")
 
         self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
                                  help="report narrative to stderr")
@@ -40,6 +40,11 @@ class CmdNode(object):
         return self.__opts.verbose
 
 
+    @property
+    def paths(self):
+        return self.__args
+
+
     @property
     def path(self):
         return self.__args[0] if len(self.__args) > 0 else None
@@ -57,4 +62,5 @@ class CmdNode(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdNode:{ignore:%s, verbose:%s, path:%s, args:%s}" %  (self.ignore, self.verbose, self.path, self.args)
+        return "CmdNode:{ignore:%s, verbose:%s, paths:%s, args:%s}" % \
+               (self.ignore, self.verbose, self.paths, self.args)
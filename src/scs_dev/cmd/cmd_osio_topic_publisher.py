@@ -20,8 +20,8 @@ class CmdOSIOTopicPublisher(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } } [-o] [-v]",
-                                              version="%prog 1.0")
+        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } } [-o] "
+                                                    "[-p [-s PERIOD]] [-v]", version="%prog 1.0")
 
         # compulsory...
         self.__parser.add_option("--topic", "-t", type="string", nargs=1, action="store", dest="topic",
@@ -34,6 +34,13 @@ class CmdOSIOTopicPublisher(object):
         self.__parser.add_option("--override", "-o", action="store_true", dest="override", default=False,
                                  help="override OSIO reception datetime")
 
+        self.__parser.add_option("--passthrough", "-p", action="store_true", dest="passthrough", default=False,
+                                 help="wrap each document without parsing it")
+
+        self.__parser.add_option("--sample", "-s", type="int", nargs=1, action="store", dest="sample",
+                                 help="in passthrough mode, validate one document in every PERIOD (default 100, "
+                                      "0 for none)")
+
         self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
                                  help="report narrative to stderr")
 
@@ -52,6 +59,9 @@ class CmdOSIOTopicPublisher(object):
         if self.channel and not Project.is_valid_channel(self.channel):
             return False
 
+        if self.sample is not None and (not self.passthrough or self.sample < 0):
+            return False
+
         return True
 
 
@@ -72,6 +82,16 @@ class CmdOSIOTopicPublisher(object):
         return self.__opts.override
 
 
+    @property
+    def passthrough(self):
+        return self.__opts.passthrough
+
+
+    @property
+    def sample(self):
+        return self.__opts.sample
+
+
     @property
     def verbose(self):
         return self.__opts.verbose
@@ -89,5 +109,6 @@ class CmdOSIOTopicPublisher(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdOSIOTopicPublisher:{topic:%s, channel:%s, override:%s, verbose:%s, args:%s}" % \
-                    (self.topic, self.channel, self.override, self.verbose, self.args)
+        return "CmdOSIOTopicPublisher:{topic:%s, channel:%s, override:%s, passthrough:%s, sample:%s, " \
+               "verbose:%s, args:%s}" % \
+               (self.topic, self.channel, self.override, self.passthrough, self.sample, self.verbose, self.args)
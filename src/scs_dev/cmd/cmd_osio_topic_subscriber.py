@@ -10,6 +10,8 @@ import optparse
 
 from scs_core.osio.config.project import Project
 
+from scs_dev.comms.topic_trie import TopicTrie
+
 
 # --------------------------------------------------------------------------------------------------------------------
 
@@ -20,12 +22,13 @@ class CmdOSIOTopicSubscriber(object):
         """
         Constructor
         """
-        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } } [-v]",
+        self.__parser = optparse.OptionParser(usage="%prog { -t TOPIC | -c { C | G | P | S | X } | "
+                                                    "{ C | G | P | S | X | TOPIC }=OUTPUT [...] } [-v]",
                                               version="%prog 1.0")
 
         # compulsory...
         self.__parser.add_option("--topic", "-t", type="string", nargs=1, action="store", dest="topic",
-                                 help="topic path")
+                                 help="topic path, which may have MQTT wildcards")
 
         self.__parser.add_option("--channel", "-c", type="string", nargs=1, action="store", dest="channel",
                                  help="publication channel")
@@ -40,12 +43,19 @@ class CmdOSIOTopicSubscriber(object):
     # ----------------------------------------------------------------------------------------------------------------
 
     def is_valid(self):
-        if bool(self.topic) == bool(self.channel):
+        if [bool(self.topic), bool(self.channel), bool(self.__args)].count(True) != 1:
             return False
 
-        if not bool(self.topic) and not bool(self.channel):
+        if self.topic and not TopicTrie.is_valid_filter(self.topic):
             return False
 
+        for channel, output in self.routes:
+            if not output:
+                return False
+
+            if not Project.is_valid_channel(channel) and not TopicTrie.is_valid_filter(channel):
+                return False
+
         if self.channel and not Project.is_valid_channel(self.channel):
             return False
 
@@ -64,6 +74,11 @@ class CmdOSIOTopicSubscriber(object):
         return self.__opts.channel
 
 
+    @property
+    def routes(self):
+        return [tuple(arg.partition('=')[::2]) for arg in self.__args]      # list of (channel or topic, output)
+
+
     @property
     def verbose(self):
         return self.__opts.verbose
@@ -81,5 +96,5 @@ class CmdOSIOTopicSubscriber(object):
 
 
     def __str__(self, *args, **kwargs):
-        return "CmdOSIOTopicSubscriber:{topic:%s, channel:%s, verbose:%s, args:%s}" % \
-                    (self.topic, self.channel, self.verbose, self.args)
+        return "CmdOSIOTopicSubscriber:{topic:%s, channel:%s, routes:%s, verbose:%s, args:%s}" % \
+                    (self.topic, self.channel, self.routes, self.verbose, self.args)
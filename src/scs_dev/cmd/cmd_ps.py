@@ -0,0 +1,76 @@
+"""
+Created on 31 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdPs(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-i INTERVAL [-n SAMPLES]] [-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--interval", "-i", type="float", nargs=1, action="store", dest="interval",
+                                 help="report every INTERVAL seconds, with CPU usage over the interval")
+
+        self.__parser.add_option("--samples", "-n", type="int", nargs=1, action="store", dest="samples",
+                                 help="number of reports (unlimited if not specified)")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_valid(self):
+        if self.__opts.interval is not None and self.__opts.interval <= 0:
+            return False
+
+        if self.__opts.interval is None and self.__opts.samples is not None:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def interval(self):
+        return self.__opts.interval
+
+
+    @property
+    def samples(self):
+        return 1 if self.__opts.interval is None else self.__opts.samples
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdPs:{interval:%s, samples:%s, verbose:%s, args:%s}" % \
+               (self.interval, self.samples, self.verbose, self.args)
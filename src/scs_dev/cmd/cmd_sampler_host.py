@@ -0,0 +1,64 @@
+"""
+Created on 26 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import optparse
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CmdSamplerHost(object):
+    """unix command line handler"""
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__parser = optparse.OptionParser(usage="%prog [-d DIRECTORY] [-m] [-v]", version="%prog 1.0")
+
+        # optional...
+        self.__parser.add_option("--directory", "-d", type="string", nargs=1, action="store", dest="directory",
+                                 help="write each schedule item's samples to a file or pipe in DIRECTORY")
+
+        self.__parser.add_option("--metrics", "-m", action="store_true", dest="metrics", default=False,
+                                 help="write each schedule item's timing metrics, tagged ITEM-metrics")
+
+        self.__parser.add_option("--verbose", "-v", action="store_true", dest="verbose", default=False,
+                                 help="report narrative to stderr")
+
+        self.__opts, self.__args = self.__parser.parse_args()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__opts.directory
+
+
+    @property
+    def metrics(self):
+        return self.__opts.metrics
+
+
+    @property
+    def verbose(self):
+        return self.__opts.verbose
+
+
+    @property
+    def args(self):
+        return self.__args
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def print_help(self, file):
+        self.__parser.print_help(file)
+
+
+    def __str__(self, *args, **kwargs):
+        return "CmdSamplerHost:{directory:%s, metrics:%s, verbose:%s, args:%s}" % \
+               (self.directory, self.metrics, self.verbose, self.args)
@@ -0,0 +1,229 @@
+"""
+Created on 23 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A long-lived delivery channel for documents received by subscription.
+
+Documents are accepted as serialised JSON strings, held in a bounded buffer, and written to the channel's ProcessComms
+by a background thread - the caller never waits for a connection. When the buffer is full, the oldest document is
+dropped. If the comms fail, the document is retained, and delivery is re-attempted with back-off.
+
+On close, the buffer is drained for up to two seconds. Documents that are still undelivered after that are abandoned,
+and counted as dropped.
+
+The comms are held open between documents unless per_document is set. This is required for Unix domain socket
+receivers, which accept one document per connection.
+"""
+
+import threading
+import time
+
+from collections import deque
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeliveryChannel(object):
+    """
+    classdocs
+    """
+
+    __MAX_LENGTH =          100                 # documents
+
+    __MIN_RETRY_INTERVAL =  0.1                 # seconds
+    __MAX_RETRY_INTERVAL =  5.0                 # seconds
+
+    __STOP_TIMEOUT =        2.0                 # seconds, to drain the buffer
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, comms, per_document=False, max_length=None):
+        """
+        Constructor
+        """
+        self.__comms = comms                                                            # ProcessComms
+        self.__per_document = per_document                                              # bool
+        self.__max_length = self.__MAX_LENGTH if max_length is None else int(max_length)   # int
+
+        self.__buffer = deque()                                                         # deque of string
+        self.__condition = threading.Condition()
+
+        self.__worker = None                                                            # Thread
+        self.__running = False                                                          # bool
+        self.__connected = False                                                        # bool
+
+        self.__deadline = None                                                          # monotonic time, for the drain
+        self.__active = False                                                           # bool  a document in write
+        self.__abandoned = False                                                        # bool
+
+        self.__delivered = 0                                                            # int
+        self.__dropped = 0                                                              # int
+        self.__failures = 0                                                             # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        if self.__running:
+            return
+
+        self.__running = True
+        self.__deadline = None
+        self.__abandoned = False
+
+        self.__worker = threading.Thread(target=self.__run, name="DeliveryChannel", daemon=True)
+        self.__worker.start()
+
+
+    def close(self):
+        with self.__condition:
+            self.__running = False
+            self.__deadline = time.monotonic() + self.__STOP_TIMEOUT
+            self.__condition.notify_all()
+
+        # drain...
+        if self.__worker:
+            self.__worker.join(self.__STOP_TIMEOUT)
+            self.__worker = None
+
+        # abandon...
+        with self.__condition:
+            self.__dropped += len(self.__buffer) + (1 if self.__active else 0)
+            self.__buffer.clear()
+
+            self.__abandoned = True                                                     # late writes are not counted
+
+        self.__disconnect()
+
+
+    def deliver(self, jstr):
+        with self.__condition:
+            if len(self.__buffer) >= self.__max_length:
+                self.__buffer.popleft()
+                self.__dropped += 1
+
+            self.__buffer.append(jstr)
+
+            self.__condition.notify()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        retry_interval = self.__MIN_RETRY_INTERVAL
+
+        while True:
+            with self.__condition:
+                while self.__running and not self.__buffer:
+                    self.__condition.wait()
+
+                if not self.__buffer or self.__expired():                              # drained, or timed out
+                    return
+
+                jstr = self.__buffer.popleft()
+                self.__active = True
+
+            written = self.__write(jstr)
+
+            with self.__condition:
+                self.__active = False
+
+                if self.__abandoned:                                                    # already counted as dropped
+                    return
+
+                if written:
+                    self.__delivered += 1
+                    retry_interval = self.__MIN_RETRY_INTERVAL
+                    continue
+
+                # retain the document...
+                self.__failures += 1
+
+                if len(self.__buffer) < self.__max_length:
+                    self.__buffer.appendleft(jstr)
+                else:
+                    self.__dropped += 1
+
+                self.__condition.wait(self.__wait_interval(retry_interval))
+
+            retry_interval = min(retry_interval * 2, self.__MAX_RETRY_INTERVAL)
+
+
+    def __write(self, jstr):
+        try:
+            if not self.__connected:
+                self.__comms.connect()
+                self.__connected = True
+
+            self.__comms.write(jstr, False)
+
+            return True
+
+        except OSError:
+            self.__disconnect()
+            return False
+
+        finally:
+            if self.__per_document:
+                self.__disconnect()
+
+
+    def __expired(self):
+        return self.__deadline is not None and time.monotonic() >= self.__deadline
+
+
+    def __wait_interval(self, retry_interval):
+        if self.__deadline is None:
+            return retry_interval
+
+        return max(0.0, min(retry_interval, self.__deadline - time.monotonic()))
+
+
+    def __disconnect(self):
+        if not self.__connected:
+            return
+
+        self.__connected = False
+
+        try:
+            self.__comms.close()
+        except OSError:
+            pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def comms(self):
+        return self.__comms
+
+
+    @property
+    def length(self):
+        return len(self.__buffer)
+
+
+    @property
+    def delivered(self):
+        return self.__delivered
+
+
+    @property
+    def dropped(self):
+        return self.__dropped
+
+
+    @property
+    def failures(self):
+        return self.__failures
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "DeliveryChannel:{comms:%s, per_document:%s, max_length:%s, length:%s, delivered:%s, dropped:%s, " \
+               "failures:%s}" % \
+               (self.comms, self.__per_document, self.__max_length, self.length, self.delivered, self.dropped,
+                self.failures)
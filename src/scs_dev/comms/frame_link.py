@@ -0,0 +1,348 @@
+"""
+Created on 14 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+An optional binary framing for the pipes between local processes, as an alternative to newline-delimited JSON.
+
+A framed stream starts with a preamble, and is followed by length-prefixed frames. Each frame holds an optional
+topic and a JSON payload, with lengths as unsigned big-endian integers:
+
+    sync (0xfe) | topic length (2 bytes) | payload length (4 bytes) | topic (UTF-8) | payload (UTF-8 JSON)
+
+A publication is carried as its topic and payload, so the sender does not have to wrap the payload in the publication
+envelope, and the receiver need not scan the payload for the end of the line. A frame with a zero-length topic carries
+a plain document. The receiver still parses the payload in order to publish it.
+
+Several writers may share one named pipe, so the stream is resynchronisable: each frame is written in a single write
+of no more than PIPE_BUF bytes - which the pipe does not interleave - and the preamble of each writer may appear at
+any frame boundary, where it is skipped. The sync byte never occurs in UTF-8 text, so a reader that finds a bad
+header, an over-length frame or a frame that is not UTF-8 discards bytes up to the next sync byte or preamble. A
+publication too long for a frame is written as a line of JSON, and newline-delimited JSON is accepted at any frame
+boundary, so framed and unframed writers may share a pipe.
+
+Framing is enabled by the writer, for each link. A process that does not use a FrameReader cannot read a framed
+stream, so framing should only be enabled where the reader supports it.
+"""
+
+import json
+import select
+import struct
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class Frame(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, topic, payload):
+        """
+        Constructor
+        """
+        self.__topic = topic                            # string or None
+        self.__payload = payload                        # string            JSON
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topic(self):
+        return self.__topic
+
+
+    @property
+    def payload(self):
+        return self.__payload
+
+
+    @property
+    def text(self):
+        """
+        the newline-delimited JSON equivalent, without the newline
+        """
+        if self.__topic is None:
+            return self.__payload
+
+        return '{' + json.dumps(self.__topic, ensure_ascii=False) + ': ' + self.__payload + '}'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "Frame:{topic:%s, payload:%s}" % (self.topic, self.payload)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FrameWriter(object):
+    """
+    classdocs
+    """
+
+    PREAMBLE =      b'\x00scs-frames-1\n'
+    SYNC =          b'\xfe'                             # not valid in UTF-8
+
+    HEADER =        struct.Struct('>cHI')
+
+    MAX_FRAME =     select.PIPE_BUF                     # bytes, the limit of an atomic write to a pipe
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def json_payload(line):
+        """
+        return the line as a JSON payload, in the form given by JSONify, or None if it is not valid JSON
+        """
+        try:
+            jdict = json.loads(line, object_pairs_hook=OrderedDict)
+        except ValueError:
+            return None
+
+        return JSONify.dumps(jdict)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, stream, framed=True):
+        """
+        Constructor
+        """
+        self.__stream = stream                          # unbuffered binary stream, such as sys.stdout.buffer.raw
+        self.__framed = framed                          # bool
+
+        self.__started = False                          # bool
+        self.__oversized = 0                            # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, payload, topic=None):
+        topic_bytes = b'' if topic is None else topic.encode('utf-8')
+        payload_bytes = payload.encode('utf-8')
+
+        length = self.HEADER.size + len(topic_bytes) + len(payload_bytes)
+
+        # newline-delimited JSON...
+        if not self.__framed or length > self.MAX_FRAME:
+            if self.__framed:
+                self.__oversized += 1
+
+            self.__write(Frame(topic, payload).text.encode('utf-8') + b'\n')
+            return
+
+        # frame...
+        if not self.__started:
+            self.__write(self.PREAMBLE)
+            self.__started = True
+
+        self.__write(self.HEADER.pack(self.SYNC, len(topic_bytes), len(payload_bytes)) + topic_bytes + payload_bytes)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __write(self, data):
+        view = memoryview(data)
+
+        while view:
+            count = self.__stream.write(view)
+            view = view[len(view) if count is None else count:]
+
+        self.__stream.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def framed(self):
+        return self.__framed
+
+
+    @property
+    def oversized(self):
+        return self.__oversized
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "FrameWriter:{framed:%s, oversized:%s}" % (self.framed, self.oversized)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FrameReader(object):
+    """
+    classdocs
+    """
+
+    __WHITESPACE =  b' \t\r\n'
+    __BOUNDARIES =  (FrameWriter.SYNC, FrameWriter.PREAMBLE[:1])
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, stream):
+        """
+        Constructor
+        """
+        self.__stream = stream                          # binary stream
+        self.__framed = False                           # bool, True once a preamble has been read
+
+        self.__pending = bytearray()                    # bytearray     read ahead of a resynchronisation
+        self.__resyncs = 0                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self):
+        pass
+
+
+    def close(self):
+        pass
+
+
+    def read(self):
+        """
+        yield a Frame for each frame or line, until the stream is closed
+        """
+        preamble = FrameWriter.PREAMBLE
+        header = FrameWriter.HEADER
+
+        while True:
+            start = self.__read(1)
+
+            if not start:
+                return
+
+            # frame...
+            if start == FrameWriter.SYNC:
+                head = start + self.__read(header.size - 1)
+
+                if len(head) < header.size:
+                    self.__resync(head[1:])
+                    continue
+
+                _, topic_length, payload_length = header.unpack(head)
+
+                if header.size + topic_length + payload_length > FrameWriter.MAX_FRAME:
+                    self.__resync(head[1:])
+                    continue
+
+                body = self.__read(topic_length + payload_length)
+
+                try:
+                    if len(body) < topic_length + payload_length:
+                        raise ValueError("truncated frame")
+
+                    topic = body[:topic_length].decode('utf-8') if topic_length else None
+                    payload = body[topic_length:].decode('utf-8')
+
+                except ValueError:                      # includes UnicodeDecodeError
+                    self.__resync(head[1:] + body)
+                    continue
+
+                yield Frame(topic, payload)
+
+            # preamble of a writer...
+            elif start == preamble[:1]:
+                rest = self.__read(len(preamble) - 1)
+
+                if start + rest != preamble:
+                    self.__resync(rest)
+                    continue
+
+                self.__framed = True
+
+            # newline-delimited JSON...
+            elif start not in self.__WHITESPACE:
+                line = start + self.__readline()
+                boundary = self.__boundary(line)
+
+                if boundary is not None:
+                    self.__resync(line[1:])
+                    continue
+
+                text = line.decode('utf-8', 'replace').strip()
+
+                if text:
+                    yield Frame(None, text)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __read(self, count):
+        if not self.__pending:
+            return self.__stream.read(count)
+
+        data = bytes(self.__pending[:count])
+        del self.__pending[:count]
+
+        if len(data) < count:
+            data += self.__stream.read(count - len(data))
+
+        return data
+
+
+    def __readline(self):
+        if not self.__pending:
+            return self.__stream.readline()
+
+        end = self.__pending.find(b'\n')
+
+        if end < 0:
+            data = bytes(self.__pending)
+            self.__pending.clear()
+
+            return data + self.__stream.readline()
+
+        data = bytes(self.__pending[:end + 1])
+        del self.__pending[:end + 1]
+
+        return data
+
+
+    def __resync(self, data):
+        """
+        discard data up to the next possible frame boundary, and read on from there
+        """
+        self.__resyncs += 1
+
+        boundary = self.__boundary(data)
+
+        if boundary is not None:
+            self.__pending[0:0] = data[boundary:]
+
+
+    @classmethod
+    def __boundary(cls, data):
+        indices = [index for index in (data.find(boundary) for boundary in cls.__BOUNDARIES) if index >= 0]
+
+        return min(indices) if indices else None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def framed(self):
+        return self.__framed
+
+
+    @property
+    def resyncs(self):
+        return self.__resyncs
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "FrameReader:{framed:%s, resyncs:%s}" % (self.framed, self.resyncs)
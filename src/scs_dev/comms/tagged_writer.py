@@ -0,0 +1,174 @@
+"""
+Created on 26 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A thread-safe writer for documents from several sources.
+
+If no directory is given, each document is written to stdout, wrapped in a JSON document whose only field has the name
+of its tag. Otherwise, each document is written unwrapped to a file (or named pipe) in the directory, named for its
+tag. Files are opened for append on first use.
+
+Each tag has its own output, and its own lock, so that a slow output for one tag does not hold up the others - only
+stdout is shared. A named pipe is opened without blocking: if it has no reader, or if it is full, the document is
+dropped, and the pipe is opened again on the next write. A document longer than PIPE_BUF cannot be written to a named
+pipe both atomically and without blocking, so it is also dropped. Dropped documents are counted.
+
+Documents are encoded with a SampleEncoder for each tag, since the documents for any one tag have the same shape.
+
+example output to stdout:
+{"scs-climate": {"tag": "scs-ap1-6", "rec": "2018-04-04T13:09:49.648+00:00", "val": {"hmd": 66.2, "tmp": 21.7}}}
+"""
+
+import json
+import os
+import select
+import stat
+import sys
+import threading
+
+from scs_dev.sampler.sample_encoder import SampleEncoder
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TaggedWriter(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory=None):
+        """
+        Constructor
+        """
+        self.__directory = directory                    # string
+
+        self.__outputs = {}                             # dict of tag: _TagOutput
+        self.__encoders = {}                            # dict of tag: SampleEncoder
+        self.__lock = threading.Lock()                  # for stdout, and the dicts
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, tag, document):
+        encoder = self.__encoders.get(tag)
+
+        if encoder is None:
+            with self.__lock:
+                encoder = self.__encoders.setdefault(tag, SampleEncoder())
+
+        jstr = encoder.encode(document)                 # each tag is written by one task
+
+        if self.__directory is None:
+            with self.__lock:
+                sys.stdout.write('{' + json.dumps(tag) + ': ' + jstr + '}\n')
+                sys.stdout.flush()
+                return
+
+        output = self.__outputs.get(tag)
+
+        if output is None:
+            with self.__lock:
+                output = self.__outputs.setdefault(tag, _TagOutput(os.path.join(self.__directory, tag)))
+
+        output.write(jstr + '\n')                       # opened and written outside the shared lock
+
+
+    def close(self):
+        with self.__lock:
+            outputs = list(self.__outputs.values())
+
+        for output in outputs:
+            output.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__directory
+
+
+    @property
+    def dropped(self):
+        return sum(output.dropped for output in list(self.__outputs.values()))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TaggedWriter:{directory:%s, tags:%s, dropped:%s}" % \
+               (self.directory, sorted(self.__outputs.keys()), self.dropped)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _TagOutput(object):
+    """
+    documents for one tag, to a file or named pipe
+    """
+
+    def __init__(self, path):
+        self.__path = path                              # string
+
+        self.__file = None                              # file
+        self.__fifo = None                              # int           file descriptor
+        self.__lock = threading.Lock()
+
+        self.dropped = 0                                # int
+
+
+    def write(self, text):
+        with self.__lock:
+            if self.__file is None and self.__fifo is None and not self.__is_fifo():
+                self.__file = open(self.__path, "a")
+
+            if self.__file:
+                self.__file.write(text)
+                self.__file.flush()
+                return
+
+            self.__write_fifo(text.encode())
+
+
+    def close(self):
+        with self.__lock:
+            if self.__file:
+                self.__file.close()
+                self.__file = None
+
+            if self.__fifo is not None:
+                os.close(self.__fifo)
+                self.__fifo = None
+
+
+    def __write_fifo(self, data):
+        if len(data) > select.PIPE_BUF:
+            self.dropped += 1                           # could only be written in part, or by blocking
+            return
+
+        try:
+            if self.__fifo is None:
+                self.__fifo = os.open(self.__path, os.O_WRONLY | os.O_NONBLOCK)     # ENXIO if there is no reader
+
+            os.write(self.__fifo, data)                 # atomic: all or nothing
+
+        except BlockingIOError:
+            self.dropped += 1                           # the pipe is full
+
+        except OSError:
+            self.dropped += 1
+
+            if self.__fifo is not None:                 # no reader - reopen on next write
+                os.close(self.__fifo)
+                self.__fifo = None
+
+
+    def __is_fifo(self):
+        try:
+            return stat.S_ISFIFO(os.stat(self.__path).st_mode)
+
+        except OSError:
+            return False
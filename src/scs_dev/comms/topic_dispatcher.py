@@ -0,0 +1,265 @@
+"""
+Created on 12 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Routes the payloads of the publications received by an MQTT client to any number of outputs, by topic. Each route has
+an MQTT topic filter - which may have '+' and '#' wildcards - and an output, which may be stdout, a file or named pipe,
+or a Unix domain socket. A payload is written once to each output that it is routed to.
+
+The topic of each publication is read from the start of the line, before the line is parsed: lines whose topic does not
+match any route are rejected without being parsed.
+
+An output is opened on its first use. A domain socket that cannot be written is reconnected on the next write, and the
+payload is dropped. Likewise, a named pipe is opened without blocking: if it has no reader, or if it is full, the
+payload is dropped, and the pipe is opened again on the next write. A payload longer than PIPE_BUF cannot be written
+to a named pipe both atomically and without blocking, so it is also dropped. A named pipe is therefore never waited
+for - an absent or stalled reader on one route does not hold up the others. Dropped payloads are counted.
+"""
+
+import json
+import os
+import select
+import stat
+import sys
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+from scs_core.data.publication import Publication
+
+from scs_dev.comms.topic_trie import TopicTrie
+
+from scs_host.comms.domain_socket import DomainSocket
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicDispatcher(object):
+    """
+    classdocs
+    """
+
+    STDOUT =        '-'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def topic(cls, line):
+        """
+        return the topic of a publication, without parsing its payload, or None if it cannot be read
+        """
+        start = line.find('{')
+
+        if start < 0:
+            return None
+
+        quote = line.find('"', start + 1)
+
+        if quote < 0 or line[start + 1:quote].strip():
+            return None
+
+        try:
+            topic, _ = json.decoder.scanstring(line, quote + 1)
+
+        except ValueError:
+            return None
+
+        return topic
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, routes):
+        """
+        Constructor
+        """
+        self.__routes = list(routes)                    # list of (topic filter, output name)
+        self.__trie = TopicTrie()                       # TopicTrie
+
+        outputs = OrderedDict()
+
+        for topic_filter, name in self.__routes:
+            if name not in outputs:
+                outputs[name] = _StdoutOutput() if name == self.STDOUT else _PathOutput(name)
+
+            self.__trie.add(topic_filter, outputs[name])
+
+        self.__outputs = list(outputs.values())         # list of output
+
+        self.__dispatched = 0                           # int
+        self.__rejected = 0                             # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def dispatch(self, line):
+        topic = self.topic(line)
+        outputs = None if topic is None else self.__trie.match(topic)
+
+        if not outputs:
+            self.__rejected += 1
+            return False
+
+        try:
+            jdict = json.loads(line, object_pairs_hook=OrderedDict)
+        except ValueError:
+            self.__rejected += 1
+            return False
+
+        publication = Publication.construct_from_jdict(jdict)
+
+        if publication is None:
+            self.__rejected += 1
+            return False
+
+        message = JSONify.dumps(publication.payload)
+
+        for output in outputs:
+            output.write(message)
+
+        self.__dispatched += 1
+
+        return True
+
+
+    def close(self):
+        for output in self.__outputs:
+            output.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def routes(self):
+        return self.__routes
+
+
+    @property
+    def dispatched(self):
+        return self.__dispatched
+
+
+    @property
+    def rejected(self):
+        return self.__rejected
+
+
+    @property
+    def dropped(self):
+        return sum(output.dropped for output in self.__outputs)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TopicDispatcher:{routes:%s, dispatched:%s, rejected:%s, dropped:%s}" % \
+               (self.routes, self.dispatched, self.rejected, self.dropped)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _StdoutOutput(object):
+    """
+    payloads to stdout
+    """
+
+    dropped = 0
+
+    @staticmethod
+    def write(message):
+        sys.stdout.write(message + '\n')
+        sys.stdout.flush()
+
+
+    def close(self):
+        pass
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _PathOutput(object):
+    """
+    payloads to a file, named pipe or Unix domain socket
+    """
+
+    def __init__(self, path):
+        self.__path = path                              # string
+
+        self.__file = None                              # file
+        self.__fifo = None                              # int           file descriptor
+        self.__uds = None                               # DomainSocket
+
+        self.dropped = 0                                # int
+
+
+    def write(self, message):
+        mode = None if self.__file or self.__fifo is not None or self.__uds else self.__mode()
+
+        # named pipe...
+        if self.__fifo is not None or (mode is not None and stat.S_ISFIFO(mode)):
+            self.__write_fifo((message + '\n').encode())
+            return
+
+        # file...
+        if self.__file is None and self.__uds is None and not (mode is not None and stat.S_ISSOCK(mode)):
+            self.__file = open(self.__path, "a")
+
+        if self.__file:
+            self.__file.write(message + '\n')
+            self.__file.flush()
+            return
+
+        # UDS...
+        try:
+            if self.__uds is None:
+                self.__uds = DomainSocket(self.__path)
+                self.__uds.connect(False)
+
+            self.__uds.write(message, False)
+
+        except OSError:
+            self.dropped += 1
+            self.close()                                # reconnect on next write
+
+
+    def close(self):
+        if self.__file:
+            self.__file.close()
+            self.__file = None
+
+        if self.__fifo is not None:
+            os.close(self.__fifo)
+            self.__fifo = None
+
+        if self.__uds:
+            self.__uds.close()
+            self.__uds = None
+
+
+    def __write_fifo(self, data):
+        if len(data) > select.PIPE_BUF:
+            self.dropped += 1                           # could only be written in part, or by blocking
+            return
+
+        try:
+            if self.__fifo is None:
+                self.__fifo = os.open(self.__path, os.O_WRONLY | os.O_NONBLOCK)     # ENXIO if there is no reader
+
+            os.write(self.__fifo, data)                 # atomic: all or nothing
+
+        except BlockingIOError:
+            self.dropped += 1                           # the pipe is full
+
+        except OSError:
+            self.dropped += 1
+            self.close()                                # no reader - reopen on next write
+
+
+    def __mode(self):
+        try:
+            return os.stat(self.__path).st_mode
+
+        except OSError:
+            return None
@@ -0,0 +1,146 @@
+"""
+Created on 12 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A trie of MQTT topic filters, each with any number of targets. A topic is matched against every filter at once, by
+walking the trie one topic level at a time, so the cost of a match depends on the depth of the topic, rather than on
+the number of filters.
+
+Filters follow the MQTT rules: '+' matches exactly one level, and '#' - which must be the last level - matches any
+number of levels, including none. Topics that start with '$' are not matched by a wildcard in the first level.
+
+example:
+filters: south-coast-science-dev/production-test/loc/1/+, south-coast-science-dev/#
+topic: south-coast-science-dev/production-test/loc/1/gases - matches both
+"""
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicTrie(object):
+    """
+    classdocs
+    """
+
+    SEPARATOR =         '/'
+
+    SINGLE_LEVEL =      '+'
+    MULTI_LEVEL =       '#'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def is_valid_filter(cls, topic_filter):
+        if not topic_filter:
+            return False
+
+        levels = topic_filter.split(cls.SEPARATOR)
+
+        for i, level in enumerate(levels):
+            if cls.MULTI_LEVEL in level and (level != cls.MULTI_LEVEL or i != len(levels) - 1):
+                return False
+
+            if cls.SINGLE_LEVEL in level and level != cls.SINGLE_LEVEL:
+                return False
+
+        return True
+
+
+    @classmethod
+    def is_wildcard(cls, topic_filter):
+        return cls.SINGLE_LEVEL in topic_filter or cls.MULTI_LEVEL in topic_filter
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__root = _Node()                           # _Node
+        self.__filters = []                             # list of string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def add(self, topic_filter, target):
+        if not self.is_valid_filter(topic_filter):
+            raise ValueError(topic_filter)
+
+        node = self.__root
+
+        for level in topic_filter.split(self.SEPARATOR):
+            node = node.children.setdefault(level, _Node())
+
+        node.targets.append(target)
+
+        if topic_filter not in self.__filters:
+            self.__filters.append(topic_filter)
+
+
+    def match(self, topic):
+        """
+        return the targets of every matching filter, in the order in which they were added, without repetition
+        """
+        targets = []
+        self.__match(self.__root, topic.split(self.SEPARATOR), 0, targets)
+
+        if len(targets) < 2:
+            return targets
+
+        return sorted(set(targets), key=targets.index)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __match(self, node, levels, i, targets):
+        # '#' matches the remaining levels, including none...
+        multi = node.children.get(self.MULTI_LEVEL)
+
+        if multi is not None and not (i == 0 and levels[0].startswith('$')):
+            targets.extend(multi.targets)
+
+        if i == len(levels):
+            targets.extend(node.targets)
+            return
+
+        # exact...
+        child = node.children.get(levels[i])
+
+        if child is not None:
+            self.__match(child, levels, i + 1, targets)
+
+        # '+' matches this level...
+        single = node.children.get(self.SINGLE_LEVEL)
+
+        if single is not None and not (i == 0 and levels[0].startswith('$')):
+            self.__match(single, levels, i + 1, targets)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filters(self):
+        return self.__filters
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TopicTrie:{filters:%s}" % self.filters
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _Node(object):
+    """
+    one level of the trie
+    """
+
+    __slots__ = ('children', 'targets')
+
+    def __init__(self):
+        self.children = {}                              # dict of level: _Node
+        self.targets = []                               # list of target
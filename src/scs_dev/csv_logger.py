@@ -9,7 +9,7 @@ DESCRIPTION
 The csv_logger utility is used to provide continuous logging of data. For devices that are not internet-connected, this
 can be used as the method of data capture. For always-connected devices, it is recommended that the utility is used to
 provide a backup facility. This is because, in normal operations, data that is queued for publishing is held in
-volatile memory.
+volatile memory (unless the MQTT client is run with a durable spool).
 
 The operation of the csv_logger is specified using the csv_logger_conf utility - this specifies the filesystem location
 for logging, together with the logging mode of operation.
@@ -26,18 +26,52 @@ Like the csv_writer utility, the csv_logger converts data from JSON format to co
 The path into the JSON document is used to name the column in the header row, with JSON nodes separated by a period
 ('.') character.
 
+Alongside each CSV log file, the csv_logger writes an index file - with the suffix .idx - that gives the position of
+every 100th row, together with its rec datetime. The index enables the csv_reader utility to seek directly to a given
+time range.
+
 All the leaf nodes of the first JSON document are included in the CSV. If subsequent JSON documents in the input stream
 contain fields that were not in this first document, these extra fields are ignored.
 
+If the "extend" (-x) flag is used, then the first 20 documents are held back, and the log is started with all of the
+leaf nodes found in any of them. If a later document has a field that is not in the log, then a new log file is
+started with the extended schema - logs that have already been written are not changed. The new log has a link file,
+with the suffix .lnk, that names the log before it, and lists the new fields.
+
+If the "columnar" (-c) flag is used, then logs are written in a compact binary columnar format, rather than CSV. The
+columns are the same as for CSV, but rows are collected into compressed blocks, each of which is indexed by the range
+of its rec times. Columnar log files have the suffix .scl, and may be read with the csv_reader or log_exporter
+utilities. Rows are written to storage when a block is complete - after 360 rows, or 10 minutes.
+
+If the "compress" (-z) flag is used, then CSV log files are compressed with gzip once they are closed - that is, when
+they were last written before the current UTC day, and not in the last ten minutes. Compressed log files have the
+suffix .csv.gz, and may be read with the csv_reader utility. Compression is performed at low priority, on a separate
+thread, and is safe where several csv_logger processes share a log directory. Daily CSV logs typically compress by a
+factor of eight or more.
+
+If the volume is short of space, and the csv_logger_conf permits deletion, the least recently modified log files -
+whether plain, compressed or columnar - are deleted, until at least 50MB is free.
+
+If the "write-behind" (-w) flag is used, then received documents are placed in a bounded memory buffer, and are
+written to storage on a separate thread, so that a slow or stalled storage medium does not hold up the data pipeline.
+Rows are committed in batches - of the given batch size (default 100 rows), or at the csv_logger_conf write interval
+if this is shorter - and each batch is synced to storage once written. With the columnar (-c) flag, each batch
+completes a block of the columnar log, so the batch size is also the block size. If the buffer fills, the oldest
+documents are dropped. In verbose mode, write-behind statistics are reported to stderr on exit.
+
+On SIGTERM, the csv_logger writes any buffered documents to storage before terminating.
+
 If the "echo" (-e) flag is used, then the csv_logger utility writes the received data to stdout. The csv_logger will
 write to stdout irrespective of whether a csv_logger_conf is specified, or whether logging can continue (for example,
 because of a filesystem problem).
 
 SYNOPSIS
-csv_logger.py [-e] [-v] TOPIC
+csv_logger.py [-c | -z] [-x] [-w [-b BATCH]] [-e] [-v] TOPIC
 
 EXAMPLES
 ./socket_receiver.py | ./csv_logger.py -e climate
+./gases_sampler.py -i10 | ./csv_logger.py -c gases
+./climate_sampler.py -i1 | ./csv_logger.py -w -b 60 -e climate
 
 DOCUMENT EXAMPLE - INPUT
 {"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:27.641+00:00", "val": {"hmd": 59.6, "tmp": 23.8}}
@@ -47,35 +81,55 @@ tag,rec,val.hmd,val.tmp
 scs-ap1-6,2018-04-04T14:50:38.394+00:00,59.7,23.8
 
 SEE ALSO
+scs_dev/csv_logger_host
 scs_dev/csv_reader
 scs_dev/csv_writer
+scs_dev/log_exporter
 scs_mfr/csv_logger_conf
 scs_mfr/system_id
 
 BUGS
-If any filesystem problem is encountered then logging is inhibited, and no further attempt is made to re-establish
-access to the storage medium.
+If the storage medium fails, received documents are held in memory - up to 10,000 rows - while the log volume is
+probed, with increasing intervals of up to five minutes. When the volume is writable again, a new log file is started,
+and the held documents are written to it. If the memory buffer fills, the oldest documents are lost.
+
+If the log volume is full, and the csv_logger_conf does not permit deletion of old logs, then logging is inhibited.
+
+In columnar mode, the rows of the current block are held in memory, and are lost if the csv_logger is killed.
 """
 
+import signal
 import sys
 
 from scs_core.csv.csv_log import CSVLog
-from scs_core.csv.csv_logger import CSVLogger
 from scs_core.csv.csv_logger_conf import CSVLoggerConf
 
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_csv_logger import CmdCSVLogger
+from scs_dev.logger.archive_logger import ArchiveLogger
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.csv_log_writer import CSVLogWriter
+from scs_dev.logger.log_compressor import LogCompressor
+from scs_dev.logger.write_behind_logger import WriteBehindLogger
 
 from scs_host.sys.host import Host
 
 
+# --------------------------------------------------------------------------------------------------------------------
+
+# noinspection PyUnusedLocal
+def sigterm_handler(signum, frame):
+    raise KeyboardInterrupt
+
+
 # --------------------------------------------------------------------------------------------------------------------
 
 if __name__ == '__main__':
 
     cmd = None
     logger = None
+    compressor = None
 
     try:
         # ------------------------------------------------------------------------------------------------------------
@@ -114,17 +168,43 @@ if __name__ == '__main__':
         if log and cmd.verbose:
             print("csv_logger: %s" % log, file=sys.stderr)
 
-        # CSVLogger...
-        logger = None if log is None else CSVLogger(Host, log, conf.delete_oldest, conf.write_interval)
+        # ArchiveLogger...
+        writer_class = ColumnarLogWriter if cmd.columnar else CSVLogWriter
+
+        if log is None:
+            logger = None
+
+        elif cmd.write_behind:
+            archive = ArchiveLogger(Host, log, conf.delete_oldest, conf.write_interval, writer_class,
+                                    deferred=True, evolving=cmd.extend)
+            logger = WriteBehindLogger(Host, archive, cmd.batch, conf.write_interval)
+
+        else:
+            logger = ArchiveLogger(Host, log, conf.delete_oldest, conf.write_interval, writer_class,
+                                   evolving=cmd.extend)
 
         if cmd.verbose:
             print("csv_logger: %s" % logger, file=sys.stderr)
+
+        # LogCompressor...
+        compressor = LogCompressor(conf.root_path) if conf and cmd.compress else None
+
+        if compressor and cmd.verbose:
+            print("csv_logger: %s" % compressor, file=sys.stderr)
             sys.stderr.flush()
 
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
+        signal.signal(signal.SIGTERM, sigterm_handler)
+
+        if cmd.write_behind and logger:
+            logger.start()
+
+        if compressor:
+            compressor.start()
+
         for line in sys.stdin:
             datum = line.strip()
 
@@ -132,14 +212,7 @@ if __name__ == '__main__':
                 break
 
             if logger:
-                try:
-                    logger.write(datum)
-
-                except OSError as ex:
-                    logger.writing_inhibited = True
-
-                    print("csv_logger: %s" % ex, file=sys.stderr)
-                    sys.stderr.flush()
+                logger.write(datum)
 
             # echo...
             if cmd.echo:
@@ -155,5 +228,11 @@ if __name__ == '__main__':
             print("csv_logger: KeyboardInterrupt", file=sys.stderr)
 
     finally:
+        if compressor:
+            compressor.stop()
+
         if logger is not None:
             logger.close()
+
+            if cmd.write_behind and cmd.verbose:
+                print("csv_logger: %s" % logger.stats, file=sys.stderr)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+Created on 3 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The csv_logger_host utility provides continuous logging of data for any number of topics, within a single process. It
+is an alternative to running one csv_logger utility per topic, and saves both memory and storage activity.
+
+The csv_logger_host receives tagged JSON documents - each wrapped in a JSON document whose only field has the name of
+its topic, as written by the sampler_host utility - either from a Unix domain socket, or from stdin. Each topic is
+logged separately, exactly as by the csv_logger utility: the log file is named for its topic and the date / time of
+the first document received, and log files are started afresh each day.
+
+The operation of the csv_logger_host is specified using the csv_logger_conf utility. Documents for all topics are
+written together, each write interval, preceded by a single check of the space available on the log volume. If the
+write interval is zero, documents are written as they are received. If the log volume is full and the configuration
+does not permit the deletion of old logs, logging is inhibited for all topics.
+
+If the "extend" (-x) flag is used, then the log for each topic is started with the union of the fields in its first
+20 documents, and a new log file is started if a field appears after that. See the csv_logger utility for details.
+
+If the "compress" (-z) flag is used, then CSV log files are compressed with gzip, in the background, once they are
+closed. See the csv_logger utility for details.
+
+If the "echo" (-e) flag is used, then the csv_logger_host writes the received documents to stdout, whether or not
+logging is possible.
+
+SYNOPSIS
+csv_logger_host.py [-u UDS] [-c | -z] [-x] [-e] [-v]
+
+EXAMPLES
+./csv_logger_host.py -v -u /home/pi/SCS/pipes/log_uds
+./sampler_host.py | ./csv_logger_host.py -e
+
+FILES
+~/SCS/conf/csv_logger_conf.json
+~/SCS/conf/system_id.json
+
+DOCUMENT EXAMPLE - INPUT
+{"scs-climate": {"tag": "scs-ap1-6", "rec": "2018-04-04T13:09:49.648+00:00", "val": {"hmd": 66.2, "tmp": 21.7}}}
+
+SEE ALSO
+scs_dev/csv_logger
+scs_dev/csv_reader
+scs_dev/sampler_host
+scs_mfr/csv_logger_conf
+scs_mfr/system_id
+
+BUGS
+Documents that are not wrapped with a topic name are ignored.
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_core.csv.csv_logger_conf import CSVLoggerConf
+
+from scs_core.data.json import JSONify
+
+from scs_core.sys.system_id import SystemID
+
+from scs_dev.cmd.cmd_csv_logger_host import CmdCSVLoggerHost
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.csv_log_writer import CSVLogWriter
+from scs_dev.logger.log_compressor import LogCompressor
+from scs_dev.logger.multi_topic_logger import MultiTopicLogger
+
+from scs_host.comms.domain_socket import DomainSocket
+from scs_host.comms.stdio import StdIO
+from scs_host.sys.host import Host
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    cmd = None
+    comms = None
+    logger = None
+    compressor = None
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # cmd...
+
+        cmd = CmdCSVLoggerHost()
+
+        if not cmd.is_valid():
+            cmd.print_help(sys.stderr)
+            exit(2)
+
+        if cmd.verbose:
+            print("csv_logger_host: %s" % cmd, file=sys.stderr)
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        # SystemID...
+        system_id = SystemID.load(Host)
+
+        if system_id and cmd.verbose:
+            print("csv_logger_host: %s" % system_id, file=sys.stderr)
+
+        tag = None if system_id is None else system_id.message_tag()
+
+        # CSVLoggerConf...
+        conf = CSVLoggerConf.load(Host)
+
+        if conf and cmd.verbose:
+            print("csv_logger_host: %s" % conf, file=sys.stderr)
+
+        # MultiTopicLogger...
+        writer_class = ColumnarLogWriter if cmd.columnar else CSVLogWriter
+
+        logger = None if conf is None else MultiTopicLogger(Host, conf, tag, writer_class, cmd.extend)
+
+        if cmd.verbose:
+            print("csv_logger_host: %s" % logger, file=sys.stderr)
+
+        # LogCompressor...
+        compressor = LogCompressor(conf.root_path) if conf and cmd.compress else None
+
+        if compressor and cmd.verbose:
+            print("csv_logger_host: %s" % compressor, file=sys.stderr)
+
+        # comms...
+        comms = DomainSocket(cmd.uds) if cmd.uds else StdIO()
+
+        if cmd.verbose:
+            print("csv_logger_host: %s" % comms, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        if logger:
+            logger.start()
+
+        if compressor:
+            compressor.start()
+
+        comms.connect()
+
+        for message in comms.read():
+            try:
+                jdict = json.loads(message, object_pairs_hook=OrderedDict)
+            except ValueError:
+                continue
+
+            if not isinstance(jdict, dict) or len(jdict) != 1:
+                continue
+
+            topic, document = next(iter(jdict.items()))
+
+            if logger and MultiTopicLogger.is_valid_topic(topic):
+                logger.write(topic, JSONify.dumps(document))
+
+            # echo...
+            if cmd.echo:
+                print(message.strip())
+                sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd and cmd.verbose:
+            print("csv_logger_host: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if comms:
+            comms.close()
+
+        if compressor:
+            compressor.stop()
+
+        if logger:
+            logger.stop()
+
+            if cmd.verbose:
+                print("csv_logger_host: %s" % logger, file=sys.stderr)
@@ -14,11 +14,31 @@ The names of columns given in the header row indicate paths into the JSON docume
 The first row of the CSV file (or stdin input) is assumed to be a header row. If there are more columns in the body of
 the CSV than in the header, excess values are ignored.
 
+If the named file is a columnar log - as written by the csv_logger utility in columnar mode - then it is read in
+that format. If the named file is a compressed CSV log - with the suffix .gz, as written by the csv_logger utility in
+compress mode - then it is decompressed as it is read.
+
+If a start and / or end datetime is given, then only those rows recorded at or after the start, and before the end,
+are read. A file must be named. If the file is a CSV log with a sidecar index - as written by the csv_logger utility -
+then the csv_reader seeks directly to the start of the window. Rows are assumed to be in rec order.
+
+If more than one file is named, then the files are read in parallel, by a pool of worker processes, and their
+documents are merged in rec order. Filenames may be given as glob patterns, which are expanded by the csv_reader if
+they have not been expanded by the shell. Each file must be a log - CSV, compressed CSV or columnar - whose rows are
+in rec order.
+
+If a limit is given, then the csv_reader stops after that number of documents.
+
+When reading from files, output is written in blocks, unless stdout is a terminal. When reading from stdin, each
+document is written as soon as it is read.
+
 SYNOPSIS
-csv_reader.py [-v] [FILENAME]
+csv_reader.py [-s START] [-e END] [-l LIMIT] [-v] [FILENAME ...]
 
 EXAMPLES
 ./csv_reader.py temp.csv
+./csv_reader.py -s 2018-08-01T00:00:00Z -e 2018-09-01T00:00:00Z "/srv/SCS_logging/2018-08/*-climate-*.csv*"
+./csv_reader.py -s 2018-08-03T10:00:00Z -e 2018-08-03T14:00:00Z scs-ap1-6-gases-2018-08-03-00-00-05.csv
 
 DOCUMENT EXAMPLE - INPUT
 tag,rec,val.hmd,val.tmp
@@ -30,6 +50,7 @@ DOCUMENT EXAMPLE - OUTPUT
 SEE ALSO
 scs_dev/csv_logger
 scs_dev/csv_writer
+scs_dev/log_exporter
 """
 
 import sys
@@ -37,6 +58,12 @@ import sys
 from scs_core.csv.csv_reader import CSVReader
 
 from scs_dev.cmd.cmd_csv_reader import CmdCSVReader
+from scs_dev.logger.columnar_log_reader import ColumnarLogReader
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.csv_log_reader import CSVLogReader
+from scs_dev.logger.log_compressor import LogCompressor
+from scs_dev.logger.log_merger import LogMerger
+from scs_dev.logger.log_time import LogTime
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -52,13 +79,40 @@ if __name__ == '__main__':
 
         cmd = CmdCSVReader()
 
+        if not cmd.is_valid():
+            cmd.print_help(sys.stderr)
+            exit(2)
+
         if cmd.verbose:
             print("csv_reader: %s" % cmd, file=sys.stderr)
 
+        start = None if cmd.start is None else LogTime.timestamp(cmd.start)
+        end = None if cmd.end is None else LogTime.timestamp(cmd.end)
+
+        if (cmd.start is not None and start is None) or (cmd.end is not None and end is None):
+            print("csv_reader: invalid datetime.", file=sys.stderr)
+            exit(2)
+
         # ------------------------------------------------------------------------------------------------------------
         # resources...
 
-        reader = CSVReader(cmd.filename)
+        filenames = cmd.filenames
+
+        merged = len(filenames) > 1
+        columnar = cmd.filename is not None and ColumnarLogWriter.is_columnar(cmd.filename)
+        compressed = LogCompressor.is_compressed(cmd.filename)
+
+        if merged:
+            reader = LogMerger(filenames, start, end)
+
+        elif columnar:
+            reader = ColumnarLogReader(cmd.filename)
+
+        elif cmd.windowed or compressed:
+            reader = CSVLogReader(cmd.filename)
+
+        else:
+            reader = CSVReader(cmd.filename)
 
         if cmd.verbose:
             print("csv_reader: %s" % reader, file=sys.stderr)
@@ -67,9 +121,34 @@ if __name__ == '__main__':
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
-        for datum in reader.rows:
+        if merged:
+            data = reader.documents()
+
+        elif columnar or cmd.windowed or compressed:
+            data = reader.documents(start, end)
+
+        else:
+            data = reader.rows
+
+        # stdin may be a live stream - file output is only flushed if interactive...
+        flush = cmd.filename is None or sys.stdout.isatty()
+        count = 0
+
+        for datum in data:
             print(datum)
-            sys.stdout.flush()
+
+            if flush:
+                sys.stdout.flush()
+
+            count += 1
+
+            if cmd.limit is not None and count >= cmd.limit:
+                break
+
+        sys.stdout.flush()
+
+        if cmd.verbose:
+            print("csv_reader: documents: %d" % count, file=sys.stderr)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -14,11 +14,21 @@ The path into the JSON document is used to name the column in the header row, wi
 All the leaf nodes of the first JSON document are included in the CSV. If subsequent JSON documents in the input stream
 contain fields that were not in this first document, these extra fields are ignored.
 
+If the "extend" (-x) flag is used, then the first 20 documents are held back, and the header includes all of the leaf
+nodes found in any of them. If a later document has a field that is not in the header, then the current file is
+closed, and a new file segment is started with an extended header: temp.csv is followed by temp.1.csv, temp.2.csv and
+so on. Each new segment has a link file - with the suffix .lnk - that names the segment before it, and lists the new
+fields. Segments that have already been written are not changed. Unless the "append" (-a) flag is used, the segments
+and links of an earlier run to the same file are removed when the file is started. The segments may be read together
+with the csv_reader utility. When writing to stdout, fields that appear after the first 20 documents are reported to
+stderr, and ignored.
+
 SYNOPSIS
-csv_writer.py [-c] [-a] [-e] [-v] [FILENAME]
+csv_writer.py [-x] [-a] [-e] [-v] [FILENAME]
 
 EXAMPLES
 ./socket_receiver.py | ./csv_writer.py temp.csv -e
+./gases_sampler.py -i10 | ./csv_writer.py -x gases.csv
 
 DOCUMENT EXAMPLE - INPUT
 {"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:27.641+00:00", "val": {"hmd": 59.6, "tmp": 23.8}}
@@ -37,6 +47,7 @@ import sys
 from scs_core.csv.csv_writer import CSVWriter
 
 from scs_dev.cmd.cmd_csv_writer import CmdCSVWriter
+from scs_dev.logger.segmented_csv_writer import SegmentedCSVWriter
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -59,7 +70,7 @@ if __name__ == '__main__':
         # ------------------------------------------------------------------------------------------------------------
         # resources...
 
-        writer = CSVWriter(cmd.filename, cmd.append)
+        writer = SegmentedCSVWriter(cmd.filename, cmd.append) if cmd.extend else CSVWriter(cmd.filename, cmd.append)
 
         if cmd.verbose:
             print("csv_writer: %s" % writer, file=sys.stderr)
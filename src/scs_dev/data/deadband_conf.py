@@ -0,0 +1,208 @@
+"""
+Created on 16 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+The deadband settings for one topic, as held in a deadband configuration file. The file is a JSON object with a member
+for each topic. Each topic has an optional heartbeat interval, in seconds, an optional default threshold, and a
+threshold for any number of fields.
+
+A field is named by its node path, with nodes separated by a period ('.'). A threshold applies to the field and to
+every leaf below it, unless a longer path is given for the leaf. A threshold of null excludes the field from the
+comparison - for example, an uptime, or diagnostic timings, which change in every document.
+
+A threshold has an absolute and a relative part: a change in a numeric value is significant if it exceeds both the
+absolute threshold and the relative threshold multiplied by the magnitude of the last value sent. With neither part,
+any change is significant. Any change in a non-numeric value is significant.
+
+example:
+{"climate": {"heartbeat": 600, "default": {"abs": 0.1},
+"fields": {"val.hmd": {"abs": 0.5}, "val.tmp": {"abs": 0.2, "rel": 0.01}}},
+"status": {"heartbeat": 3600, "fields": {"val.up": null, "val.tmp": {"abs": 1.0}}}}
+"""
+
+import json
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeadbandConf(JSONable):
+    """
+    classdocs
+    """
+
+    SEPARATOR =     '.'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def load_from_file(cls, filename, topic):
+        """
+        return the settings for the topic, or None if the topic is not in the file
+        """
+        with open(filename, "r") as f:
+            jdict = json.load(f, object_pairs_hook=OrderedDict)
+
+        return cls.construct_from_jdict(jdict.get(topic))
+
+
+    @classmethod
+    def construct_from_jdict(cls, jdict):
+        if not jdict:
+            return None
+
+        heartbeat = jdict.get('heartbeat')
+        default = DeadbandThreshold.construct_from_jdict(jdict.get('default'))
+
+        fields = OrderedDict()
+
+        for path, threshold_jdict in jdict.get('fields', {}).items():
+            fields[path] = DeadbandThreshold.construct_from_jdict(threshold_jdict)
+
+        return DeadbandConf(heartbeat, default, fields)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, heartbeat, default, fields):
+        """
+        Constructor
+        """
+        self.__heartbeat = heartbeat                    # float seconds or None
+        self.__default = default                        # DeadbandThreshold or None
+        self.__fields = fields                          # OrderedDict of path: DeadbandThreshold or None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def threshold(self, path):
+        """
+        return the threshold for the leaf at the given path - a tuple of nodes - or None if it is excluded
+        """
+        nodes = [str(node) for node in path]
+
+        for length in range(len(nodes), 0, -1):
+            name = self.SEPARATOR.join(nodes[:length])
+
+            if name in self.__fields:
+                return self.__fields[name]
+
+        return DeadbandThreshold(None, None) if self.__default is None else self.__default
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        if self.heartbeat is not None:
+            jdict['heartbeat'] = self.heartbeat
+
+        if self.default is not None:
+            jdict['default'] = self.default
+
+        jdict['fields'] = self.fields
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def heartbeat(self):
+        return self.__heartbeat
+
+
+    @property
+    def default(self):
+        return self.__default
+
+
+    @property
+    def fields(self):
+        return self.__fields
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "DeadbandConf:{heartbeat:%s, default:%s, fields:{%s}}" % \
+               (self.heartbeat, self.default, ', '.join("%s:%s" % item for item in self.fields.items()))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeadbandThreshold(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct_from_jdict(cls, jdict):
+        if jdict is None:
+            return None
+
+        return DeadbandThreshold(jdict.get('abs'), jdict.get('rel'))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, absolute, relative):
+        """
+        Constructor
+        """
+        self.__absolute = absolute                      # float or None
+        self.__relative = relative                      # float or None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def exceeded(self, last, value):
+        change = abs(value - last)
+
+        if self.__absolute is not None and change <= self.__absolute:
+            return False
+
+        if self.__relative is not None and change <= self.__relative * abs(last):
+            return False
+
+        return change > 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        if self.absolute is not None:
+            jdict['abs'] = self.absolute
+
+        if self.relative is not None:
+            jdict['rel'] = self.relative
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def absolute(self):
+        return self.__absolute
+
+
+    @property
+    def relative(self):
+        return self.__relative
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "DeadbandThreshold:{absolute:%s, relative:%s}" % (self.absolute, self.relative)
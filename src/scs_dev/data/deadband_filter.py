@@ -0,0 +1,156 @@
+"""
+Created on 16 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A report-by-exception filter for a stream of documents on one topic. A document is passed if any of its fields has
+changed significantly since the last document that was passed, according to the DeadbandConf for the topic.
+Otherwise, it is suppressed.
+
+A document is also passed if it is the first, if its set of compared fields has changed, or if the heartbeat interval
+has elapsed since the last document was passed - so that a receiver can tell a stable value from a silent device. The
+interval is timed by the rec field of the documents, or by the system clock for documents without a rec. Fields that
+are excluded by the conf are not compared, so an excluded field - such as a diagnostics block - may come and go
+without a document being passed.
+
+Changes are measured from the last document passed, rather than the last document received, so that a slow drift is
+reported once it exceeds the threshold. The state of the filter is a single dict of the compared leaf values of that
+document. The threshold for each field is found once, on the first document in which the field appears.
+"""
+
+import time
+
+from scs_dev.data.deadband_conf import DeadbandConf
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeadbandFilter(object):
+    """
+    classdocs
+    """
+
+    __EXCLUDED =        object()                        # the threshold of an excluded field
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, conf: DeadbandConf):
+        """
+        Constructor
+        """
+        self.__conf = conf                              # DeadbandConf
+
+        self.__thresholds = {}                          # dict of path: DeadbandThreshold or __EXCLUDED
+        self.__last = None                              # dict of path: value       the last document passed
+        self.__last_time = None                         # float                     epoch seconds
+
+        self.__passed = 0                               # int
+        self.__suppressed = 0                           # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def accept(self, document):
+        """
+        return True if the document should be passed, and record it as the last document passed
+        """
+        timestamp = LogTime.timestamp(document.get(LogTime.REC_PATH))
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        leaves = {path: value for path, value in self.__leaves(document, ())
+                  if self.__threshold(path) is not self.__EXCLUDED}
+
+        if not self.__is_significant(leaves, timestamp):
+            self.__suppressed += 1
+            return False
+
+        self.__last = leaves
+        self.__last_time = timestamp
+        self.__passed += 1
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __is_significant(self, leaves, timestamp):
+        if self.__last is None or len(leaves) != len(self.__last):
+            return True
+
+        heartbeat = self.__conf.heartbeat
+
+        if heartbeat is not None and timestamp - self.__last_time >= heartbeat:
+            return True
+
+        for path, value in leaves.items():
+            if path not in self.__last:
+                return True
+
+            last = self.__last[path]
+
+            if type(value) in (int, float) and type(last) in (int, float):
+                if self.__threshold(path).exceeded(last, value):
+                    return True
+
+            elif value != last:
+                return True
+
+        return False
+
+
+    def __threshold(self, path):
+        threshold = self.__thresholds.get(path)
+
+        if threshold is None:
+            threshold = self.__conf.threshold(path)
+
+            if threshold is None:
+                threshold = self.__EXCLUDED
+
+            self.__thresholds[path] = threshold
+
+        return threshold
+
+
+    @classmethod
+    def __leaves(cls, node, path):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if not path and key == LogTime.REC_PATH:
+                    continue
+
+                yield from cls.__leaves(value, path + (key, ))
+
+        elif isinstance(node, list):
+            for i, value in enumerate(node):
+                yield from cls.__leaves(value, path + (i, ))
+
+        else:
+            yield path, node
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def conf(self):
+        return self.__conf
+
+
+    @property
+    def passed(self):
+        return self.__passed
+
+
+    @property
+    def suppressed(self):
+        return self.__suppressed
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "DeadbandFilter:{conf:%s, passed:%s, suppressed:%s}" % (self.conf, self.passed, self.suppressed)
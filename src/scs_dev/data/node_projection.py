@@ -0,0 +1,201 @@
+"""
+Created on 9 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A projection of a JSON document onto a set of node paths, compiled once and applied to each document in a stream.
+
+Paths follow the PathDict convention: nodes are separated by a period ('.') and array indices by a colon (':'). A node
+of '*' matches every member of an object, or every element of an array. The projected document holds the selected
+nodes - leaf or internal - at their original paths, in the order in which the paths are given. Where an array is
+projected, the selected elements are kept in their original order.
+
+A document is matched if every path selects at least one node. The document is traversed only along the requested
+paths: no PathDict is built, and no other subtree is visited.
+
+example:
+paths: rec val.*.cnc
+input: {"rec": "2018-04-04T14:50:27.641+00:00", "val": {"CO": {"weV": 0.321, "cnc": 301.2}, "NO2": {"cnc": 18.3}}}
+output: {"rec": "2018-04-04T14:50:27.641+00:00", "val": {"CO": {"cnc": 301.2}, "NO2": {"cnc": 18.3}}}
+"""
+
+import re
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class NodeProjection(object):
+    """
+    classdocs
+    """
+
+    WILDCARD =      '*'
+
+    __SEPARATORS =  re.compile(r"[.:]")
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct(cls, paths):
+        steps = [tuple(cls.__step(node) for node in cls.__SEPARATORS.split(path)) for path in paths]
+
+        return cls(paths, steps)
+
+
+    @classmethod
+    def __step(cls, node):
+        if node == cls.WILDCARD:
+            return None
+
+        try:
+            return node, int(node)
+
+        except ValueError:
+            return node, None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, paths, steps):
+        """
+        Constructor
+        """
+        self.__paths = list(paths)                      # list of string
+        self.__steps = steps                            # list of tuple of (string, int) or None for wildcard
+
+        self.__missing = None                           # string            path not found in the last document
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def project(self, document):
+        projected = OrderedDict()
+        self.__missing = None
+
+        for path, steps in zip(self.__paths, self.__steps):
+            if not self.__select(document, steps, 0, projected):
+                self.__missing = path
+                return None
+
+        return self.__finalise(projected)
+
+
+    def node(self, document):
+        value = document
+        self.__missing = None
+
+        for step in self.__steps[0]:
+            if step is None:
+                raise ValueError("node: a wildcard path cannot select a single node")
+
+            try:
+                value = value[step[1]] if isinstance(value, list) else value[step[0]]
+
+            except (KeyError, IndexError, TypeError):
+                self.__missing = self.__paths[0]
+                return None
+
+        return value
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __select(self, container, steps, i, target):
+        step = steps[i]
+        is_list = isinstance(container, list)
+
+        # members...
+        if step is None:
+            if is_list:
+                keys = range(len(container))
+            elif isinstance(container, dict):
+                keys = container.keys()
+            else:
+                return False
+
+        elif is_list:
+            if step[1] is None or not -len(container) <= step[1] < len(container):
+                return False
+
+            keys = (step[1] % len(container), )
+
+        elif isinstance(container, dict):
+            if step[0] not in container:
+                return False
+
+            keys = (step[0], )
+
+        else:
+            return False
+
+        # selection...
+        leaf = i == len(steps) - 1
+        selected = False
+
+        for key in keys:
+            value = container[key]
+
+            if leaf:
+                target[key] = value
+                selected = True
+                continue
+
+            sub_target = target.get(key)
+
+            if not isinstance(sub_target, dict):
+                sub_target = _ArraySelection() if isinstance(value, list) else OrderedDict()
+
+            if self.__select(value, steps, i + 1, sub_target):
+                target[key] = sub_target
+                selected = True
+
+        return selected
+
+
+    @classmethod
+    def __finalise(cls, node):
+        if not isinstance(node, dict):
+            return node
+
+        if isinstance(node, _ArraySelection):
+            return [cls.__finalise(node[key]) for key in sorted(node.keys())]
+
+        for key in node:
+            node[key] = cls.__finalise(node[key])
+
+        return node
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def is_single(self):
+        return len(self.__steps) == 1 and None not in self.__steps[0]
+
+
+    @property
+    def missing(self):
+        return self.__missing
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "NodeProjection:{paths:%s, single:%s}" % (self.paths, self.is_single)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _ArraySelection(OrderedDict):
+    """
+    the elements selected from an array, by index, to be returned as an array
+    """
+    pass
@@ -0,0 +1,178 @@
+"""
+Created on 10 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A textual equivalent of the scs_core Publication, for the passthrough mode of the topic publishers: each input line is
+wrapped in the topic envelope as it stands, without being parsed and serialised again.
+
+Lines are validated as JSON at a sampling rate - one line in every validation_period - and invalid lines that are
+sampled are rejected. Between samples, a line is only checked to be a non-empty JSON object, so a malformed line may be
+published: the sampling rate is a trade between CPU cost and the certainty that the input stream is well-formed.
+
+For the OpenSensors.io timestamp override, the rec field is found with a targeted scan of the line, and a __timestamp
+field is inserted at the start of the document. A line is only parsed if the scan fails.
+
+example:
+topic: south-coast-science-dev/production-test/loc/1/gases
+line: {"tag": "scs-be2-2", "rec": "2018-04-04T13:05:52.675+00:00", "val": {"sht": {"hmd": 57.0, "tmp": 21.3}}}
+envelope: {"south-coast-science-dev/production-test/loc/1/gases": {"tag": "scs-be2-2", ...}}
+"""
+
+import json
+import re
+
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationEnvelope(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_VALIDATION_PERIOD =     100             # lines
+
+    __REC = re.compile(r'"rec"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, topic, override=False, validation_period=None):
+        """
+        Constructor
+        """
+        self.__prefix = '{' + json.dumps(topic, ensure_ascii=False) + ': '
+
+        self.__topic = topic                            # string
+        self.__override = override                      # bool
+        self.__validation_period = self.DEFAULT_VALIDATION_PERIOD if validation_period is None \
+            else validation_period                      # int               0 for no validation
+
+        self.__count = 0                                # int
+        self.__validated = 0                            # int
+        self.__rejected = 0                             # int
+        self.__parsed = 0                               # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def wrap(self, line):
+        payload = self.payload(line)
+
+        if payload is None:
+            return None
+
+        return self.__prefix + payload + '}'
+
+
+    def payload(self, line):
+        """
+        return the payload as it is to be published, without the topic envelope, or None if the line is rejected
+        """
+        payload = line.strip()
+
+        if len(payload) < 2 or payload[0] != '{' or payload[-1] != '}':
+            self.__rejected += 1
+            return None
+
+        self.__count += 1
+
+        # validation...
+        jdict = None
+
+        if self.__validation_period and self.__count % self.__validation_period == 1 % self.__validation_period:
+            self.__validated += 1
+
+            try:
+                jdict = json.loads(payload, object_pairs_hook=OrderedDict)
+
+            except ValueError:
+                self.__rejected += 1
+                return None
+
+        # override...
+        if self.__override:
+            rec = self.__rec(payload, jdict)
+
+            if rec is None:
+                self.__rejected += 1
+                return None
+
+            payload = '{"__timestamp": ' + rec + ', ' + payload[1:]
+
+        return payload
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __rec(self, payload, jdict):
+        if jdict is not None:
+            rec = jdict.get('rec')                      # the line has been parsed for validation
+
+            return None if rec is None else json.dumps(rec, ensure_ascii=False)
+
+        match = self.__REC.search(payload)
+
+        if match is not None and payload.find('{', 1, match.start()) == -1:
+            return match.group(1)                       # top-level rec
+
+        # fallback...
+        self.__parsed += 1
+
+        try:
+            jdict = json.loads(payload)
+
+        except ValueError:
+            return None
+
+        rec = jdict.get('rec')
+
+        return None if rec is None else json.dumps(rec, ensure_ascii=False)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topic(self):
+        return self.__topic
+
+
+    @property
+    def override(self):
+        return self.__override
+
+
+    @property
+    def validation_period(self):
+        return self.__validation_period
+
+
+    @property
+    def count(self):
+        return self.__count
+
+
+    @property
+    def validated(self):
+        return self.__validated
+
+
+    @property
+    def rejected(self):
+        return self.__rejected
+
+
+    @property
+    def parsed(self):
+        return self.__parsed
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationEnvelope:{topic:%s, override:%s, validation_period:%s, count:%s, validated:%s, " \
+               "rejected:%s, parsed:%s}" % \
+               (self.topic, self.override, self.validation_period, self.count, self.validated,
+                self.rejected, self.parsed)
@@ -0,0 +1,386 @@
+"""
+Created on 15 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Windowed statistics for a stream of sample documents, as an aggregation stage between a sampler and a topic publisher.
+
+Each numeric leaf of the sample - such as val.CO.cnc, val.sht.tmp or an element of val.bin - is replaced in the window
+document by its mean, min, max, stdev and count over the window. Other leaves, such as the tag, take their latest
+value in the window. The rec of the window document is the end of the window.
+
+Windows are aligned to multiples of the step, in epoch time, and are timed by the rec field of the samples - not the
+time of their arrival - so that a window holds the same samples, whenever they are read. A window covers the period
+from its end, minus the window length, up to but not including its end. With tumbling windows, the step is the window
+length. With sliding windows, the step is shorter, and a window document is emitted for each step.
+
+A window is emitted when the first sample after its end is received, or when the aggregator is flushed. Empty windows
+are not emitted. A sample that falls before the current step - because it is out of order - is rejected, as are
+samples without a valid rec.
+
+Statistics are updated incrementally, in constant time for each leaf of each sample: the mean and variance by
+Welford's method, and - for sliding windows - the min and max by monotonic queues, so that no window is ever rescanned.
+The stdev is the sample standard deviation, and is null for a count of one. The mean and stdev are rounded to one
+decimal place more than the values of the leaf.
+
+example:
+window: 60 seconds, tumbling
+input: {"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:05.000+00:00", "val": {"hmd": 59.6, "tmp": 23.8}}
+input: {"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:35.000+00:00", "val": {"hmd": 59.8, "tmp": 23.9}}
+output: {"tag": "scs-ap1-6", "rec": "2018-04-04T14:51:00.000+00:00",
+        "val": {"hmd": {"mean": 59.7, "min": 59.6, "max": 59.8, "stdev": 0.14, "count": 2},
+                "tmp": {"mean": 23.85, "min": 23.8, "max": 23.9, "stdev": 0.07, "count": 2}}}
+"""
+
+import math
+
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class WindowAggregator(object):
+    """
+    classdocs
+    """
+
+    REC =       "rec"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, length, step=None):
+        """
+        Constructor
+        """
+        self.__length = length                          # float         seconds
+        self.__step = length if step is None else step  # float         seconds
+
+        self.__nodes = OrderedDict()                    # dict of path: _Statistic, _Label or None (the rec)
+        self.__end = None                               # float         epoch seconds
+        self.__tzinfo = None                            # tzinfo        of the latest sample
+
+        self.__windows = 0                              # int
+        self.__rejected = 0                             # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def append(self, sample):
+        """
+        add a sample document, and return the window documents that it closes
+        """
+        try:
+            localized = LocalizedDatetime.construct_from_iso8601(str(sample[self.REC]))
+            timestamp = localized.timestamp()
+
+        except (AttributeError, KeyError, TypeError, ValueError):
+            self.__rejected += 1
+            return []
+
+        documents = self.__advance(timestamp)
+
+        if timestamp < self.__end - self.__step:
+            self.__rejected += 1                        # the window for this sample has closed
+            return documents
+
+        self.__tzinfo = localized.datetime.tzinfo
+
+        for path, value in self.__leaves(sample, ()):
+            node = self.__nodes.get(path)
+
+            if path == (self.REC, ):
+                self.__nodes[path] = None
+                continue
+
+            if type(value) in (int, float) and math.isfinite(value):
+                if type(node) is not _Statistic:
+                    node = _Statistic(self.is_sliding)
+                    self.__nodes[path] = node
+
+                node.append(timestamp, value)
+
+            elif type(node) is not _Statistic:
+                self.__nodes[path] = _Label(value)
+
+        return documents
+
+
+    def flush(self):
+        """
+        return the document for the current window, if it has any samples, and reset the aggregator
+        """
+        documents = [] if self.__end is None else self.__close()
+
+        self.__nodes = OrderedDict()
+        self.__end = None
+
+        return documents
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __advance(self, timestamp):
+        if self.__end is None:
+            self.__end = self.__boundary(timestamp)
+
+        documents = []
+
+        while timestamp >= self.__end:
+            documents.extend(self.__close())
+            self.__end += self.__step
+
+            if not self.__nodes:
+                self.__end = self.__boundary(timestamp)  # skip the empty windows of a gap
+
+        return documents
+
+
+    def __boundary(self, timestamp):
+        return (math.floor(timestamp / self.__step) + 1) * self.__step
+
+
+    def __close(self):
+        # expire...
+        if self.is_sliding:
+            start = self.__end - self.__length
+
+            for node in self.__nodes.values():
+                if type(node) is _Statistic:
+                    node.expire(start)
+
+        # report...
+        documents = []
+
+        if any(type(node) is _Statistic and node.count > 0 for node in self.__nodes.values()):
+            documents.append(self.__document())
+            self.__windows += 1
+
+        # reset...
+        if self.is_sliding and documents:
+            self.__nodes = OrderedDict((path, node) for path, node in self.__nodes.items()
+                                       if type(node) is not _Statistic or node.count > 0)
+        else:
+            self.__nodes = OrderedDict()
+
+        return documents
+
+
+    def __document(self):
+        root = OrderedDict()
+
+        for path, node in self.__nodes.items():
+            if node is None:
+                value = self.__rec()
+
+            elif type(node) is _Statistic:
+                if node.count == 0:
+                    continue
+
+                value = node.as_json()
+
+            else:
+                value = node.value
+
+            parent = root
+
+            for key in path[:-1]:
+                parent = parent.setdefault(key, OrderedDict())
+
+            parent[path[-1]] = value
+
+        return self.__arrays(root)
+
+
+    def __rec(self):
+        localized = LocalizedDatetime(datetime.fromtimestamp(self.__end, self.__tzinfo))
+
+        return localized.as_iso8601()
+
+
+    @classmethod
+    def __leaves(cls, node, path):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                yield from cls.__leaves(value, path + (key, ))
+
+        elif isinstance(node, list):
+            for i, value in enumerate(node):
+                yield from cls.__leaves(value, path + (i, ))
+
+        else:
+            yield path, node
+
+
+    @classmethod
+    def __arrays(cls, node):
+        if not isinstance(node, OrderedDict):
+            return node
+
+        if node and all(type(key) is int for key in node):
+            return [cls.__arrays(node[key]) for key in sorted(node)]
+
+        return OrderedDict((key, cls.__arrays(value)) for key, value in node.items())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def length(self):
+        return self.__length
+
+
+    @property
+    def step(self):
+        return self.__step
+
+
+    @property
+    def is_sliding(self):
+        return self.__step < self.__length
+
+
+    @property
+    def windows(self):
+        return self.__windows
+
+
+    @property
+    def rejected(self):
+        return self.__rejected
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "WindowAggregator:{length:%s, step:%s, windows:%s, rejected:%s}" % \
+               (self.length, self.step, self.windows, self.rejected)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _Statistic(object):
+    """
+    the running statistics for one numeric leaf
+    """
+
+    __slots__ = ('count', '__mean', '__m2', '__min', '__max', '__digits', '__values', '__mins', '__maxs')
+
+    def __init__(self, sliding):
+        self.count = 0                                  # int
+        self.__mean = 0.0                               # float
+        self.__m2 = 0.0                                 # float         sum of squared deviations
+        self.__min = None                               # number        tumbling only
+        self.__max = None                               # number        tumbling only
+        self.__digits = 0                               # int or None   decimal places of the values
+
+        self.__values = deque() if sliding else None    # deque of (timestamp, value)
+        self.__mins = deque() if sliding else None      # deque of (timestamp, value), ascending values
+        self.__maxs = deque() if sliding else None      # deque of (timestamp, value), descending values
+
+
+    def append(self, timestamp, value):
+        # mean and variance...
+        self.count += 1
+
+        delta = value - self.__mean
+        self.__mean += delta / self.count
+        self.__m2 += delta * (value - self.__mean)
+
+        self.__widen(value)
+
+        # min and max...
+        if self.__values is None:
+            if self.__min is None or value < self.__min:
+                self.__min = value
+
+            if self.__max is None or value > self.__max:
+                self.__max = value
+
+            return
+
+        self.__values.append((timestamp, value))
+
+        while self.__mins and self.__mins[-1][1] >= value:
+            self.__mins.pop()
+
+        self.__mins.append((timestamp, value))
+
+        while self.__maxs and self.__maxs[-1][1] <= value:
+            self.__maxs.pop()
+
+        self.__maxs.append((timestamp, value))
+
+
+    def expire(self, start):
+        while self.__values and self.__values[0][0] < start:
+            _, value = self.__values.popleft()
+            self.count -= 1
+
+            if self.count == 0:
+                self.__mean = 0.0
+                self.__m2 = 0.0
+                continue
+
+            delta = value - self.__mean
+            self.__mean -= delta / self.count
+            self.__m2 = max(self.__m2 - delta * (value - self.__mean), 0.0)
+
+        while self.__mins and self.__mins[0][0] < start:
+            self.__mins.popleft()
+
+        while self.__maxs and self.__maxs[0][0] < start:
+            self.__maxs.popleft()
+
+
+    def as_json(self):
+        if self.__values is None:
+            minimum, maximum = self.__min, self.__max
+        else:
+            minimum, maximum = self.__mins[0][1], self.__maxs[0][1]
+
+        stdev = math.sqrt(self.__m2 / (self.count - 1)) if self.count > 1 else None
+
+        jdict = OrderedDict()
+
+        jdict['mean'] = self.__round(self.__mean)
+        jdict['min'] = minimum
+        jdict['max'] = maximum
+        jdict['stdev'] = None if stdev is None else self.__round(stdev)
+        jdict['count'] = self.count
+
+        return jdict
+
+
+    def __widen(self, value):
+        if self.__digits is None or type(value) is int:
+            return
+
+        text = repr(value)
+        point = text.find('.')
+
+        if point < 0 or 'e' in text:
+            self.__digits = None                        # no rounding
+            return
+
+        self.__digits = max(self.__digits, len(text) - point - 1)
+
+
+    def __round(self, value):
+        return value if self.__digits is None else round(value, self.__digits + 1)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _Label(object):
+    """
+    the latest value of one non-numeric leaf
+    """
+
+    __slots__ = ('value', )
+
+    def __init__(self, value):
+        self.value = value                              # string, bool or None
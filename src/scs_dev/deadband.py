@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+Created on 16 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The deadband utility is used to publish by exception: documents are presented on stdin, and only those that report a
+significant change are passed to stdout, so that stable readings are not published at every sampling interval. The
+utility is placed between a sampler and a topic publisher. Documents are passed unchanged.
+
+A document is passed if any of its fields has changed by more than its threshold since the last document that was
+passed. A threshold may be absolute, relative to the last value passed, or both - in which case a change must exceed
+both. With no threshold, any change is significant. The first document is always passed, as is any document whose set
+of fields has changed. If a heartbeat interval is set, a document is passed at least once per interval, as measured by
+the rec field of the documents.
+
+Thresholds and the heartbeat interval may be set for each field of each topic in a configuration file - the TOPIC
+names the entry in the file that applies. Fields may also be excluded from the comparison - an excluded field may
+appear or disappear without a document being passed. Command-line settings apply where the configuration file does not
+give a value.
+
+SYNOPSIS
+deadband.py [-c CONF_FILE] [-a ABS] [-r REL] [-b HEARTBEAT] [-v] TOPIC
+
+EXAMPLES
+./climate_sampler.py -i10 | ./deadband.py -c ~/SCS/conf/deadband_conf.json climate | ./aws_topic_publisher.py -cC -p
+
+./status_sampler.py -i60 | ./deadband.py -a 1.0 -b 3600 status
+
+FILES
+~/SCS/conf/deadband_conf.json
+
+DOCUMENT EXAMPLE - CONF_FILE
+{"climate": {"heartbeat": 600, "default": {"abs": 0.1},
+"fields": {"val.hmd": {"abs": 0.5}, "val.tmp": {"abs": 0.2, "rel": 0.01}}},
+"status": {"heartbeat": 3600, "fields": {"val.up": null, "val.tmp": {"abs": 1.0}}}}
+
+SEE ALSO
+scs_dev/aggregator
+scs_dev/aws_topic_publisher
+scs_dev/osio_topic_publisher
+"""
+
+import json
+import sys
+
+from collections import OrderedDict
+
+from scs_dev.cmd.cmd_deadband import CmdDeadband
+from scs_dev.data.deadband_conf import DeadbandConf, DeadbandThreshold
+from scs_dev.data.deadband_filter import DeadbandFilter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    deadband = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdDeadband()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print("deadband: %s" % cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        # DeadbandConf...
+        conf = None
+
+        if cmd.conf:
+            try:
+                conf = DeadbandConf.load_from_file(cmd.conf, cmd.topic)
+
+            except (OSError, ValueError) as ex:
+                print("deadband: conf not available: %s" % ex, file=sys.stderr)
+                exit(1)
+
+        if conf is None:
+            conf = DeadbandConf(None, None, OrderedDict())
+
+        heartbeat = cmd.heartbeat if conf.heartbeat is None else conf.heartbeat
+        default = DeadbandThreshold(cmd.absolute, cmd.relative) if conf.default is None else conf.default
+
+        conf = DeadbandConf(heartbeat, default, conf.fields)
+
+        # DeadbandFilter...
+        deadband = DeadbandFilter(conf)
+
+        if cmd.verbose:
+            print("deadband: %s" % deadband, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for line in sys.stdin:
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError:
+                continue
+
+            if not isinstance(jdict, dict) or not deadband.accept(jdict):
+                continue
+
+            print(line.strip())
+            sys.stdout.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("deadband: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if cmd.verbose and deadband:
+            print("deadband: %s" % deadband, file=sys.stderr)
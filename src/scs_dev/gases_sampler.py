@@ -29,6 +29,10 @@ The presence of the DFE subsystem, and the availability of the Pt1000 sensor on
 scs_mfr/dfe_conf utility. The configuration of Sensirion SHT sensor(s) is specified using the scs_mfr/dfe_conf
 utility.
 
+Readings of the SHT are shared with any other sampler that reads the same sensor - such as the climate_sampler, where
+only one SHT is fitted. A reading taken by another sampler is reused if it is less than one second old, so that
+samplers on the same schedule read the sensor once between them.
+
 Gas concentrations for each sensor are adjusted according to a baseline value, which is specified using the
 scs_mfr/afe_baseline utility. This provides a simple way of managing zero-offset drift for each sensor
 expressed in parts per billion.
@@ -43,11 +47,17 @@ fields for:
 Command-line options allow for single-shot reading, multiple readings with specified time intervals, or readings
 controlled by an independent scheduling process via a Unix semaphore.
 
+If the --concurrent flag is set, the NDIR sensor is read concurrently with the SHT and AFE, so that the time taken to
+acquire the sample - and hence the skew between the recording time and the time of measurement - is bounded by the
+slower of the two, rather than their sum. If the --diagnostics flag is set, the read time for each device, and the
+elapsed time for the whole acquisition, are reported in seconds in a "dgn" field.
+
 SYNOPSIS
-gases_sampler.py [{ -s SEMAPHORE | -i INTERVAL [-n SAMPLES] }] [-v]
+gases_sampler.py [{ -s SEMAPHORE | -i INTERVAL [-n SAMPLES] }] [-c] [-d] [-v]
 
 EXAMPLES
 ./gases_sampler.py -i10
+./gases_sampler.py -i5 -c -d
 
 FILES
 ~/SCS/conf/afe_baseline.json
@@ -67,6 +77,12 @@ DOCUMENT EXAMPLE - OUTPUT
 "VOC": {"weV": 0.102127, "weC": 0.101793, "cnc": 1294.8},
 "sht": {"hmd": 54.4, "tmp": 21.6}}}
 
+DOCUMENT EXAMPLE - OUTPUT WITH DIAGNOSTICS
+{"tag": "scs-ap1-6", "rec": "2018-07-30T10:12:31.407+00:00",
+"val": {"CO2": {"cnc": 512.0}, "CO": {"weV": 0.34863, "aeV": 0.268817, "weC": 0.064464, "cnc": 237.0},
+"sht": {"hmd": 54.4, "tmp": 21.6}},
+"dgn": {"ndir": 0.212, "sht": 0.021, "afe": 0.314, "elapsed": 0.336}}
+
 SEE ALSO
 scs_dev/scheduler
 scs_mfr/afe_baseline
@@ -85,15 +101,16 @@ https://en.wikipedia.org/wiki/ISO_8601
 
 import sys
 
-from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sync.timed_runner import TimedRunner
 
 from scs_core.sys.system_id import SystemID
 
-from scs_dev.cmd.cmd_sampler import CmdSampler
+from scs_dev.cmd.cmd_gases_sampler import CmdGasesSampler
 from scs_dev.sampler.gases_sampler import GasesSampler
+from scs_dev.sampler.sample_encoder import SampleEncoder
+from scs_dev.sampler.sht_cache import SHTCache
 
 from scs_dfe.board.dfe_conf import DFEConf
 from scs_dfe.climate.sht_conf import SHTConf
@@ -121,7 +138,7 @@ if __name__ == '__main__':
     # ----------------------------------------------------------------------------------------------------------------
     # cmd...
 
-    cmd = CmdSampler()
+    cmd = CmdGasesSampler()
 
     if cmd.verbose:
         print("gases_sampler: %s" % cmd, file=sys.stderr)
@@ -150,7 +167,7 @@ if __name__ == '__main__':
 
         # SHT...
         sht_conf = SHTConf.load(Host)
-        sht = None if sht_conf is None else sht_conf.int_sht()
+        sht = None if sht_conf is None else SHTCache(sht_conf.int_sht(), sht_conf.int_addr)
 
         if cmd.verbose and sht_conf:
             print("gases_sampler: %s" % sht_conf, file=sys.stderr)
@@ -169,12 +186,15 @@ if __name__ == '__main__':
         runner = TimedRunner(cmd.interval, cmd.samples) if cmd.semaphore is None \
             else ScheduleRunner(cmd.semaphore, False)
 
-        sampler = GasesSampler(runner, tag, ndir_monitor, sht, afe)
+        sampler = GasesSampler(runner, tag, ndir_monitor, sht, afe, cmd.concurrent, cmd.diagnostics)
 
         if cmd.verbose:
             print("gases_sampler: %s" % sampler, file=sys.stderr)
             sys.stderr.flush()
 
+        # encoder...
+        encoder = SampleEncoder()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
@@ -191,7 +211,7 @@ if __name__ == '__main__':
                 print("%s:        gases: %s" % (now.as_time(), sample.rec.as_time()), file=sys.stderr)
                 sys.stderr.flush()
 
-            print(JSONify.dumps(sample))
+            print(encoder.encode(sample))
             sys.stdout.flush()
 
 
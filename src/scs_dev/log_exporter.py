@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The log_exporter utility converts a columnar log - as written by the csv_logger utility in columnar mode - to CSV
+format, or to JSON documents. The CSV output is the same as the csv_logger would have written in CSV mode: a header
+row of paths, followed by one row per document.
+
+If a start and / or end datetime is given, only those rows recorded at or after the start, and before the end, are
+exported. Each block of the log is indexed by the range of its rec datetimes, so blocks outside the range are skipped
+without being read.
+
+SYNOPSIS
+log_exporter.py [-j] [-s START] [-e END] [-v] FILENAME
+
+EXAMPLES
+./log_exporter.py -s 2018-08-03T10:00:00Z -e 2018-08-03T14:00:00Z scs-ap1-6-gases-2018-08-03-00-00-05.scl
+
+DOCUMENT EXAMPLE - OUTPUT (CSV)
+tag,rec,val.hmd,val.tmp
+scs-ap1-6,2018-04-04T14:50:38.394+00:00,59.7,23.8
+
+DOCUMENT EXAMPLE - OUTPUT (JSON)
+{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:38.394+00:00", "val": {"hmd": 59.7, "tmp": 23.8}}
+
+SEE ALSO
+scs_dev/csv_logger
+scs_dev/csv_reader
+"""
+
+import csv
+import sys
+
+from scs_dev.cmd.cmd_log_exporter import CmdLogExporter
+from scs_dev.logger.columnar_log_reader import ColumnarLogReader
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    cmd = None
+    reader = None
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # cmd...
+
+        cmd = CmdLogExporter()
+
+        if not cmd.is_valid():
+            cmd.print_help(sys.stderr)
+            exit(2)
+
+        if cmd.verbose:
+            print("log_exporter: %s" % cmd, file=sys.stderr)
+
+        start = None if cmd.start is None else LogTime.timestamp(cmd.start)
+        end = None if cmd.end is None else LogTime.timestamp(cmd.end)
+
+        if (cmd.start is not None and start is None) or (cmd.end is not None and end is None):
+            print("log_exporter: invalid datetime.", file=sys.stderr)
+            exit(2)
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        if not ColumnarLogWriter.is_columnar(cmd.filename):
+            print("log_exporter: not a columnar log: %s" % cmd.filename, file=sys.stderr)
+            exit(1)
+
+        reader = ColumnarLogReader(cmd.filename)
+
+        if cmd.verbose:
+            print("log_exporter: %s" % reader, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        if cmd.json:
+            for jstr in reader.documents(start, end):
+                print(jstr)
+
+        else:
+            writer = csv.writer(sys.stdout, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(reader.paths)
+
+            for row in reader.rows(start, end):
+                writer.writerow(row)
+
+        sys.stdout.flush()
+
+        if cmd.verbose:
+            print("log_exporter: rows: %d" % reader.read_count, file=sys.stderr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd and cmd.verbose:
+            print("log_exporter: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if reader is not None:
+            reader.close()
@@ -0,0 +1,398 @@
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A logger for the csv_logger utility, following the operation of the scs_core CSVLogger: the schema is fixed from the
+first document, a new log file is started each day, and - if required - the oldest log files are deleted to make
+space. The format of the log files is given by the writer class: CSVLogWriter or ColumnarLogWriter.
+
+In deferred mode, documents are held until the owner calls flush(), and space management is left to the owner. This
+allows several loggers to share one flusher and one retention pass.
+
+If the storage medium fails, the logger is suspended, rather than inhibited: documents are held in a bounded in-memory
+ring - the oldest are dropped if it fills - and the log volume is probed with backoff. When the volume is writable
+again, a new log file is opened and the held documents are written to it. Documents are only released from the ring
+once the writer reports them written - a ColumnarLogWriter holds rows in memory until it completes a block - so a
+fault during a write may cause some rows to be repeated, but not lost. Logging is only inhibited - permanently - if
+the volume is full and deletion of old logs is not permitted.
+
+In evolving mode, the schema is not fixed from the first document: a prefix of documents is held back, and the log is
+started with the union of their paths. If a field appears after that, a new log file is started with the extended
+schema, together with a SegmentLink to the previous file.
+"""
+
+import os
+import sys
+import time
+
+from collections import deque
+from datetime import timedelta
+
+from scs_core.csv.csv_dict import CSVDict
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+from scs_dev.logger.csv_log_writer import CSVLogWriter
+from scs_dev.logger.evolving_schema import EvolvingSchema
+from scs_dev.logger.log_retention import LogRetention
+from scs_dev.logger.segment_link import SegmentLink
+from scs_dev.logger.storage_probe import StorageProbe
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ArchiveLogger(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_CAPACITY =      10000                       # rows held while storage is unavailable
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, log, delete_oldest, write_interval, writer_class=CSVLogWriter, deferred=False,
+                 capacity=None, evolving=False):
+        """
+        Constructor
+        """
+        self.__log = log                                # CSVLog
+        self.__delete_oldest = delete_oldest            # bool
+        self.__write_interval = write_interval          # int
+        self.__writer_class = writer_class              # class
+        self.__deferred = deferred                      # bool
+
+        self.__retention = LogRetention(host, log.root_path, delete_oldest)
+        self.__probe = StorageProbe(host, log.root_path)
+
+        self.__paths = None                             # list of string
+        self.__writer = None                            # CSVLogWriter or ColumnarLogWriter
+        self.__latest_path = None                       # string
+
+        self.__schema = EvolvingSchema() if evolving else None
+        self.__prefix = [] if evolving else None        # list of CSVDict, or None once the schema is settled
+        self.__link = None                              # SegmentLink
+        self.__latest_write = None                      # timestamp
+        self.__writing_inhibited = False                # bool
+        self.__suspended = False                        # bool
+
+        capacity = self.DEFAULT_CAPACITY if capacity is None else capacity
+
+        self.__buffer = deque(maxlen=capacity)          # deque of CSVDict
+        self.__handed = 0                               # int           leading rows of the buffer given to the writer
+        self.__dropped = 0                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, jstr):
+        if self.writing_inhibited:
+            return None
+
+        if jstr is None or self.log is None:
+            return None
+
+        datum = CSVDict.construct_from_jstr(jstr)
+
+        if datum is None:
+            return None
+
+        if len(self.__buffer) == self.__buffer.maxlen:
+            self.__dropped += 1
+
+            if self.__handed > 0:
+                self.__handed -= 1
+
+        self.__buffer.append(datum)
+
+        # deferred write...
+        if self.__deferred:
+            return self.file_path()
+
+        # interval write...
+        if self.write_interval:
+            now = time.time()
+
+            if self.__latest_write is None:
+                self.__latest_write = now
+
+            if now - self.__latest_write < self.write_interval:
+                return self.file_path()
+
+            self.__latest_write = now
+
+        self.flush()
+
+        return self.file_path()
+
+
+    def flush(self, force=False):
+        if self.__suspended and not self.__resume():
+            return False
+
+        try:
+            for i in range(self.__handed, len(self.__buffer)):
+                self.__write(self.__buffer[i])
+
+            self.__handed = len(self.__buffer)
+
+            if self.__writer:
+                self.__writer.flush(force=force)
+
+        except OSError as ex:
+            self.__suspend(ex)
+            return False
+
+        # release the rows that have reached the log...
+        unwritten = (0 if self.__writer is None else self.__writer.pending) + len(self.__prefix or [])
+        written = max(0, self.__handed - unwritten)
+
+        for _ in range(written):
+            self.__buffer.popleft()
+
+        self.__handed -= written
+
+        return True
+
+
+    def sync(self):
+        if not self.flush(force=True) or self.__writer is None:
+            return
+
+        try:
+            self.__writer.sync()
+
+        except OSError as ex:
+            self.__suspend(ex)
+
+
+    def close(self):
+        self.flush()
+
+        # settle the schema on a short run...
+        if self.__prefix and not self.__suspended and not self.writing_inhibited:
+            try:
+                self.__release_prefix()
+
+            except OSError as ex:
+                self.__suspend(ex)
+
+        if not self.__suspended:
+            self.flush(force=True)
+
+        if not self.__suspended:
+            try:
+                self.__close_writer()
+
+            except OSError as ex:
+                self.__suspend(ex)
+
+        held = len(self.__buffer)
+
+        if held:
+            print("ArchiveLogger: %s: %d rows not written" % (self.log.topic_subject, held), file=sys.stderr)
+
+
+    def file_path(self):
+        if self.log.timeline_start is None:
+            return None
+
+        return os.path.splitext(self.log.file_path())[0] + '.' + self.__writer_class.SUFFIX
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __suspend(self, ex):
+        print("ArchiveLogger: %s: suspended: %s" % (self.log.topic_subject, ex), file=sys.stderr)
+        sys.stderr.flush()
+
+        try:
+            self.__close_writer()
+
+        except OSError:
+            pass
+
+        # every held row is written again on resume...
+        self.__handed = 0
+
+        if self.__prefix is not None:
+            self.__prefix = []
+
+        self.__suspended = True
+        self.__probe.fail()
+
+
+    def __resume(self):
+        if not self.__probe.is_due():
+            return False
+
+        if not self.__probe.probe():
+            self.__probe.fail()
+            return False
+
+        print("ArchiveLogger: %s: resumed: %d rows held" % (self.log.topic_subject, len(self.__buffer)),
+              file=sys.stderr)
+        sys.stderr.flush()
+
+        self.__suspended = False
+        self.__probe.reset()
+
+        return True
+
+
+    def __close_writer(self):
+        if self.__writer is None:
+            return
+
+        writer = self.__writer
+        self.__writer = None
+
+        writer.close()
+
+
+    def __write(self, datum):
+        if self.writing_inhibited:
+            return
+
+        # evolving schema...
+        if self.__schema is not None:
+            added = self.__schema.update(datum.paths())
+
+            if self.__prefix is not None:
+                self.__prefix.append(datum)
+
+                if len(self.__prefix) >= self.__schema.prefix_rows:
+                    self.__release_prefix()
+
+                return
+
+            if added:
+                self.__extend(added)
+
+        self.__write_row(datum)
+
+
+    def __release_prefix(self):
+        if self.log.tag is None:
+            self.log.tag = self.__prefix[0].row(['tag'])[0]
+
+        self.__paths = self.__schema.paths
+
+        for datum in self.__prefix:
+            self.__write_row(datum)
+
+        self.__prefix = None
+
+
+    def __extend(self, added):
+        if self.__link is None:
+            self.__link = SegmentLink(self.__latest_path, added)
+        else:
+            self.__link = SegmentLink(self.__link.previous, self.__link.added + added)
+
+        self.__paths = self.__schema.paths
+        self.__close_writer()
+
+
+    def __write_row(self, datum):
+        # first run...
+        if self.__paths is None:
+            if self.log.tag is None:
+                self.log.tag = datum.row(['tag'])[0]
+
+            self.__paths = datum.paths()
+
+        # start log for new day...
+        if self.__writer is None or not self.log.in_timeline(LocalizedDatetime.now().utc()):
+            self.__open()
+
+            if self.__writer is None:
+                return
+
+        # write row...
+        self.__writer.write(datum.row(self.__paths))
+
+
+    def __open(self):
+        self.__close_writer()
+
+        self.log.timeline_start = LocalizedDatetime.now().utc()
+
+        # never overwrite a log - it may have been started within the same second, before a storage fault...
+        while os.path.exists(self.file_path()):
+            self.log.timeline_start = LocalizedDatetime(self.log.timeline_start + timedelta(seconds=1))
+
+        if not self.__deferred and not self.__retention.clear_space():
+            self.writing_inhibited = True
+            return
+
+        self.log.mkdir()
+
+        self.__writer = self.__writer_class(self.file_path(), self.__paths)
+        self.__latest_path = self.__writer.filename
+
+        if self.__link is not None:
+            self.__link.save(self.__latest_path)
+            self.__link = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def log(self):
+        return self.__log
+
+
+    @property
+    def delete_oldest(self):
+        return self.__delete_oldest
+
+
+    @property
+    def write_interval(self):
+        return self.__write_interval
+
+
+    @property
+    def active_path(self):
+        return None if self.__writer is None else self.__writer.filename
+
+
+    @property
+    def evolving(self):
+        return self.__schema is not None
+
+
+    @property
+    def suspended(self):
+        return self.__suspended
+
+
+    @property
+    def held(self):
+        return len(self.__buffer)
+
+
+    @property
+    def dropped(self):
+        return self.__dropped
+
+
+    @property
+    def writing_inhibited(self):
+        return self.__writing_inhibited
+
+
+    @writing_inhibited.setter
+    def writing_inhibited(self, writing_inhibited):
+        self.__writing_inhibited = writing_inhibited
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ArchiveLogger:{log:%s, delete_oldest:%s, write_interval:%s, format:%s, deferred:%s, " \
+               "evolving:%s, suspended:%s, held:%s, dropped:%s, probe:%s, writing_inhibited:%s}" % \
+               (self.log, self.delete_oldest, self.write_interval, self.__writer_class.SUFFIX, self.__deferred,
+                self.evolving, self.suspended, self.held, self.dropped, self.__probe, self.writing_inhibited)
@@ -0,0 +1,301 @@
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A reader for the columnar log format. Rows are returned as lists of values, in the order of the header paths.
+
+If a start and / or end time is given, blocks whose rec range lies entirely outside the window are skipped without
+being decompressed, and rows within the remaining blocks are filtered on their rec value. The window is inclusive of
+the start, and exclusive of the end. Blocks without a valid rec range are always read.
+
+A truncated final block - for example, one that was being written when the writer was interrupted - is ignored.
+
+Rows may also be read as JSON documents. As for the scs_core CSVReader, null values are given as empty strings.
+"""
+
+import json
+import math
+import sys
+import zlib
+
+from array import array
+
+from scs_core.csv.csv_dict import CSVHeader
+from scs_core.data.json import JSONify
+
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnarLogReader(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def decode_column(cls, payload, offset, rows):
+        column_type = payload[offset:offset + 1]
+        offset += 1
+
+        if column_type == ColumnarLogWriter.TYPE_NULL:
+            return [None] * rows, offset
+
+        if column_type == ColumnarLogWriter.TYPE_INT:
+            return cls.__decode_array('q', payload, offset, rows)
+
+        if column_type == ColumnarLogWriter.TYPE_FLOAT:
+            return cls.__decode_array('d', payload, offset, rows)
+
+        if column_type == ColumnarLogWriter.TYPE_JSON:
+            length = ColumnarLogWriter.COLUMN_LENGTH.unpack_from(payload, offset)[0]
+            offset += ColumnarLogWriter.COLUMN_LENGTH.size
+
+            values = json.loads(payload[offset:offset + length].decode())
+
+            return values, offset + length
+
+        raise ValueError("unknown column type: %s" % column_type)
+
+
+    @staticmethod
+    def __decode_array(typecode, payload, offset, rows):
+        has_nulls = payload[offset]
+        offset += 1
+
+        mask = None
+
+        if has_nulls:
+            mask = payload[offset:offset + rows]
+            offset += rows
+
+        items = array(typecode)
+        length = rows * items.itemsize
+
+        items.frombytes(payload[offset:offset + length])
+
+        if sys.byteorder != 'little':
+            items.byteswap()
+
+        values = items.tolist()
+
+        if mask is not None:
+            values = [None if mask[i] else values[i] for i in range(rows)]
+
+        return values, offset + length
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        """
+        Constructor
+        """
+        self.__filename = filename                                                  # string
+        self.__file = open(filename, "rb")
+
+        magic = self.__file.read(len(ColumnarLogWriter.MAGIC))
+
+        if magic != ColumnarLogWriter.MAGIC:
+            self.__file.close()
+            raise ValueError("not a columnar log: %s" % filename)
+
+        length = ColumnarLogWriter.HEADER_LENGTH.unpack(self.__file.read(ColumnarLogWriter.HEADER_LENGTH.size))[0]
+        header = json.loads(self.__file.read(length).decode())
+
+        self.__paths = header['paths']                                              # list of string
+        self.__rec_path = header.get('rec')                                         # string
+        self.__data_offset = self.__file.tell()                                     # int
+
+        self.__read_count = 0                                                       # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def close(self):
+        self.__file.close()
+
+
+    def blocks(self):
+        self.__file.seek(self.__data_offset)
+
+        while True:
+            offset = self.__file.tell()
+            encoded = self.__file.read(ColumnarLogWriter.BLOCK_HEADER.size)
+
+            if len(encoded) < ColumnarLogWriter.BLOCK_HEADER.size:
+                return
+
+            magic, rows, length, earliest, latest = ColumnarLogWriter.BLOCK_HEADER.unpack(encoded)
+
+            if magic != ColumnarLogWriter.BLOCK_MAGIC:
+                return
+
+            yield ColumnarBlockIndex(offset, rows, length, earliest, latest)
+
+            self.__file.seek(length, 1)
+
+
+    def rows(self, start=None, end=None):
+        rec_index = self.__paths.index(self.__rec_path) if self.__rec_path in self.__paths else None
+        windowed = start is not None or end is not None
+
+        for block in list(self.blocks()):
+            if not block.overlaps(start, end):
+                continue
+
+            self.__file.seek(block.offset + ColumnarLogWriter.BLOCK_HEADER.size)
+            payload = self.__file.read(block.length)
+
+            if len(payload) < block.length:
+                return                                                              # truncated final block
+
+            payload = zlib.decompress(payload)
+
+            columns = []
+            offset = 0
+
+            for _ in self.__paths:
+                values, offset = self.decode_column(payload, offset, block.rows)
+                columns.append(values)
+
+            filtered = windowed and rec_index is not None and not block.within(start, end)
+
+            for i in range(block.rows):
+                row = [column[i] for column in columns]
+
+                if filtered and not LogTime.in_window(LogTime.timestamp(row[rec_index]), start, end):
+                    continue
+
+                self.__read_count += 1
+
+                yield row
+
+
+    def documents(self, start=None, end=None):
+        for _, document in self.records(start, end):
+            yield document
+
+
+    def records(self, start=None, end=None):
+        header = CSVHeader.construct_from_paths(self.__paths)
+        rec_index = self.__paths.index(self.__rec_path) if self.__rec_path in self.__paths else None
+
+        for row in self.rows(start, end):
+            timestamp = None if rec_index is None else LogTime.timestamp(row[rec_index])
+
+            yield timestamp, JSONify.dumps(header.as_dict(["" if value is None else value for value in row]))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def read_count(self):
+        return self.__read_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnarLogReader:{filename:%s, paths:%s, read_count:%s}" % \
+               (self.filename, self.paths, self.read_count)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnarBlockIndex(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, offset, rows, length, earliest, latest):
+        """
+        Constructor
+        """
+        self.__offset = offset                          # int               position of the block header
+        self.__rows = rows                              # int
+        self.__length = length                          # int               compressed payload length
+        self.__earliest = earliest                      # float             epoch seconds, or NaN
+        self.__latest = latest                          # float             epoch seconds, or NaN
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def has_range(self):
+        return not (math.isnan(self.earliest) or math.isnan(self.latest))
+
+
+    def overlaps(self, start, end):
+        if not self.has_range():
+            return True
+
+        if start is not None and self.latest < start:
+            return False
+
+        if end is not None and self.earliest >= end:
+            return False
+
+        return True
+
+
+    def within(self, start, end):
+        if not self.has_range():
+            return False
+
+        if start is not None and self.earliest < start:
+            return False
+
+        if end is not None and self.latest >= end:
+            return False
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def offset(self):
+        return self.__offset
+
+
+    @property
+    def rows(self):
+        return self.__rows
+
+
+    @property
+    def length(self):
+        return self.__length
+
+
+    @property
+    def earliest(self):
+        return self.__earliest
+
+
+    @property
+    def latest(self):
+        return self.__latest
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnarBlockIndex:{offset:%s, rows:%s, length:%s, earliest:%s, latest:%s}" % \
+               (self.offset, self.rows, self.length, self.earliest, self.latest)
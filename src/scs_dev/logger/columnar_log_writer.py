@@ -0,0 +1,227 @@
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A writer for the columnar log format - a compact binary alternative to CSV, for long-term logging.
+
+As for CSV, the schema - the list of column paths - is fixed from the first document, and is written in the file
+header. Rows are then collected into blocks. Within each block, each column is stored contiguously, with the narrowest
+type that holds all of its values: int64, float64 or - for text, and for mixed types - a JSON array. Each block is
+compressed, and is preceded by a block header that gives its row count, its compressed length, and the range of its
+rec timestamps. A reader can therefore find a time range by hopping from block header to block header, without
+decompressing any blocks outside the range.
+
+A block is written when it is full, when it has been open for longer than the block period, or when the writer is
+flushed with force, or closed. Blocks are only ever appended, so that the file remains readable if the writer is
+interrupted - at the cost of the rows in the current, unwritten, block.
+
+file layout:
+MAGIC, header length (uint32), header (JSON: {"paths": [...], "rec": "rec"}), blocks...
+
+block layout:
+BLOCK_MAGIC, rows (uint32), length (uint32), earliest rec (float64 epoch), latest rec (float64 epoch), zlib(columns...)
+
+column layout:
+type (1 byte), then for int64 and float64: null flag (1 byte), [null mask (1 byte per row)], values (8 bytes per row)
+for JSON: length (uint32), UTF-8 JSON array
+"""
+
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+
+from array import array
+
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ColumnarLogWriter(object):
+    """
+    classdocs
+    """
+
+    SUFFIX =            "scl"
+
+    MAGIC =             b"SCSCOL1\n"
+    BLOCK_MAGIC =       b"BLK1"
+
+    HEADER_LENGTH =     struct.Struct("<I")
+    BLOCK_HEADER =      struct.Struct("<4sIIdd")        # magic, rows, length, earliest rec, latest rec
+    COLUMN_LENGTH =     struct.Struct("<I")
+
+    TYPE_NULL =         b"n"
+    TYPE_INT =          b"q"
+    TYPE_FLOAT =        b"d"
+    TYPE_JSON =         b"j"
+
+    DEFAULT_BLOCK_ROWS =        360
+    DEFAULT_BLOCK_PERIOD =      600.0                   # seconds
+
+    __INT_MIN =         -(2 ** 63)
+    __INT_MAX =         2 ** 63 - 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def is_columnar(cls, filename):
+        try:
+            with open(filename, "rb") as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+        except OSError:
+            return False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def encode_column(cls, values):
+        present = [value for value in values if value is not None]
+
+        if not present:
+            return cls.TYPE_NULL
+
+        if all(type(value) is int and cls.__INT_MIN <= value <= cls.__INT_MAX for value in present):
+            return cls.TYPE_INT + cls.__encode_array('q', values, 0)
+
+        if all(type(value) is float for value in present):
+            return cls.TYPE_FLOAT + cls.__encode_array('d', values, 0.0)
+
+        encoded = json.dumps(values, separators=(',', ':')).encode()
+
+        return cls.TYPE_JSON + cls.COLUMN_LENGTH.pack(len(encoded)) + encoded
+
+
+    @staticmethod
+    def __encode_array(typecode, values, null):
+        has_nulls = None in values
+
+        items = array(typecode, (null if value is None else value for value in values))
+
+        if sys.byteorder != 'little':
+            items.byteswap()
+
+        if not has_nulls:
+            return b"\0" + items.tobytes()
+
+        mask = bytes(value is None for value in values)
+
+        return b"\1" + mask + items.tobytes()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename, paths, block_rows=None, block_period=None):
+        """
+        Constructor
+        """
+        self.__filename = filename                                                  # string
+        self.__paths = list(paths)                                                  # list of string
+
+        self.__block_rows = self.DEFAULT_BLOCK_ROWS if block_rows is None else block_rows
+        self.__block_period = self.DEFAULT_BLOCK_PERIOD if block_period is None else block_period
+
+        self.__rec_index = self.__paths.index(LogTime.REC_PATH) if LogTime.REC_PATH in self.__paths else None
+
+        self.__rows = []                                                            # list of list
+        self.__block_opened = None                                                  # float seconds
+
+        self.__file = open(filename, "wb")
+
+        header = json.dumps({'paths': self.__paths, 'rec': LogTime.REC_PATH}).encode()
+
+        self.__file.write(self.MAGIC + self.HEADER_LENGTH.pack(len(header)) + header)
+        self.__file.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, row):
+        if not self.__rows:
+            self.__block_opened = time.time()
+
+        self.__rows.append(row)
+
+
+    def flush(self, force=False):
+        if not self.__rows:
+            return
+
+        if not force and len(self.__rows) < self.__block_rows and \
+                time.time() - self.__block_opened < self.__block_period:
+            return
+
+        self.__write_block()
+        self.__file.flush()
+
+
+    def sync(self):
+        self.__file.flush()
+
+        os.fsync(self.__file.fileno())
+
+
+    def close(self):
+        if self.__file is None:
+            return
+
+        if self.__rows:
+            self.__write_block()
+
+        self.__file.close()
+        self.__file = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __write_block(self):
+        rows = self.__rows
+        self.__rows = []
+
+        columns = [[row[i] if i < len(row) else None for row in rows] for i in range(len(self.__paths))]
+        payload = zlib.compress(b"".join(self.encode_column(column) for column in columns))
+
+        first = last = math.nan
+
+        if self.__rec_index is not None:
+            timestamps = [LogTime.timestamp(value) for value in columns[self.__rec_index]]
+            timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+
+            if timestamps:
+                first = min(timestamps)
+                last = max(timestamps)
+
+        self.__file.write(self.BLOCK_HEADER.pack(self.BLOCK_MAGIC, len(rows), len(payload), first, last))
+        self.__file.write(payload)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def pending(self):
+        return len(self.__rows)                         # rows written, but not yet in a block
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ColumnarLogWriter:{filename:%s, block_rows:%s, block_period:%s, pending:%s}" % \
+               (self.filename, self.__block_rows, self.__block_period, self.pending)
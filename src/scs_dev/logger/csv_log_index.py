@@ -0,0 +1,113 @@
+"""
+Created on 2 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A sidecar index for a CSV log file, giving the byte offset of every Nth row, together with the epoch time of its rec
+value. The index file has the name of the log file, with the suffix .idx added, and is written alongside it.
+
+A reader seeks to the last indexed row recorded before the start of the window it requires, and reads forward from
+there. Rows are assumed to be in rec order, as written by the csv_logger. Index entries that point beyond the end of
+the log file - for example, if the logger was interrupted - are ignored.
+
+When a log file is compressed, its index keeps the original name, and its offsets into the uncompressed log.
+
+index file example:
+62,1533204005.372
+31262,1533207605.372
+"""
+
+import bisect
+import os
+
+from scs_dev.logger.log_compressor import LogCompressor
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CSVLogIndex(object):
+    """
+    classdocs
+    """
+
+    SUFFIX =            "idx"
+
+    DEFAULT_INTERVAL =  100                             # rows
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def index_filename(cls, log_filename):
+        return LogCompressor.original_filename(log_filename) + '.' + cls.SUFFIX
+
+
+    @classmethod
+    def load(cls, log_filename):
+        try:
+            f = open(cls.index_filename(log_filename), "r")
+        except FileNotFoundError:
+            return None
+
+        # a compressed log is complete...
+        log_size = None if LogCompressor.is_compressed(log_filename) else os.path.getsize(log_filename)
+
+        offsets = []
+        timestamps = []
+
+        with f:
+            for line in f:
+                try:
+                    offset, timestamp = line.strip().split(',')
+                    offset = int(offset)
+                    timestamp = float(timestamp)
+
+                except ValueError:
+                    break                               # incomplete final line
+
+                if log_size is not None and offset >= log_size:
+                    break
+
+                offsets.append(offset)
+                timestamps.append(timestamp)
+
+        return cls(log_filename, offsets, timestamps)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, log_filename, offsets, timestamps):
+        """
+        Constructor
+        """
+        self.__log_filename = log_filename              # string
+        self.__offsets = offsets                        # list of int
+        self.__timestamps = timestamps                  # list of float
+
+
+    def __len__(self):
+        return len(self.__offsets)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def offset(self, start):
+        if start is None or not self.__offsets:
+            return None
+
+        i = bisect.bisect_left(self.__timestamps, start)
+
+        return self.__offsets[max(i - 1, 0)]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def log_filename(self):
+        return self.__log_filename
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "CSVLogIndex:{log_filename:%s, entries:%s}" % (self.log_filename, len(self))
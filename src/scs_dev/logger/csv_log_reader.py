@@ -0,0 +1,152 @@
+"""
+Created on 2 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A reader for CSV log files, that returns those rows recorded within a time window as JSON documents. The window is
+inclusive of the start, and exclusive of the end.
+
+If the log has a sidecar CSVLogIndex, the reader seeks to the last indexed row before the start of the window.
+Otherwise, the file is read from the beginning. Since rows are in rec order, reading stops at the first row recorded
+at or after the end of the window.
+
+As for the scs_core CSVReader, the first row is a header row of paths, and cells are recast as int or float where
+possible. Logs compressed by the LogCompressor are read transparently.
+"""
+
+import csv
+import io
+
+from scs_core.csv.csv_dict import CSVHeader
+from scs_core.data.json import JSONify
+
+from scs_dev.logger.csv_log_index import CSVLogIndex
+from scs_dev.logger.log_compressor import LogCompressor
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CSVLogReader(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def recast(value):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        return value
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename):
+        """
+        Constructor
+        """
+        self.__filename = filename                                                  # string
+        self.__file = LogCompressor.open(filename)
+
+        self.__paths = next(csv.reader([self.__file.readline().decode()]), [])
+        self.__data_offset = self.__file.tell()                                     # int
+
+        self.__index = CSVLogIndex.load(filename)                                   # CSVLogIndex
+        self.__read_count = 0                                                       # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def close(self):
+        self.__file.close()
+
+
+    def rows(self, start=None, end=None):
+        rec_index = self.__paths.index(LogTime.REC_PATH) if LogTime.REC_PATH in self.__paths else None
+        windowed = rec_index is not None and (start is not None or end is not None)
+
+        offset = None if self.__index is None else self.__index.offset(start)
+
+        self.__file.seek(self.__data_offset if offset is None else max(offset, self.__data_offset))
+
+        text = io.TextIOWrapper(self.__file, newline='')
+
+        try:
+            for row in csv.reader(text):
+                if len(row) == 0:
+                    continue
+
+                if windowed:
+                    timestamp = LogTime.timestamp(row[rec_index] if rec_index < len(row) else None)
+
+                    if timestamp is None:
+                        continue
+
+                    if end is not None and timestamp >= end:
+                        break
+
+                    if start is not None and timestamp < start:
+                        continue
+
+                self.__read_count += 1
+
+                yield [self.recast(cell) for cell in row]
+
+        finally:
+            text.detach()                               # leave the log file open
+
+
+    def documents(self, start=None, end=None):
+        for _, document in self.records(start, end):
+            yield document
+
+
+    def records(self, start=None, end=None):
+        header = CSVHeader.construct_from_paths(self.__paths)
+        rec_index = self.__paths.index(LogTime.REC_PATH) if LogTime.REC_PATH in self.__paths else None
+
+        width = len(self.__paths)
+
+        for row in self.rows(start, end):
+            row = (row + [""] * width)[:width]
+            timestamp = None if rec_index is None else LogTime.timestamp(row[rec_index])
+
+            yield timestamp, JSONify.dumps(header.as_dict(row))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def index(self):
+        return self.__index
+
+
+    @property
+    def read_count(self):
+        return self.__read_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "CSVLogReader:{filename:%s, index:%s, read_count:%s}" % (self.filename, self.index, self.read_count)
@@ -0,0 +1,132 @@
+"""
+Created on 1 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A writer for the CSV log format, as written by the scs_core CSVLogger: a header row of paths, followed by one row per
+document.
+
+Rows are encoded before they are written, so that the byte offset of each row is known. If the schema includes a rec
+path, then the offset of every Nth row is written to a sidecar CSVLogIndex file.
+"""
+
+import csv
+import io
+import os
+
+from scs_dev.logger.csv_log_index import CSVLogIndex
+from scs_dev.logger.log_time import LogTime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CSVLogWriter(object):
+    """
+    classdocs
+    """
+
+    SUFFIX =            "csv"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename, paths, index_interval=None):
+        """
+        Constructor
+        """
+        self.__filename = filename                                                  # string
+        self.__paths = list(paths)                                                  # list of string
+
+        self.__index_interval = CSVLogIndex.DEFAULT_INTERVAL if index_interval is None else index_interval
+        self.__rec_index = self.__paths.index(LogTime.REC_PATH) if LogTime.REC_PATH in self.__paths else None
+
+        self.__buffer = io.StringIO()
+        self.__writer = csv.writer(self.__buffer, quoting=csv.QUOTE_MINIMAL)
+
+        self.__file = open(filename, "wb")
+        self.__index = None if self.__rec_index is None else open(CSVLogIndex.index_filename(filename), "w")
+
+        self.__offset = 0                                                           # int
+        self.__rows = 0                                                             # int
+
+        self.__file.write(self.__encode(self.__paths))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, row):
+        if self.__index is not None and self.__rows % self.__index_interval == 0:
+            timestamp = LogTime.timestamp(row[self.__rec_index])
+
+            if timestamp is not None:
+                self.__index.write("%d,%s\n" % (self.__offset, timestamp))
+
+        self.__file.write(self.__encode(row))
+        self.__rows += 1
+
+
+    def flush(self, force=False):
+        self.__file.flush()
+
+        if self.__index is not None:
+            self.__index.flush()
+
+
+    def sync(self):
+        self.flush()
+
+        os.fsync(self.__file.fileno())
+
+        if self.__index is not None:
+            os.fsync(self.__index.fileno())
+
+
+    def close(self):
+        if self.__file is None:
+            return
+
+        self.__file.close()
+        self.__file = None
+
+        if self.__index is not None:
+            self.__index.close()
+            self.__index = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __encode(self, row):
+        self.__writer.writerow(row)
+
+        encoded = self.__buffer.getvalue().encode()
+
+        self.__buffer.seek(0)
+        self.__buffer.truncate()
+
+        self.__offset += len(encoded)
+
+        return encoded
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def paths(self):
+        return self.__paths
+
+
+    @property
+    def pending(self):
+        return 0                                        # rows are written as they arrive
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "CSVLogWriter:{filename:%s, rows:%s, index_interval:%s}" % \
+               (self.filename, self.__rows, self.__index_interval)
@@ -0,0 +1,80 @@
+"""
+Created on 8 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+The union of the paths of a stream of JSON documents, for writers whose schema may grow as new fields appear.
+
+Paths are kept in document order: a new path is placed after the path that precedes it in the document that
+introduces it, so that - for example - val.ndir.cnc is placed with the other val nodes, rather than at the end of the
+row. Writers hold back a prefix of documents, to find the union schema before anything is written, and start a new
+segment if a field appears after that.
+"""
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class EvolvingSchema(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_PREFIX_ROWS =   20
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, paths=None, prefix_rows=None):
+        """
+        Constructor
+        """
+        self.__paths = [] if paths is None else list(paths)                         # list of string
+        self.__path_set = set(self.__paths)                                         # set of string
+
+        self.__prefix_rows = self.DEFAULT_PREFIX_ROWS if prefix_rows is None else prefix_rows
+
+
+    def __len__(self):
+        return len(self.__paths)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def update(self, paths):
+        # fast path...
+        if all(path in self.__path_set for path in paths):
+            return []
+
+        added = []
+        position = 0
+
+        for path in paths:
+            if path in self.__path_set:
+                position = self.__paths.index(path) + 1
+                continue
+
+            self.__paths.insert(position, path)
+            self.__path_set.add(path)
+            added.append(path)
+
+            position += 1
+
+        return added
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def paths(self):
+        return list(self.__paths)
+
+
+    @property
+    def prefix_rows(self):
+        return self.__prefix_rows
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "EvolvingSchema:{paths:%s, prefix_rows:%s}" % (len(self), self.prefix_rows)
@@ -0,0 +1,193 @@
+"""
+Created on 6 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A running index of the log files in a log archive - the root path, and its year-month directories - giving the size
+and modification time of each.
+
+The archive is scanned once, in full. Thereafter, on refresh, only those directories whose modification time has
+changed - because files have been created, renamed or deleted in them - are rescanned. Files that grow in place do not
+change their directory, so sizes may be understated for logs that are still being written. The owner should update
+the index for any file that it changes itself.
+"""
+
+import os
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogArchiveIndex(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, root_path, suffixes):
+        """
+        Constructor
+        """
+        self.__root_path = root_path                    # string
+        self.__suffixes = tuple('.' + suffix for suffix in suffixes)
+
+        self.__directories = {}                         # dict of path: (int mtime_ns, dict of path: LogArchiveEntry)
+
+
+    def __len__(self):
+        return sum(len(entries) for _, entries in self.__directories.values())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def refresh(self):
+        try:
+            names = os.listdir(self.__root_path)
+        except OSError:
+            self.__directories = {}
+            return
+
+        directories = {}
+
+        for name in names:
+            path = os.path.join(self.__root_path, name)
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            if not os.path.isdir(path):
+                continue
+
+            cached = self.__directories.get(path)
+
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                directories[path] = cached
+                continue
+
+            directories[path] = (stat.st_mtime_ns, self.__scan(path))
+
+        self.__directories = directories
+
+
+    def entries(self):
+        entries = [entry for _, directory in self.__directories.values() for entry in directory.values()]
+
+        return sorted(entries, key=lambda entry: (entry.mtime, entry.path))
+
+
+    def update(self, path):
+        directory = self.__directories.get(os.path.dirname(path))
+
+        if directory is None:
+            return
+
+        entry = LogArchiveEntry.construct(path)
+
+        if entry is None:
+            directory[1].pop(path, None)
+        else:
+            directory[1][path] = entry
+
+
+    def discard(self, path):
+        directory = self.__directories.get(os.path.dirname(path))
+
+        if directory is not None:
+            directory[1].pop(path, None)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __scan(self, directory_path):
+        entries = {}
+
+        try:
+            names = os.listdir(directory_path)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(self.__suffixes):
+                continue
+
+            path = os.path.join(directory_path, name)
+            entry = LogArchiveEntry.construct(path)
+
+            if entry is not None:
+                entries[path] = entry
+
+        return entries
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root_path(self):
+        return self.__root_path
+
+
+    @property
+    def total(self):
+        return sum(entry.size for entry in self.entries())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LogArchiveIndex:{root_path:%s, directories:%s, files:%s}" % \
+               (self.root_path, len(self.__directories), len(self))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogArchiveEntry(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct(cls, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return cls(path, stat.st_mtime, stat.st_size)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, path, mtime, size):
+        """
+        Constructor
+        """
+        self.__path = path                              # string
+        self.__mtime = mtime                            # float epoch seconds
+        self.__size = size                              # int bytes
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def path(self):
+        return self.__path
+
+
+    @property
+    def mtime(self):
+        return self.__mtime
+
+
+    @property
+    def size(self):
+        return self.__size
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LogArchiveEntry:{path:%s, mtime:%s, size:%s}" % (self.path, self.mtime, self.size)
@@ -0,0 +1,201 @@
+"""
+Created on 6 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A background worker that compresses closed CSV log files with gzip, at low priority.
+
+A CSV log is taken to be closed if it was last modified before the current UTC day, and has not been modified for the
+quiet period: the csv_logger starts a new log at the first write after 00:00 UTC, and never returns to an earlier one.
+This rule is safe where several csv_logger processes share a log archive.
+
+Each log is compressed to a temporary file, which is synced, given the modification time of the original, and then
+renamed over the compressed file name - log.csv becomes log.csv.gz - before the original is deleted. The sidecar
+CSVLogIndex is kept, under the original name: its offsets are into the uncompressed log.
+
+The worker thread lowers its own scheduling priority, where the platform permits this. Columnar logs are already
+compressed, and are left alone.
+"""
+
+import gzip
+import os
+import shutil
+import sys
+import threading
+import time
+
+from datetime import datetime, timezone
+
+from scs_dev.logger.log_archive_index import LogArchiveIndex
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogCompressor(object):
+    """
+    classdocs
+    """
+
+    SUFFIX =                "gz"
+
+    __LOG_SUFFIX =          "csv"
+    __TMP_SUFFIX =          "tmp"
+
+    __INTERVAL =            600.0                       # seconds between scans
+    __QUIET_PERIOD =        600.0                       # seconds since last modification
+    __NICENESS =            19
+    __CHUNK_SIZE =          65536                       # bytes
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def is_compressed(cls, filename):
+        return filename is not None and filename.endswith('.' + cls.SUFFIX)
+
+
+    @classmethod
+    def original_filename(cls, filename):
+        return filename[:-(len(cls.SUFFIX) + 1)] if cls.is_compressed(filename) else filename
+
+
+    @classmethod
+    def compressed_filename(cls, filename):
+        return filename + '.' + cls.SUFFIX
+
+
+    @classmethod
+    def open(cls, filename):
+        return gzip.open(filename, "rb") if cls.is_compressed(filename) else open(filename, "rb")
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, root_path, interval=None):
+        """
+        Constructor
+        """
+        self.__index = LogArchiveIndex(root_path, (self.__LOG_SUFFIX, ))
+        self.__interval = self.__INTERVAL if interval is None else interval
+
+        self.__compressed = 0                           # int
+        self.__saved = 0                                # int bytes
+
+        self.__running = False
+        self.__wakeup = threading.Event()
+        self.__thread = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__running = True
+
+        self.__thread = threading.Thread(target=self.__run, name="LogCompressor", daemon=True)
+        self.__thread.start()
+
+
+    def stop(self):
+        self.__running = False
+        self.__wakeup.set()
+
+        if self.__thread:
+            self.__thread.join()
+
+
+    def compress_closed(self):
+        self.__index.refresh()
+
+        today = datetime.now(timezone.utc).date()
+        now = time.time()
+
+        for entry in self.__index.entries():
+            if self.__thread is not None and not self.__running:
+                break
+
+            if datetime.fromtimestamp(entry.mtime, timezone.utc).date() >= today:
+                continue
+
+            if now - entry.mtime < self.__QUIET_PERIOD:
+                continue
+
+            self.compress(entry.path)
+
+
+    def compress(self, path):
+        compressed_path = self.compressed_filename(path)
+        tmp_path = "%s.%d.%s" % (compressed_path, os.getpid(), self.__TMP_SUFFIX)
+
+        try:
+            stat = os.stat(path)
+
+            with open(path, "rb") as src, open(tmp_path, "wb") as raw:
+                name = os.path.basename(path)
+
+                with gzip.GzipFile(filename=name, mode="wb", fileobj=raw, mtime=stat.st_mtime) as dst:
+                    shutil.copyfileobj(src, dst, self.__CHUNK_SIZE)
+
+                raw.flush()
+                os.fsync(raw.fileno())
+
+                size = raw.tell()
+
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp_path, compressed_path)
+            os.remove(path)
+
+        except OSError as ex:
+            print("LogCompressor: %s: %s" % (path, ex), file=sys.stderr)
+            sys.stderr.flush()
+
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+            return False
+
+        self.__index.discard(path)
+
+        self.__compressed += 1
+        self.__saved += stat.st_size - size
+
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, self.__NICENESS)     # on Linux, applies to the calling thread only
+        except (AttributeError, OSError):
+            pass
+
+        while self.__running:
+            self.compress_closed()
+
+            self.__wakeup.wait(self.__interval)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root_path(self):
+        return self.__index.root_path
+
+
+    @property
+    def compressed(self):
+        return self.__compressed
+
+
+    @property
+    def saved(self):
+        return self.__saved
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LogCompressor:{root_path:%s, interval:%s, compressed:%s, saved:%s}" % \
+               (self.root_path, self.__interval, self.compressed, self.saved)
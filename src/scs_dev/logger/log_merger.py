@@ -0,0 +1,176 @@
+"""
+Created on 7 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Reads any number of log files - CSV, compressed CSV or columnar - in a pool of worker processes, and merges their
+documents into a single stream, in rec order.
+
+The first record of each file is read in advance, and the files are handed to the pool in order of their first rec.
+As the documents of each file are returned, those recorded no later than the first rec of the next file are released,
+so that only the documents of files that overlap in time are held in memory. Documents within a file keep their order.
+Documents without a valid rec take the rec of the document before them, or - at the start of a file - are released
+ahead of the file's other documents.
+
+The window is inclusive of the start, and exclusive of the end. Sidecar CSVLogIndex and SegmentLink files are ignored,
+so that a glob such as 2018-08/*-climate-* may be used.
+"""
+
+import heapq
+import multiprocessing
+import os
+
+from scs_dev.logger.columnar_log_reader import ColumnarLogReader
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.csv_log_index import CSVLogIndex
+from scs_dev.logger.csv_log_reader import CSVLogReader
+from scs_dev.logger.segment_link import SegmentLink
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def read_log(spec):
+    """
+    pool worker: returns the list of (timestamp, document) records for one log file and window
+    """
+    filename, start, end = spec
+
+    reader = LogMerger.reader(filename)
+
+    try:
+        records = []
+        timestamp = LogMerger.EARLIEST
+
+        for rec, document in reader.records(start, end):
+            if rec is not None:
+                timestamp = rec
+
+            records.append((timestamp, document))
+
+        return records
+
+    finally:
+        reader.close()
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogMerger(object):
+    """
+    classdocs
+    """
+
+    EARLIEST =      float('-inf')
+    LATEST =        float('inf')
+
+    SIDECAR_SUFFIXES = ('.' + CSVLogIndex.SUFFIX, '.' + SegmentLink.SUFFIX)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def reader(filename):
+        if ColumnarLogWriter.is_columnar(filename):
+            return ColumnarLogReader(filename)
+
+        return CSVLogReader(filename)
+
+
+    @classmethod
+    def first_timestamp(cls, filename, start=None, end=None):
+        reader = cls.reader(filename)
+
+        try:
+            record = next(reader.records(start, end), None)
+
+        finally:
+            reader.close()
+
+        if record is None:
+            return None                                 # no records in window
+
+        return cls.EARLIEST if record[0] is None else record[0]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filenames, start=None, end=None, processes=None):
+        """
+        Constructor
+        """
+        self.__filenames = [filename for filename in filenames
+                            if not filename.endswith(self.SIDECAR_SUFFIXES)]        # list of string
+        self.__start = start                            # float epoch seconds
+        self.__end = end                                # float epoch seconds
+        self.__processes = processes or os.cpu_count() or 1
+
+        self.__read_count = 0                           # int
+        self.__pool = None                              # Pool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def close(self):
+        if self.__pool is None:
+            return
+
+        self.__pool.terminate()
+        self.__pool.join()
+        self.__pool = None
+
+
+    def documents(self):
+        # order the files by first rec...
+        firsts = []
+
+        for order, filename in enumerate(self.__filenames):
+            first = self.first_timestamp(filename, self.__start, self.__end)
+
+            if first is not None:
+                firsts.append((first, order, filename))
+
+        firsts.sort()
+
+        if not firsts:
+            return
+
+        specs = [(filename, self.__start, self.__end) for _, _, filename in firsts]
+        processes = min(self.__processes, len(specs))
+
+        # merge...
+        self.__pool = multiprocessing.Pool(processes)
+
+        try:
+            heap = []
+
+            for i, records in enumerate(self.__pool.imap(read_log, specs)):
+                for seq, (timestamp, document) in enumerate(records):
+                    heapq.heappush(heap, (timestamp, i, seq, document))
+
+                release = firsts[i + 1][0] if i + 1 < len(firsts) else self.LATEST
+
+                while heap and heap[0][0] <= release:
+                    self.__read_count += 1
+                    yield heapq.heappop(heap)[3]
+
+        finally:
+            self.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filenames(self):
+        return self.__filenames
+
+
+    @property
+    def read_count(self):
+        return self.__read_count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LogMerger:{filenames:%s, start:%s, end:%s, processes:%s, read_count:%s}" % \
+               (len(self.filenames), self.__start, self.__end, self.__processes, self.read_count)
@@ -0,0 +1,156 @@
+"""
+Created on 3 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Space management for a log archive, following the scs_core CSVLogger: if free space on the log volume falls below the
+minimum, either the oldest log files are deleted, or - if deletion is not permitted - the caller must stop logging.
+Files that are currently being written are never deleted.
+
+Log files are found with a running LogArchiveIndex, rather than by walking the archive on each deletion. When space
+must be cleared, the oldest files - by modification time - are deleted until the free space reaches the target
+watermark, which is set well above the minimum, so that eviction happens in occasional batches. The index gives the
+size of each file, so a batch is chosen with a single disk usage check. Files may be plain CSV, compressed CSV, or
+columnar logs.
+
+If the volume cannot be inspected at all, space is not cleared, but logging is not stopped: recovery from storage
+faults is left to the loggers.
+"""
+
+import os
+import sys
+
+from scs_core.sys.filesystem import Filesystem
+
+from scs_dev.logger.columnar_log_writer import ColumnarLogWriter
+from scs_dev.logger.csv_log_index import CSVLogIndex
+from scs_dev.logger.csv_log_writer import CSVLogWriter
+from scs_dev.logger.log_archive_index import LogArchiveIndex
+from scs_dev.logger.log_compressor import LogCompressor
+from scs_dev.logger.segment_link import SegmentLink
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogRetention(object):
+    """
+    classdocs
+    """
+
+    SUFFIXES =              (CSVLogWriter.SUFFIX, ColumnarLogWriter.SUFFIX, LogCompressor.SUFFIX)
+
+    __MIN_FREE_SPACE =      10485760                    # 10MB
+    __TARGET_FREE_SPACE =   52428800                    # 50MB
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, root_path, delete_oldest):
+        """
+        Constructor
+        """
+        self.__host = host                              # Host
+        self.__root_path = root_path                    # string
+        self.__delete_oldest = delete_oldest            # bool
+
+        self.__index = LogArchiveIndex(root_path, self.SUFFIXES)
+        self.__deleted = 0                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def clear_space(self, active_paths=()):
+        try:
+            return self.__clear_space(active_paths)
+
+        except OSError as ex:
+            print("LogRetention: %s" % ex, file=sys.stderr)
+            return True
+
+
+    def has_sufficient_space(self):
+        return self.__free_space() > self.__MIN_FREE_SPACE
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __clear_space(self, active_paths):
+        free = self.__free_space()
+
+        if free > self.__MIN_FREE_SPACE:
+            return True
+
+        # stop on no-delete...
+        if not self.delete_oldest:
+            print("LogRetention: volume full.", file=sys.stderr)
+            return False
+
+        # delete until the target is reached...
+        while free <= self.__MIN_FREE_SPACE:
+            if not self.__delete_oldest_logs(self.__TARGET_FREE_SPACE - free, active_paths):
+                print("LogRetention: delete failed.", file=sys.stderr)
+                return False
+
+            free = self.__free_space()
+
+        return True
+
+
+    def __delete_oldest_logs(self, required, active_paths):
+        self.__index.refresh()
+
+        released = 0
+        deleted = 0
+
+        for entry in self.__index.entries():
+            if released >= required:
+                break
+
+            if entry.path in active_paths:
+                continue
+
+            print("LogRetention: deleting: %s" % entry.path, file=sys.stderr)
+
+            self.__index.discard(entry.path)
+
+            if not Filesystem.rm(entry.path):
+                continue
+
+            Filesystem.rm(CSVLogIndex.index_filename(entry.path))
+            Filesystem.rm(SegmentLink.link_filename(entry.path))
+            Filesystem.rmdir(os.path.dirname(entry.path))           # remove empty directories
+
+            released += entry.size
+            deleted += 1
+
+        self.__deleted += deleted
+
+        return deleted > 0
+
+
+    def __free_space(self):
+        return self.__host.disk_usage(self.root_path).free
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def root_path(self):
+        return self.__root_path
+
+
+    @property
+    def delete_oldest(self):
+        return self.__delete_oldest
+
+
+    @property
+    def deleted(self):
+        return self.__deleted
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "LogRetention:{root_path:%s, delete_oldest:%s, index:%s, deleted:%s}" % \
+               (self.root_path, self.delete_oldest, self.__index, self.deleted)
@@ -0,0 +1,47 @@
+"""
+Created on 2 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Conversion of rec values to epoch seconds, for the time indexing of log files.
+"""
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LogTime(object):
+    """
+    classdocs
+    """
+
+    REC_PATH =          "rec"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def timestamp(rec):
+        if rec is None or rec == "":
+            return None
+
+        try:
+            return LocalizedDatetime.construct_from_iso8601(str(rec)).timestamp()
+
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+
+    @staticmethod
+    def in_window(timestamp, start, end):
+        if timestamp is None:
+            return False
+
+        if start is not None and timestamp < start:
+            return False
+
+        if end is not None and timestamp >= end:
+            return False
+
+        return True
@@ -0,0 +1,178 @@
+"""
+Created on 3 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Logs documents for any number of topics, each to its own CSVLog, under one root path. The topic loggers are deferred:
+a single flusher thread writes all of the topics' buffered documents each write interval, preceded by a single
+retention pass over the whole log archive. If the write interval is zero, documents are written as they are received,
+and the retention pass is made at most once a minute.
+
+If the retention pass fails - because the volume is full, and deletion is not permitted - then logging is inhibited
+for all topics. Other storage faults are recovered by each topic's logger.
+"""
+
+import threading
+import time
+
+from collections import OrderedDict
+
+from scs_core.csv.csv_log import CSVLog
+
+from scs_dev.logger.archive_logger import ArchiveLogger
+from scs_dev.logger.csv_log_writer import CSVLogWriter
+from scs_dev.logger.log_retention import LogRetention
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MultiTopicLogger(object):
+    """
+    classdocs
+    """
+
+    __RETENTION_INTERVAL =  60.0                        # seconds
+    __STOP_TIMEOUT =        10.0                        # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def is_valid_topic(topic):
+        return bool(topic) and '/' not in topic and not topic.startswith('.')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, conf, tag, writer_class=CSVLogWriter, evolving=False):
+        """
+        Constructor
+        """
+        self.__host = host                              # Host
+        self.__conf = conf                              # CSVLoggerConf
+        self.__tag = tag                                # string
+        self.__writer_class = writer_class              # class
+        self.__evolving = evolving                      # bool
+
+        self.__retention = LogRetention(host, conf.root_path, conf.delete_oldest)
+
+        self.__loggers = OrderedDict()                  # dict of topic: ArchiveLogger
+        self.__latest_retention = None                  # float seconds
+        self.__writing_inhibited = False                # bool
+
+        self.__running = False
+        self.__lock = threading.RLock()
+        self.__wakeup = threading.Event()
+        self.__thread = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__running = True
+
+        if not self.__conf.write_interval:
+            return
+
+        self.__thread = threading.Thread(target=self.__run, name="MultiTopicLogger", daemon=True)
+        self.__thread.start()
+
+
+    def stop(self):
+        self.__running = False
+        self.__wakeup.set()
+
+        if self.__thread:
+            self.__thread.join(self.__STOP_TIMEOUT)
+
+        with self.__lock:
+            self.__clear_space()
+
+            for logger in self.__loggers.values():
+                logger.close()
+
+
+    def write(self, topic, jstr):
+        with self.__lock:
+            if self.__writing_inhibited:
+                return None
+
+            logger = self.__loggers.get(topic)
+
+            if logger is None:
+                log = CSVLog(self.__conf.root_path, topic, self.__tag)
+                logger = ArchiveLogger(self.__host, log, self.__conf.delete_oldest, self.__conf.write_interval,
+                                       self.__writer_class, deferred=True, evolving=self.__evolving)
+
+                self.__loggers[topic] = logger
+
+            path = logger.write(jstr)
+
+            if not self.__conf.write_interval:
+                self.flush()
+
+            return path
+
+
+    def flush(self):
+        with self.__lock:
+            if not self.__clear_space():
+                return
+
+            for logger in self.__loggers.values():
+                logger.flush()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while self.__running:
+            self.__wakeup.wait(self.__conf.write_interval)
+
+            if not self.__running:
+                break
+
+            self.flush()
+
+
+    def __clear_space(self):
+        now = time.time()
+
+        if not self.__conf.write_interval and self.__latest_retention is not None and \
+                now - self.__latest_retention < self.__RETENTION_INTERVAL:
+            return not self.__writing_inhibited
+
+        self.__latest_retention = now
+
+        active_paths = [logger.active_path for logger in self.__loggers.values() if logger.active_path]
+
+        if self.__retention.clear_space(active_paths):
+            return True
+
+        self.__writing_inhibited = True
+
+        for logger in self.__loggers.values():
+            logger.writing_inhibited = True
+
+        return False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def topics(self):
+        return list(self.__loggers.keys())
+
+
+    @property
+    def writing_inhibited(self):
+        return self.__writing_inhibited
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "MultiTopicLogger:{retention:%s, write_interval:%s, format:%s, evolving:%s, topics:%s, " \
+               "writing_inhibited:%s}" % \
+               (self.__retention, self.__conf.write_interval, self.__writer_class.SUFFIX, self.__evolving,
+                self.topics, self.writing_inhibited)
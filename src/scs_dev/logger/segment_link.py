@@ -0,0 +1,96 @@
+"""
+Created on 8 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A sidecar record for a log segment that was started because new fields appeared in the input, linking it to the
+segment before it. The link file has the name of the segment, with the suffix .lnk added, and is written alongside it.
+Segments that were already on disk are not changed.
+
+As for the CSVLogIndex, when a segment is compressed, its link keeps the original name.
+
+document example:
+{"previous": "scs-ap1-6-gases-2018-08-08-10-00-05.csv", "added": ["val.NO2.weC", "val.NO2.cnc"]}
+"""
+
+import json
+import os
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONable
+
+from scs_dev.logger.log_compressor import LogCompressor
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SegmentLink(JSONable):
+    """
+    classdocs
+    """
+
+    SUFFIX =            "lnk"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def link_filename(cls, log_filename):
+        return LogCompressor.original_filename(log_filename) + '.' + cls.SUFFIX
+
+
+    @classmethod
+    def load(cls, log_filename):
+        try:
+            with open(cls.link_filename(log_filename), "r") as f:
+                jdict = json.loads(f.read())
+
+        except (OSError, ValueError):
+            return None
+
+        return cls(jdict.get('previous'), jdict.get('added', []))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, previous, added):
+        """
+        Constructor
+        """
+        self.__previous = previous                      # string            filename, without directory
+        self.__added = list(added)                      # list of string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def save(self, log_filename):
+        with open(self.link_filename(log_filename), "w") as f:
+            f.write(json.dumps(self.as_json()) + '\n')
+
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['previous'] = None if self.previous is None else os.path.basename(self.previous)
+        jdict['added'] = self.added
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def previous(self):
+        return self.__previous
+
+
+    @property
+    def added(self):
+        return self.__added
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SegmentLink:{previous:%s, added:%s}" % (self.previous, self.added)
@@ -0,0 +1,227 @@
+"""
+Created on 8 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A CSV writer for the csv_writer utility whose schema grows with its input, as an alternative to the scs_core CSVWriter.
+
+The first documents - up to the prefix size - are held back, and the header is written with the union of their paths.
+Thereafter, if a document has a field that is not in the header, the current file is closed, and a new segment is
+started, with an extended header and a SegmentLink to the segment before it: temp.csv is followed by temp.1.csv,
+temp.2.csv and so on. A new segment is always a new file - an existing segment is never rewritten.
+
+In append mode, rows are appended to the latest existing segment, whose header gives the initial schema. Otherwise,
+the file is started afresh, and the later segments of an earlier run - with their links - are removed, so that they
+are not read as a continuation of the new file.
+
+When writing to stdout, a new segment cannot be started: fields that appear after the prefix are reported to stderr,
+and ignored.
+"""
+
+import csv
+import os
+import sys
+
+from scs_core.csv.csv_dict import CSVDict
+
+from scs_dev.logger.evolving_schema import EvolvingSchema
+from scs_dev.logger.segment_link import SegmentLink
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SegmentedCSVWriter(object):
+    """
+    classdocs
+    """
+
+    QUOTING = csv.QUOTE_MINIMAL
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def segment_filename(filename, segment):
+        if segment == 0:
+            return filename
+
+        base, ext = os.path.splitext(filename)
+
+        return "%s.%d%s" % (base, segment, ext)
+
+
+    @classmethod
+    def latest_segment(cls, filename):
+        segment = 0
+
+        while os.path.exists(cls.segment_filename(filename, segment + 1)):
+            segment += 1
+
+        return segment
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, filename=None, append=False, prefix_rows=None):
+        """
+        Constructor
+        """
+        self.__filename = filename                      # string
+        self.__append = append and filename is not None and os.path.exists(filename)
+
+        self.__segment = 0                              # int
+        self.__paths = None                             # list of string
+        self.__schema = EvolvingSchema(prefix_rows=prefix_rows)
+        self.__prefix = []                              # list of CSVDict, or None once the header is written
+        self.__ignored = set()                          # set of string
+
+        if self.__append:
+            self.__segment = self.latest_segment(filename)
+            self.__schema.update(self.__header(self.segment_filename(filename, self.__segment)))
+            self.__prefix = None
+
+        elif filename is not None:
+            self.__remove_segments(filename)
+
+        self.__file = None
+        self.__writer = None
+
+        self.__open("a" if self.__append else "w")
+
+        if self.__append:
+            self.__paths = self.__schema.paths
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def write(self, jstr):
+        if jstr is None:
+            return False
+
+        datum = CSVDict.construct_from_jstr(jstr)
+
+        if datum is None:
+            return False
+
+        paths = datum.paths()
+
+        # prefix...
+        if self.__prefix is not None:
+            self.__schema.update(paths)
+            self.__prefix.append(datum)
+
+            if len(self.__prefix) >= self.__schema.prefix_rows:
+                self.__release_prefix()
+
+            return True
+
+        # new fields...
+        added = self.__schema.update(paths)
+
+        if added:
+            self.__extend(added)
+
+        # row...
+        self.__write_row(datum)
+
+        return True
+
+
+    def close(self):
+        if self.__prefix:
+            self.__release_prefix()
+
+        if self.filename is None:
+            return
+
+        self.__file.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __release_prefix(self):
+        prefix = self.__prefix
+        self.__prefix = None
+
+        self.__paths = self.__schema.paths
+        self.__writer.writerow(self.__paths)
+
+        for datum in prefix:
+            self.__write_row(datum)
+
+
+    def __extend(self, added):
+        # stdout...
+        if self.filename is None:
+            for path in added:
+                if path not in self.__ignored:
+                    print("SegmentedCSVWriter: ignoring field: %s" % path, file=sys.stderr)
+                    self.__ignored.add(path)
+
+            return
+
+        # new segment...
+        previous = self.segment_filename(self.filename, self.__segment)
+
+        self.__file.close()
+        self.__segment += 1
+
+        self.__open("x")                                # a new segment - never an existing file
+
+        SegmentLink(previous, added).save(self.segment_filename(self.filename, self.__segment))
+
+        self.__paths = self.__schema.paths
+        self.__writer.writerow(self.__paths)
+
+
+    def __write_row(self, datum):
+        self.__writer.writerow(datum.row(self.__paths))
+        self.__file.flush()
+
+
+    def __open(self, mode):
+        if self.filename is None:
+            self.__file = sys.stdout
+        else:
+            self.__file = open(self.segment_filename(self.filename, self.__segment), mode, newline='')
+
+        self.__writer = csv.writer(self.__file, quoting=self.QUOTING)
+
+
+    @classmethod
+    def __remove_segments(cls, filename):
+        for segment in range(cls.latest_segment(filename), 0, -1):
+            segment_filename = cls.segment_filename(filename, segment)
+
+            os.remove(segment_filename)
+
+            try:
+                os.remove(SegmentLink.link_filename(segment_filename))
+
+            except FileNotFoundError:
+                pass
+
+
+    @staticmethod
+    def __header(filename):
+        with open(filename, "r") as f:
+            return next(csv.reader(f), [])
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def filename(self):
+        return self.__filename
+
+
+    @property
+    def segment(self):
+        return self.__segment
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SegmentedCSVWriter:{filename:%s, append:%s, segment:%s, schema:%s}" % \
+               (self.filename, self.__append, self.segment, self.__schema)
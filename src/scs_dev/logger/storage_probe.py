@@ -0,0 +1,100 @@
+"""
+Created on 5 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Probes a log volume that has failed, with exponential backoff, to find when it is writable again.
+
+A probe succeeds if the volume reports its disk usage, and a file can be written to the log root directory and
+removed. The root directory is not created by the probe - if the volume is not mounted, the directory should be
+missing, rather than created on the underlying filesystem.
+
+Following each failure - of logging, or of a probe - the next probe is deferred by twice the previous delay, up to the
+maximum.
+"""
+
+import os
+import time
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class StorageProbe(object):
+    """
+    classdocs
+    """
+
+    __INITIAL_BACKOFF =     1.0                         # seconds
+    __MAX_BACKOFF =         300.0                       # seconds
+
+    __PROBE_FILENAME =      ".probe"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, root_path, clock=time.monotonic):
+        """
+        Constructor
+        """
+        self.__host = host                              # Host
+        self.__root_path = root_path                    # string
+        self.__clock = clock                            # callable: -> float seconds
+
+        self.__failures = 0                             # int
+        self.__next_probe = None                        # float seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def fail(self):
+        self.__failures += 1
+        self.__next_probe = self.__clock() + self.backoff
+
+
+    def reset(self):
+        self.__failures = 0
+        self.__next_probe = None
+
+
+    def is_due(self):
+        return self.__next_probe is None or self.__clock() >= self.__next_probe
+
+
+    def probe(self):
+        path = os.path.join(self.__root_path, self.__PROBE_FILENAME)
+
+        try:
+            self.__host.disk_usage(self.__root_path)
+
+            with open(path, "w") as f:
+                f.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.remove(path)
+
+            return True
+
+        except OSError:
+            return False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def failures(self):
+        return self.__failures
+
+
+    @property
+    def backoff(self):
+        if self.__failures < 1:
+            return 0.0
+
+        return min(self.__INITIAL_BACKOFF * 2 ** (self.__failures - 1), self.__MAX_BACKOFF)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "StorageProbe:{root_path:%s, failures:%s, backoff:%s}" % (self.__root_path, self.failures, self.backoff)
@@ -0,0 +1,300 @@
+"""
+Created on 4 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A write-behind front end for an ArchiveLogger, so that storage stalls are never passed back to the caller.
+
+Documents are placed in a bounded in-memory queue, and a writer thread commits them in groups: a batch is complete
+when it holds the batch size in rows, or - if a batch period is given - when the period has elapsed since its first
+row. With no batch period, the writer takes whatever has been queued while the previous batch was being committed.
+Each batch is preceded by a retention pass, and is synced to storage (fsync) once it has been written - for a
+columnar log, the sync completes the pending block, so that every batch is on storage, not only in memory.
+
+If the queue is full, the oldest queued document is dropped, and counted. On close, the queue is drained and synced.
+
+The ArchiveLogger must be constructed in deferred mode.
+"""
+
+import sys
+import threading
+import time
+
+from collections import OrderedDict, deque
+
+from scs_core.data.json import JSONable
+
+from scs_dev.logger.log_retention import LogRetention
+from scs_dev.sync.schedule_metrics import TimingStats
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class WriteBehindLogger(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_BATCH_ROWS =    100
+    DEFAULT_CAPACITY =      10000                       # rows
+
+    __STOP_TIMEOUT =        30.0                        # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, logger, batch_rows=None, batch_period=None, capacity=None):
+        """
+        Constructor
+        """
+        self.__logger = logger                          # ArchiveLogger (deferred)
+
+        self.__batch_rows = self.DEFAULT_BATCH_ROWS if batch_rows is None else int(batch_rows)
+        self.__batch_period = batch_period or None      # float seconds
+        self.__capacity = self.DEFAULT_CAPACITY if capacity is None else int(capacity)
+
+        self.__retention = LogRetention(host, logger.log.root_path, logger.delete_oldest)
+        self.__stats = WriteBehindStats()
+
+        self.__queue = deque()
+        self.__running = False
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__running = True
+
+        self.__thread = threading.Thread(target=self.__run, name="WriteBehindLogger", daemon=True)
+        self.__thread.start()
+
+
+    def write(self, jstr):
+        with self.__condition:
+            if len(self.__queue) >= self.__capacity:
+                self.__queue.popleft()
+                self.__stats.drop()
+
+            self.__queue.append(jstr)
+            self.__stats.queued(len(self.__queue))
+
+            self.__condition.notify()
+
+
+    def close(self):
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+
+        if self.__thread:
+            self.__thread.join(self.__STOP_TIMEOUT)
+
+            if self.__thread.is_alive():
+                print("WriteBehindLogger: writer stalled: %d rows abandoned" % len(self.__queue), file=sys.stderr)
+                sys.stderr.flush()
+                return
+
+        self.__logger.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            batch = self.__next_batch()
+
+            if batch:
+                self.__commit(batch)
+
+            if not self.__running and not self.__queue:
+                break
+
+
+    def __next_batch(self):
+        with self.__condition:
+            # wait for the first row...
+            while self.__running and not self.__queue:
+                self.__condition.wait()
+
+            # wait for the batch to fill...
+            if self.__batch_period:
+                deadline = time.monotonic() + self.__batch_period
+
+                while self.__running and len(self.__queue) < self.__batch_rows:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        break
+
+                    self.__condition.wait(remaining)
+
+            return self.__take()
+
+
+    def __take(self):
+        with self.__condition:
+            count = min(len(self.__queue), self.__batch_rows) if self.__running else len(self.__queue)
+
+            return [self.__queue.popleft() for _ in range(count)]
+
+
+    def __commit(self, batch):
+        if not batch or self.__logger.writing_inhibited:
+            return
+
+        start_time = time.monotonic()
+
+        try:
+            if not self.__retention.clear_space([self.__logger.active_path] if self.__logger.active_path else []):
+                self.__logger.writing_inhibited = True
+                return
+
+            for jstr in batch:
+                self.__logger.write(jstr)
+
+            self.__logger.sync()
+
+        finally:
+            self.__stats.update(len(batch), time.monotonic() - start_time)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def logger(self):
+        return self.__logger
+
+
+    @property
+    def stats(self):
+        return self.__stats
+
+
+    @property
+    def writing_inhibited(self):
+        return self.__logger.writing_inhibited
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "WriteBehindLogger:{logger:%s, batch_rows:%s, batch_period:%s, capacity:%s, stats:%s}" % \
+               (self.logger, self.__batch_rows, self.__batch_period, self.__capacity, self.stats)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class WriteBehindStats(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__start_time = time.monotonic()            # float seconds
+
+        self.__rows = 0                                 # int
+        self.__batches = 0                              # int
+        self.__high_water = 0                           # int               greatest queue length
+        self.__stall = 0.0                              # float seconds     total time spent committing
+
+        self.__batch_size = TimingStats()               # TimingStats       rows
+        self.__batch_time = TimingStats()               # TimingStats       seconds
+
+        self.__dropped = 0                              # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def update(self, rows, duration):
+        self.__rows += rows
+        self.__batches += 1
+        self.__stall += duration
+
+        self.__batch_size.update(rows)
+        self.__batch_time.update(duration)
+
+
+    def drop(self):
+        self.__dropped += 1
+
+
+    def queued(self, length):
+        self.__high_water = max(self.__high_water, length)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['rows'] = self.rows
+        jdict['rate'] = round(self.rate, 3)
+        jdict['batches'] = self.batches
+        jdict['dropped'] = self.dropped
+        jdict['high-water'] = self.high_water
+        jdict['stall'] = round(self.stall, 3)
+
+        jdict['batch-size'] = self.batch_size
+        jdict['batch-time'] = self.batch_time
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def rows(self):
+        return self.__rows
+
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.__start_time
+
+        return 0.0 if elapsed <= 0 else self.__rows / elapsed
+
+
+    @property
+    def batches(self):
+        return self.__batches
+
+
+    @property
+    def dropped(self):
+        return self.__dropped
+
+
+    @property
+    def high_water(self):
+        return self.__high_water
+
+
+    @property
+    def stall(self):
+        return self.__stall
+
+
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+
+    @property
+    def batch_time(self):
+        return self.__batch_time
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "WriteBehindStats:{rows:%s, rate:%0.3f, batches:%s, dropped:%s, high_water:%s, stall:%0.3f, " \
+               "batch_size:%s, batch_time:%s}" % \
+               (self.rows, self.rate, self.batches, self.dropped, self.high_water, self.stall,
+                self.batch_size, self.batch_time)
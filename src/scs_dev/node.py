@@ -10,28 +10,45 @@ The node utility is used to extract a node from within a JSON document. Data is
 stdin, and the extracted node is passed to stdout. The extracted node may be a leaf node or an internal node. If no
 node path is specified, the whole input document is passed to stdout.
 
-The node utility may be set to either ignore documents that do not contain the specified node, or to terminate if the
+If several paths are specified, or a path contains a wildcard, each input document is projected onto the given paths:
+the output document holds the selected nodes at their original paths. A path node of '*' matches every member of an
+object or array, for example val.*.cnc. The paths are compiled once, and each document is traversed only along the
+requested paths, in a single pass.
+
+The node utility may be set to either ignore documents that do not contain the specified nodes, or to terminate if a
 node is not present.
 
 SYNOPSIS
-node.py [-i] [-v] [PATH]
+node.py [-i] [-v] [PATH ...]
 
 EXAMPLES
 ./gases_sampler.py -i10 | ./node.py val
 
+./gases_sampler.py -i10 | ./node.py -i rec "val.*.cnc"
+
 DOCUMENT EXAMPLE - INPUT
 {"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:27.641+00:00", "val": {"hmd": 59.6, "tmp": 23.8}}
 
 DOCUMENT EXAMPLE - OUTPUT
 {"hmd": 59.6, "tmp": 23.8}
+
+DOCUMENT EXAMPLE - OUTPUT (PATHS rec val.tmp)
+{"rec": "2018-04-04T14:50:27.641+00:00", "val": {"tmp": 23.8}}
+
+SEE ALSO
+scs_dev/csv_reader
+scs_dev/csv_writer
 """
 
+import json
 import sys
 
+from collections import OrderedDict
+
 from scs_core.data.json import JSONify
-from scs_core.data.path_dict import PathDict
 
 from scs_dev.cmd.cmd_node import CmdNode
+from scs_dev.data.node_projection import NodeProjection
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -49,16 +66,40 @@ if __name__ == '__main__':
 
 
     try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        projection = NodeProjection.construct(cmd.paths) if cmd.paths else None
+
+        if cmd.verbose and projection:
+            print("node: %s" % projection, file=sys.stderr)
+            sys.stderr.flush()
+
+
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
         for line in sys.stdin:
-            datum = PathDict.construct_from_jstr(line)
-
-            if cmd.ignore and not datum.has_path(cmd.path):
+            try:
+                jdict = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError:
                 continue
 
-            node = datum.node(cmd.path)
+            if projection is None:
+                node = jdict
+
+            elif projection.is_single:
+                node = projection.node(jdict)
+
+            else:
+                node = projection.project(jdict)
+
+            if node is None and projection is not None and projection.missing is not None:
+                if cmd.ignore:
+                    continue
+
+                print("node: node not present: %s" % projection.missing, file=sys.stderr)
+                exit(1)
 
             print(JSONify.dumps(node))
             sys.stdout.flush()
@@ -15,19 +15,33 @@ Likewise, documents gained from subscription are written to stdout, or a specifi
 Subscriptions can be specified either by a project channel name, or by an explicit messaging topic path. Documents
 gained by subscription may be delivered either to stdout, or to a specified Unix domain socket.
 
+Each subscription has its own long-lived delivery channel, with a bounded buffer. Received documents are serialised
+once, and passed to the channel without waiting for the receiver, so a slow or absent receiver does not hold up the
+MQTT client. If the receiver is not available, delivery is retried with back-off. If the buffer is full, the oldest
+undelivered document is dropped. In verbose mode, delivered and dropped counts are reported on exit.
+
 The osio_mqtt_client utility requires both the OpenSensors.io API key and client authorisation to operate.
 
 On some system configurations, the success or failure of each message send attempt can be signalled to a two-colour LED.
 
+If a spool directory is specified, documents are written to a durable, segmented on-disk spool as soon as they are
+received, and are published from the spool by a background publisher. Documents are removed from the spool only when
+their publication has succeeded, so a broker or network outage results in a backlog on disk, rather than back-pressure
+on the processes supplying data. The spool survives a restart of the client, and its size is capped - when the cap is
+reached, the oldest documents are discarded.
+
 Only one MQTT client should run at any one time, per TCP/IP host.
 
 SYNOPSIS
 osio_mqtt_client.py [-p UDS_PUB] [-s] { -c { C | G | P | S | X } (UDS_SUB_1) | [SUB_TOPIC_1 (UDS_SUB_1) ..
-SUB_TOPIC_N (UDS_SUB_N)] } [-e] [-l LED_UDS] [-v]
+SUB_TOPIC_N (UDS_SUB_N)] } [-w SPOOL_DIR] [-e] [-l LED_UDS] [-v]
 
 EXAMPLES
 ( cat < ~/SCS/pipes/mqtt_publication_pipe & ) | ./osio_mqtt_client.py -v -cX  > ./control_subscription_pipe
 
+( cat < ~/SCS/pipes/mqtt_publication_pipe & ) | ./osio_mqtt_client.py -v -w ~/SCS/spool/osio -cX \
+> ./control_subscription_pipe
+
 FILES
 ~/SCS/aws/osio_api_auth.json
 ~/SCS/aws/osio_client_auth.json
@@ -65,6 +79,9 @@ from scs_core.sys.exception_report import ExceptionReport
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_mqtt_client import CmdMQTTClient
+from scs_dev.comms.delivery_channel import DeliveryChannel
+from scs_dev.publisher.publication_spool import PublicationSpool
+from scs_dev.publisher.spool_publisher import SpoolPublisher
 from scs_dev.reporter.mqtt_reporter import MQTTReporter
 
 from scs_host.client.http_client import HTTPClient
@@ -86,40 +103,44 @@ class OSIOMQTTHandler(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, mqtt_reporter, comms=None, echo=False):
+    def __init__(self, mqtt_reporter, channel, echo=False):
         """
         Constructor
         """
-        self.__reporter = mqtt_reporter
-        self.__comms = comms
-        self.__echo = echo
+        self.__reporter = mqtt_reporter                 # MQTTReporter
+        self.__channel = channel                        # DeliveryChannel
+        self.__echo = echo                              # bool
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def handle(self, pub):
-        try:
-            self.__comms.connect()
-            self.__comms.write(JSONify.dumps(pub), False)
-
-        except ConnectionRefusedError:
-            self.__reporter.print("connection refused for %s" % self.__comms.address)
+        jstr = JSONify.dumps(pub)
 
-        finally:
-            self.__comms.close()
+        self.__channel.deliver(jstr)
 
         if self.__echo:
-            print(JSONify.dumps(pub))
+            print(jstr)
             sys.stdout.flush()
 
-        self.__reporter.print("received: %s" % JSONify.dumps(pub))
+        self.__reporter.print("received: %s" % jstr)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        self.__channel.open()
+
+
+    def close(self):
+        self.__channel.close()
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return "OSIOMQTTHandler:{reporter:%s, comms:%s, echo:%s}" % \
-               (self.__reporter, self.__comms, self.__echo)
+        return "OSIOMQTTHandler:{reporter:%s, channel:%s, echo:%s}" % \
+               (self.__reporter, self.__channel, self.__echo)
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -127,7 +148,10 @@ class OSIOMQTTHandler(object):
 if __name__ == '__main__':
 
     client = None
+    handlers = []
     pub_comms = None
+    spool = None
+    spool_publisher = None
     reporter = None
 
 
@@ -140,6 +164,10 @@ if __name__ == '__main__':
         cmd.print_help(sys.stderr)
         exit(2)
 
+    if cmd.queue_length is not None:
+        print("osio_mqtt_client: publication queue not supported.", file=sys.stderr)
+        exit(2)
+
     if cmd.verbose:
         print("osio_mqtt_client: %s" % cmd, file=sys.stderr)
 
@@ -222,8 +250,9 @@ if __name__ == '__main__':
             # handler...
             sub_comms = DomainSocket(cmd.channel_uds) if cmd.channel_uds else StdIO()
 
-            handler = OSIOMQTTHandler(reporter, sub_comms, cmd.echo)
+            handler = OSIOMQTTHandler(reporter, DeliveryChannel(sub_comms, bool(cmd.channel_uds)), cmd.echo)
 
+            handlers.append(handler)
             subscribers.append(MQTTSubscriber(topic, handler.handle))
 
         else:
@@ -231,11 +260,12 @@ if __name__ == '__main__':
                 sub_comms = DomainSocket(subscription.address) if subscription.address else StdIO()
 
                 # handler...
-                handler = OSIOMQTTHandler(reporter, sub_comms, cmd.echo)
+                handler = OSIOMQTTHandler(reporter, DeliveryChannel(sub_comms, bool(subscription.address)), cmd.echo)
 
                 if cmd.verbose:
                     print("osio_mqtt_client: %s" % handler, file=sys.stderr)
 
+                handlers.append(handler)
                 subscribers.append(MQTTSubscriber(subscription.topic, handler.handle))
 
         # client...
@@ -244,6 +274,17 @@ if __name__ == '__main__':
         if cmd.verbose:
             print("osio_mqtt_client: %s" % client, file=sys.stderr)
 
+        # spool...
+        if cmd.spool is not None:
+            spool = PublicationSpool(cmd.spool)
+            spool.open()
+
+            spool_publisher = SpoolPublisher(lambda pub: client.publish(pub, ClientAuth.MQTT_TIMEOUT), reporter, spool,
+                                             random.uniform(1.0, 2.0))
+
+            if cmd.verbose:
+                print("osio_mqtt_client: %s" % spool_publisher, file=sys.stderr)
+
         if cmd.verbose:
             sys.stderr.flush()
 
@@ -253,12 +294,18 @@ if __name__ == '__main__':
 
         reporter.set_led("A")
 
+        for handler in handlers:
+            handler.open()
+
         pub_comms.connect()
 
         if not conf.inhibit_publishing:
             client.connect(ClientAuth.MQTT_HOST, client_auth.client_id, client_auth.user_id,
                            client_auth.client_password)
 
+            if spool_publisher:
+                spool_publisher.start()
+
         for message in pub_comms.read():
             # receive...
             try:
@@ -274,6 +321,11 @@ if __name__ == '__main__':
             if conf.inhibit_publishing:
                 continue
 
+            # spool...
+            if spool:
+                spool.append(message)
+                continue
+
             # publish...
             success = False
 
@@ -309,9 +361,24 @@ if __name__ == '__main__':
             print("osio_mqtt_client: KeyboardInterrupt", file=sys.stderr)
 
     finally:
+        if spool_publisher:
+            spool_publisher.stop()
+
+        if spool:
+            spool.close()
+
+            if cmd.verbose:
+                print("osio_mqtt_client: %s" % spool.report, file=sys.stderr)
+
         if client:
             client.disconnect()
 
+        for handler in handlers:
+            handler.close()
+
+            if cmd.verbose:
+                print("osio_mqtt_client: %s" % handler, file=sys.stderr)
+
         if pub_comms:
             pub_comms.close()
 
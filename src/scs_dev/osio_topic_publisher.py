@@ -16,12 +16,20 @@ name is used, the osio_topic_publisher utility requires the system ID and AWS pr
 In addition to specifying the channel, the osio_topic_publisher utility can instruct the OpenSensors.io server
 to override the message reception timestamp.
 
+In passthrough mode, each input line is wrapped in the topic envelope as it stands, rather than being parsed and
+serialised again. Documents are validated as JSON at a sampling rate, set with the --sample flag: a document that is
+not sampled is only checked to be a JSON object. Where the reception timestamp is overridden, the rec field is found
+by a scan of the line, which is only parsed if the scan fails. Passthrough mode is suited to input from trusted scs_dev
+utilities.
+
 SYNOPSIS
-osio_topic_publisher.py { -t TOPIC | -c { C | G | P | S | X } } [-o] [-v]
+osio_topic_publisher.py { -t TOPIC | -c { C | G | P | S | X } } [-o] [-p [-s PERIOD]] [-v]
 
 EXAMPLES
 ./control_receiver.py -r -v | ./osio_topic_publisher.py -v -cX > ~/SCS/pipes/mqtt_publication_pipe
 
+./gases_sampler.py -i10 | ./osio_topic_publisher.py -cG -o -p > ~/SCS/pipes/mqtt_publication_pipe
+
 FILES
 ~/SCS/osio/osio_project.json
 ~/SCS/conf/system_id.json
@@ -65,6 +73,7 @@ from scs_core.osio.config.project import Project
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_osio_topic_publisher import CmdOSIOTopicPublisher
+from scs_dev.data.publication_envelope import PublicationEnvelope
 
 from scs_host.sys.host import Host
 
@@ -84,6 +93,8 @@ if __name__ == '__main__':
     if cmd.verbose:
         print("osio_topic_publisher: %s" % cmd, file=sys.stderr)
 
+    envelope = None
+
     try:
         # ------------------------------------------------------------------------------------------------------------
         # resources...
@@ -118,11 +129,26 @@ if __name__ == '__main__':
             print("osio_topic_publisher: %s" % topic, file=sys.stderr)
             sys.stderr.flush()
 
+        # PublicationEnvelope...
+        envelope = PublicationEnvelope(topic, cmd.override, cmd.sample) if cmd.passthrough else None
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
 
         for line in sys.stdin:
+            # passthrough...
+            if envelope:
+                publication = envelope.wrap(line)
+
+                if publication is None:
+                    continue
+
+                print(publication)
+                sys.stdout.flush()
+                continue
+
+            # parsed...
             try:
                 jdict = json.loads(line, object_pairs_hook=OrderedDict)
             except ValueError:
@@ -147,3 +173,7 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         if cmd.verbose:
             print("osio_topic_publisher: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if cmd.verbose and envelope:
+            print("osio_topic_publisher: %s" % envelope, file=sys.stderr)
@@ -14,14 +14,23 @@ osio_mqtt_client may be subscribing to multiple topics. The osio_topic_subscribe
 topic. It expects a JSON document of the form provided by osio_mqtt_client. It acts by returning the value of the field
 whose field name matches the topic name.
 
+Alternatively, the osio_topic_subscriber can route any number of topics, each to its own output, within a single
+process. Each route is given as a project channel name or a topic path, together with an output: stdout ('-'), a file or
+named pipe, or a Unix domain socket. Topic paths - for a route, or for the --topic flag - may have the MQTT wildcards
+'+' and '#'. The topic of each input document is read before the document is parsed, and documents that are not routed
+are rejected without being parsed.
+
 Messaging topics can be specified either by a project channel name, or by an explicit topic path.
 
 SYNOPSIS
-osio_topic_subscriber.py { -t TOPIC | -c { C | G | P | S | X } } [-v]
+osio_topic_subscriber.py { -t TOPIC | -c { C | G | P | S | X } | { C | G | P | S | X | TOPIC }=OUTPUT [...] } [-v]
 
 EXAMPLES
 ( cat ~/SCS/pipes/control_subscription_pipe & ) | ./osio_topic_subscriber.py -cX | ./control_receiver.py -r -v
 
+( cat ~/SCS/pipes/subscription_pipe & ) | ./osio_topic_subscriber.py X=~/SCS/pipes/control_pipe \
+"south-coast-science-dev/production-test/loc/+/gases=-"
+
 FILES
 ~/SCS/osio/osio_project.json
 ~/SCS/conf/system_id.json
@@ -49,19 +58,14 @@ scs_mfr/osio_project
 scs_mfr/system_id
 """
 
-import json
 import sys
 
-from collections import OrderedDict
-
-from scs_core.data.json import JSONify
-from scs_core.data.publication import Publication
-
 from scs_core.osio.config.project import Project
 
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_osio_topic_subscriber import CmdOSIOTopicSubscriber
+from scs_dev.comms.topic_dispatcher import TopicDispatcher
 
 from scs_host.sys.host import Host
 
@@ -81,12 +85,16 @@ if __name__ == '__main__':
     if cmd.verbose:
         print("osio_topic_subscriber: %s" % cmd, file=sys.stderr)
 
+    dispatcher = None
+
     try:
         # ------------------------------------------------------------------------------------------------------------
         # resources...
 
-        # topic...
-        if cmd.channel:
+        # routes...
+        routes = cmd.routes if cmd.routes else [(cmd.channel or cmd.topic, TopicDispatcher.STDOUT)]
+
+        if any(Project.is_valid_channel(channel) for channel, _ in routes):
             # SystemID...
             system_id = SystemID.load(Host)
 
@@ -104,15 +112,14 @@ if __name__ == '__main__':
                 print("osio_topic_subscriber: Project not available.", file=sys.stderr)
                 exit(1)
 
-            topic = project.channel_path(cmd.channel, system_id)
+            routes = [(project.channel_path(channel, system_id) if Project.is_valid_channel(channel) else channel,
+                       output) for channel, output in routes]
 
-        else:
-            topic = cmd.topic
-
-        # TODO: check if topic exists?
+        # TopicDispatcher...
+        dispatcher = TopicDispatcher(routes)
 
         if cmd.verbose:
-            print("osio_topic_subscriber: %s" % topic, file=sys.stderr)
+            print("osio_topic_subscriber: %s" % dispatcher, file=sys.stderr)
             sys.stderr.flush()
 
 
@@ -120,16 +127,7 @@ if __name__ == '__main__':
         # run...
 
         for line in sys.stdin:
-            try:
-                jdict = json.loads(line, object_pairs_hook=OrderedDict)
-            except ValueError:
-                continue
-
-            publication = Publication.construct_from_jdict(jdict)
-
-            if publication.topic == topic:
-                print(JSONify.dumps(publication.payload))
-                sys.stdout.flush()
+            dispatcher.dispatch(line)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -138,3 +136,10 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         if cmd.verbose:
             print("osio_topic_subscriber: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        if dispatcher:
+            dispatcher.close()
+
+            if cmd.verbose:
+                print("osio_topic_subscriber: %s" % dispatcher, file=sys.stderr)
@@ -69,7 +69,6 @@ https://en.wikipedia.org/wiki/ISO_8601
 import sys
 import time
 
-from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sync.schedule import Schedule
@@ -79,6 +78,7 @@ from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_sampler import CmdSampler
 from scs_dev.sampler.particulates_sampler import ParticulatesSampler
+from scs_dev.sampler.sample_encoder import SampleEncoder
 
 from scs_dfe.particulate.opc_conf import OPCConf
 
@@ -155,6 +155,9 @@ if __name__ == '__main__':
 
                 time.sleep(1.0)
 
+        # encoder...
+        encoder = SampleEncoder()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
@@ -174,7 +177,7 @@ if __name__ == '__main__':
                 print("%s: particulates: %s" % (now.as_time(), sample.rec.as_time()), file=sys.stderr)
                 sys.stderr.flush()
 
-            print(JSONify.dumps(sample))
+            print(encoder.encode(sample))
             sys.stdout.flush()
 
 
@@ -51,7 +51,6 @@ import sys
 
 from scs_core.climate.mpl115a2_calib import MPL115A2Calib
 
-from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sync.timed_runner import TimedRunner
@@ -60,6 +59,7 @@ from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_sampler import CmdSampler
 from scs_dev.sampler.pressure_sampler import PressureSampler
+from scs_dev.sampler.sample_encoder import SampleEncoder
 
 from scs_dfe.climate.mpl115a2_conf import MPL115A2Conf
 from scs_dfe.climate.mpl115a2 import MPL115A2
@@ -123,6 +123,9 @@ if __name__ == '__main__':
             print("pressure_sampler: %s" % sampler, file=sys.stderr)
             sys.stderr.flush()
 
+        # encoder...
+        encoder = SampleEncoder()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
@@ -135,7 +138,7 @@ if __name__ == '__main__':
                 print("%s:     pressure: %s" % (now.as_time(), sample.rec.as_time()), file=sys.stderr)
                 sys.stderr.flush()
 
-            print(JSONify.dumps(sample))
+            print(encoder.encode(sample))
             sys.stdout.flush()
 
 
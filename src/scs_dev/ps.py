@@ -6,53 +6,98 @@ Created on 13 Jun 2017
 @author: Bruno Beloff (bruno.beloff@southcoastscience.com)
 
 DESCRIPTION
-The ps utility is used to run the Unix ps (process snapshot) command. The utility present the output of the ps command
-as a JSON document, making it suitable for analysis by a remote device management system.
+The ps utility reports the South Coast Science processes running on the host - those whose command line includes the
+SCS path - in the manner of the Unix ps (process snapshot) command. Each process is reported as a JSON document,
+making it suitable for analysis by a remote device management system. The report is built directly from /proc,
+rather than by running the ps command.
+
+By default, the ps utility reports once, giving CPU usage as a percentage over the life of each process, as for the
+ps command. If an interval is specified, the utility reports at that interval, giving CPU usage as a percentage over
+the time since the previous report. This provides a cheap way of monitoring process health.
 
 The ps utility is normally included in the commands accepted by the control_receiver utility.
 
 SYNOPSIS
-ps.py
+ps.py [-i INTERVAL [-n SAMPLES]] [-v]
 
 EXAMPLES
 ./ps.py
+./ps.py -i 60
+
+FILES
+/proc/PID/cmdline
+/proc/PID/stat
+/proc/meminfo
+/proc/uptime
 
 DOCUMENT EXAMPLE - OUTPUT
-{"ppid": 1069, "pid": 1071, "uid": 1000, "tty": "?", "pcpu": 0.9, "pmem": 0.0, "cpu": "00-00:00:03.000",
-"elapsed": "00-02:50:12.000", "cmd": "python3 /home/pi/SCS/scs_dev/src/scs_dev/osio_topic_publisher.py -v -cG"}
+{"ppid": 1069, "pid": 1071, "uid": 1000, "tty": "?", "pcpu": 0.9, "pmem": 0.0, "cpu": "00-00:00:03",
+"elapsed": "00-02:50:12", "cmd": "python3 /home/pi/SCS/scs_dev/src/scs_dev/osio_topic_publisher.py -v -cG"}
 
 SEE ALSO
 scs_dev/control_receiver
 scs_dev/uptime
 """
 
-import subprocess
+import sys
 
 from scs_core.data.json import JSONify
 
-from scs_core.sys.ps_datum import PsDatum
+from scs_dev.cmd.cmd_ps import CmdPs
+from scs_dev.sync.monotonic_timer import MonotonicTimer
+from scs_dev.sys.proc_scanner import ProcScanner
 
 
 # --------------------------------------------------------------------------------------------------------------------
 
 if __name__ == '__main__':
 
-    p1 = subprocess.Popen(['ps', '-Ao', 'ppid,pid,uid,tty,pmem,pcpu,cputime,etime,args'],
-                          stdout=subprocess.PIPE)
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdPs()
+
+    if not cmd.is_valid():
+        cmd.print_help(sys.stderr)
+        exit(2)
+
+    if cmd.verbose:
+        print("ps: %s" % cmd, file=sys.stderr)
+
+    try:
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        scanner = ProcScanner("SCS", cmd.interval is not None)
+
+        if cmd.verbose:
+            print("ps: %s" % scanner, file=sys.stderr)
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        timer = None if cmd.interval is None else MonotonicTimer(cmd.interval)
+        reports = 0
+
+        while True:
+            for datum in scanner.scan():
+                print(JSONify.dumps(datum))
+
+            sys.stdout.flush()
 
-    p2 = subprocess.Popen(['grep', 'SCS'], stdin=p1.stdout, stdout=subprocess.PIPE)
-    p1.stdout.close()       # Allow p1 to receive a SIGPIPE if p2 exits.
+            reports += 1
 
-    raw = p2.communicate()[0]
-    report = raw.decode()
+            if timer is None or (cmd.samples is not None and reports >= cmd.samples):
+                break
 
-    for line in [line.strip() for line in report.split('\n')]:
-        if len(line) == 0:
-            continue
+            timer.wait()
 
-        datum = PsDatum.construct_from_report(line)
 
-        if datum is None or 'ps.py' in datum.cmd or 'grep' in datum.cmd:
-            continue
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
 
-        print(JSONify.dumps(datum))
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("ps: KeyboardInterrupt", file=sys.stderr)
@@ -0,0 +1,327 @@
+"""
+Created on 16 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A bounded, in-memory outbound queue for MQTT publications.
+
+Publications are drained by a fixed number of worker threads, each of which may have one QoS 1 publication awaiting
+its PUBACK - a publication that stalls therefore blocks only its own worker. Where a drain rate is specified, releases
+from the queue are spaced at fixed intervals, whatever the number of workers.
+
+When the queue is full, the oldest publication is dropped. When the in-flight limit is greater than one, publications
+may be delivered out of order.
+
+When the queue is stopped, it accepts no further publications, and the workers drain the publications already queued,
+retrying as necessary, until the queue is empty or the stop timeout has expired. Publications that have not been
+published by then - whether queued or in flight - are abandoned, and are reported as dropped.
+"""
+
+import threading
+import time
+
+from collections import OrderedDict, deque
+
+from scs_core.data.json import JSONable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationQueue(object):
+    """
+    classdocs
+    """
+
+    __RETRY_INTERVAL =      2.0                 # seconds
+    __STOP_TIMEOUT =        10.0                # seconds, to drain the queue
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, publish, reporter, max_length, in_flight=1, rate=None):
+        """
+        Constructor
+        """
+        self.__publish = publish                                        # callable: Publication -> bool
+        self.__reporter = reporter                                      # MQTTReporter
+        self.__max_length = int(max_length)                             # int
+        self.__in_flight = int(in_flight)                               # int
+        self.__rate = rate                                              # float publications per second
+
+        self.__queue = deque()                                          # deque of Publication
+        self.__condition = threading.Condition()
+        self.__release_lock = threading.Lock()
+        self.__reporter_lock = threading.Lock()
+
+        self.__next_release = None                                      # monotonic time
+        self.__workers = []                                             # list of Thread
+        self.__running = False                                          # bool
+        self.__stopped = False                                          # bool
+        self.__deadline = None                                          # monotonic time, for the drain
+        self.__active = 0                                               # int publications being published
+        self.__abandoned = False                                        # bool
+
+        self.__report = PublicationQueueReport()                        # PublicationQueueReport
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        if self.__running:
+            return
+
+        self.__running = True
+        self.__stopped = False
+        self.__deadline = None
+        self.__abandoned = False
+
+        for i in range(self.__in_flight):
+            worker = threading.Thread(target=self.__run, name="PublicationQueue-%d" % i, daemon=True)
+            worker.start()
+
+            self.__workers.append(worker)
+
+
+    def stop(self):
+        with self.__condition:
+            self.__running = False
+            self.__stopped = True
+            self.__deadline = time.monotonic() + self.__STOP_TIMEOUT
+            self.__condition.notify_all()
+
+        # drain...
+        for worker in self.__workers:
+            worker.join(max(0.0, self.__deadline - time.monotonic()))
+
+        self.__workers = []
+
+        # abandon...
+        with self.__condition:
+            self.__report.add_dropped(len(self.__queue) + self.__active)
+
+            self.__queue.clear()
+            self.__report.update_depth(0)
+
+            self.__abandoned = True                                     # workers still publishing are not counted
+
+
+    def put(self, publication):
+        with self.__condition:
+            if self.__stopped:
+                self.__report.add_dropped(1)
+                return
+
+            if len(self.__queue) >= self.__max_length:
+                self.__queue.popleft()
+                self.__report.add_dropped(1)
+
+            self.__queue.append(publication)
+            self.__report.update_depth(len(self.__queue))
+
+            self.__condition.notify()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while True:
+            # get...
+            with self.__condition:
+                while self.__running and not self.__queue:
+                    self.__condition.wait()
+
+                if not self.__queue or self.__expired():                # stopped, and drained or timed out
+                    return
+
+                publication = self.__queue.popleft()
+                self.__report.update_depth(len(self.__queue))
+
+                self.__active += 1
+
+            # drain rate...
+            self.__wait_for_release()
+
+            # publish...
+            published = self.__deliver(publication)
+
+            with self.__condition:
+                self.__active -= 1
+
+                if not published and not self.__abandoned:
+                    self.__report.add_dropped(1)
+
+
+    def __deliver(self, publication):
+        start_time = time.time()
+
+        while True:
+            try:
+                success = self.__publish(publication)
+
+                if success:
+                    with self.__condition:
+                        if not self.__abandoned:                        # otherwise, already reported as dropped
+                            self.__report.update_latency(time.time() - start_time)
+
+                    self.__set_status("done", "G")
+                    return True
+
+                self.__set_status("failed", "R")
+
+            except TimeoutError:
+                self.__set_status("timeout", "R")
+
+            self.__report.add_retry()
+
+            if self.__expired():
+                return False
+
+            time.sleep(self.__RETRY_INTERVAL)                       # wait for auto-reconnect
+
+
+    def __expired(self):
+        return self.__deadline is not None and time.monotonic() >= self.__deadline
+
+
+    def __wait_for_release(self):
+        if not self.__rate:
+            return
+
+        with self.__release_lock:
+            now = time.monotonic()
+
+            release = now if self.__next_release is None else max(now, self.__next_release)
+            self.__next_release = release + 1.0 / self.__rate
+
+        time.sleep(release - now)
+
+
+    def __set_status(self, status, colour):
+        with self.__reporter_lock:
+            self.__reporter.print("%s: %s" % (status, self.__report.summary()))
+            self.__reporter.set_led(colour)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def report(self):
+        return self.__report
+
+
+    @property
+    def length(self):
+        return len(self.__queue)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationQueue:{max_length:%s, in_flight:%s, rate:%s, length:%s, running:%s}" % \
+               (self.__max_length, self.__in_flight, self.__rate, self.length, self.__running)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationQueueReport(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__lock = threading.Lock()
+
+        self.depth = 0                          # int       current queue length
+        self.max_depth = 0                      # int       greatest queue length
+        self.published = 0                      # int       successful publications
+        self.retries = 0                        # int       failed or timed-out publication attempts
+        self.dropped = 0                        # int       publications evicted from a full queue, or abandoned
+
+        self.__latency = None                   # float     seconds, latest publication
+        self.__max_latency = None               # float     seconds
+        self.__total_latency = 0.0              # float     seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def update_depth(self, depth):
+        self.depth = depth
+        self.max_depth = max(self.max_depth, depth)
+
+
+    def add_retry(self):
+        with self.__lock:
+            self.retries += 1
+
+
+    def add_dropped(self, count):
+        with self.__lock:
+            self.dropped += count
+
+
+    def update_latency(self, latency):
+        with self.__lock:
+            self.published += 1
+
+            self.__latency = latency
+            self.__max_latency = latency if self.__max_latency is None else max(self.__max_latency, latency)
+            self.__total_latency += latency
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def summary(self):
+        latency = 0.0 if self.latency is None else self.latency
+
+        return "depth:%d published:%d retries:%d dropped:%d latency:%0.3f" % \
+               (self.depth, self.published, self.retries, self.dropped, latency)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['depth'] = self.depth
+        jdict['max-depth'] = self.max_depth
+        jdict['published'] = self.published
+        jdict['retries'] = self.retries
+        jdict['dropped'] = self.dropped
+
+        jdict['latency'] = OrderedDict()
+        jdict['latency']['last'] = None if self.latency is None else round(self.latency, 3)
+        jdict['latency']['avg'] = None if self.avg_latency is None else round(self.avg_latency, 3)
+        jdict['latency']['max'] = None if self.max_latency is None else round(self.max_latency, 3)
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def latency(self):
+        return self.__latency
+
+
+    @property
+    def avg_latency(self):
+        return None if self.published == 0 else self.__total_latency / self.published
+
+
+    @property
+    def max_latency(self):
+        return self.__max_latency
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationQueueReport:{depth:%s, max_depth:%s, published:%s, retries:%s, dropped:%s, " \
+               "latency:%s, avg_latency:%s, max_latency:%s}" % \
+               (self.depth, self.max_depth, self.published, self.retries, self.dropped,
+                self.latency, self.avg_latency, self.max_latency)
@@ -0,0 +1,408 @@
+"""
+Created on 19 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A durable, segmented, append-only spool (write-ahead log) for documents awaiting publication.
+
+Documents are appended as lines to the current segment file. Segments are fsync'd in batches - after a given number of
+appends, or when a given time has elapsed at the next append - and are closed when they reach a given size.
+
+A single consumer reads documents from the acknowledged position, and acknowledges each document once it has been
+published. The acknowledged position is persisted periodically, so delivery after a restart is at-least-once. Fully
+acknowledged segments are deleted. If the total size of the spool exceeds its cap, the oldest segments are evicted,
+whether acknowledged or not.
+
+directory example:
+00000041.spool
+00000042.spool
+ack.json
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationSpool(object):
+    """
+    classdocs
+    """
+
+    __SEGMENT_SIZE =        1048576                 # bytes
+    __MAX_SIZE =            67108864                # bytes
+
+    __SYNC_COUNT =          20                      # appends
+    __SYNC_INTERVAL =       5.0                     # seconds
+
+    __ACK_COUNT =           20                      # acknowledgements
+
+    __ACK_FILENAME =        "ack.json"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def segment_name(number):
+        return "%08d.spool" % number
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, directory, max_size=None, segment_size=None):
+        """
+        Constructor
+        """
+        self.__directory = directory                                                    # string
+        self.__max_size = self.__MAX_SIZE if max_size is None else int(max_size)        # int bytes
+        self.__segment_size = self.__SEGMENT_SIZE if segment_size is None else int(segment_size)
+
+        self.__condition = threading.Condition()
+
+        self.__sizes = OrderedDict()                    # dict of segment number: int bytes
+
+        self.__write_file = None                        # file
+        self.__unsynced = 0                             # int
+        self.__latest_sync = None                       # time
+
+        self.__read_file = None                         # file
+        self.__read_segment = None                      # int
+        self.__read_offset = 0                          # int bytes
+        self.__unsaved_acks = 0                         # int
+
+        self.__report = PublicationSpoolReport()        # PublicationSpoolReport
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        with self.__condition:
+            os.makedirs(self.__directory, exist_ok=True)
+
+            # segments...
+            for name in sorted(os.listdir(self.__directory)):
+                match = re.match(r'^(\d{8})\.spool$', name)
+
+                if match:
+                    self.__sizes[int(match.group(1))] = os.path.getsize(os.path.join(self.__directory, name))
+
+            # acknowledged position...
+            self.__read_segment, self.__read_offset = self.__load_ack()
+
+            if self.__read_segment not in self.__sizes:
+                self.__read_segment = self.__first_segment()
+                self.__read_offset = 0
+
+            # write to a new segment, leaving any partial line behind...
+            self.__open_segment(self.__last_segment() + 1)
+
+            if self.__read_segment is None:
+                self.__read_segment = self.__last_segment()
+
+            self.__delete_before(self.__read_segment)
+
+
+    def close(self):
+        with self.__condition:
+            if self.__write_file:
+                self.__sync()
+                self.__write_file.close()
+                self.__write_file = None
+
+            if self.__read_file:
+                self.__read_file.close()
+                self.__read_file = None
+
+            self.__save_ack()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # producer...
+
+    def append(self, document):
+        line = (document.strip() + '\n').encode()
+
+        with self.__condition:
+            # rotate...
+            if self.__sizes[self.__last_segment()] >= self.__segment_size:
+                self.__sync()
+                self.__write_file.close()
+
+                self.__open_segment(self.__last_segment() + 1)
+
+            # write...
+            self.__write_file.write(line)
+            self.__write_file.flush()
+
+            self.__sizes[self.__last_segment()] += len(line)
+            self.__report.appended += 1
+
+            # sync...
+            self.__unsynced += 1
+
+            if self.__unsynced >= self.__SYNC_COUNT or time.time() - self.__latest_sync >= self.__SYNC_INTERVAL:
+                self.__sync()
+
+            # cap...
+            while self.size > self.__max_size and len(self.__sizes) > 1:
+                self.__evict()
+
+            self.__condition.notify_all()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # consumer...
+
+    def next(self):
+        with self.__condition:
+            while True:
+                if self.__read_file is None:
+                    self.__read_file = open(self.__segment_path(self.__read_segment), "rb")
+
+                self.__read_file.seek(self.__read_offset)           # the next document is re-read until ack'd
+                line = self.__read_file.readline()
+
+                # complete document...
+                if line.endswith(b'\n'):
+                    return line.decode().strip(), (self.__read_segment, self.__read_file.tell())
+
+                # end of the current segment...
+                if self.__read_segment == self.__last_segment():
+                    return None
+
+                # end of a closed segment...
+                self.__read_file.close()
+                self.__read_file = None
+
+                self.__read_segment = self.__next_segment(self.__read_segment)
+                self.__read_offset = 0
+
+                self.__delete_before(self.__read_segment)
+
+
+    def ack(self, position):
+        with self.__condition:
+            segment, offset = position
+
+            if segment != self.__read_segment:              # evicted while in flight
+                return
+
+            self.__read_offset = offset
+            self.__report.acknowledged += 1
+
+            self.__unsaved_acks += 1
+
+            if self.__unsaved_acks >= self.__ACK_COUNT:
+                self.__save_ack()
+
+
+    def wait(self, timeout=None):
+        with self.__condition:
+            self.__condition.wait(timeout)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __open_segment(self, number):
+        self.__sizes[number] = 0
+
+        self.__write_file = open(self.__segment_path(number), "ab")
+
+        self.__unsynced = 0
+        self.__latest_sync = time.time()
+
+
+    def __sync(self):
+        if self.__write_file is None or self.__unsynced == 0:
+            return
+
+        os.fsync(self.__write_file.fileno())
+
+        self.__unsynced = 0
+        self.__latest_sync = time.time()
+
+        self.__report.syncs += 1
+
+
+    def __evict(self):
+        oldest = self.__first_segment()
+
+        if oldest == self.__read_segment:
+            if self.__read_file:
+                self.__read_file.close()
+                self.__read_file = None
+
+            self.__read_segment = self.__next_segment(oldest)
+            self.__read_offset = 0
+
+        self.__delete(oldest)
+
+        self.__report.evicted += 1
+
+
+    def __delete_before(self, number):
+        for segment in [segment for segment in self.__sizes if segment < number]:
+            self.__delete(segment)
+
+
+    def __delete(self, number):
+        try:
+            os.remove(self.__segment_path(number))
+        except FileNotFoundError:
+            pass
+
+        del self.__sizes[number]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __load_ack(self):
+        try:
+            f = open(os.path.join(self.__directory, self.__ACK_FILENAME), "r")
+        except FileNotFoundError:
+            return None, 0
+
+        try:
+            jdict = json.loads(f.read())
+            return int(jdict['seg']), int(jdict['pos'])
+
+        except (ValueError, KeyError, TypeError):
+            return None, 0
+
+        finally:
+            f.close()
+
+
+    def __save_ack(self):
+        if self.__read_segment is None:
+            return
+
+        jdict = OrderedDict()
+        jdict['seg'] = self.__read_segment
+        jdict['pos'] = self.__read_offset
+
+        filename = os.path.join(self.__directory, self.__ACK_FILENAME)
+        tmp_filename = '.'.join((filename, 'tmp'))
+
+        f = open(tmp_filename, "w")
+        f.write(json.dumps(jdict) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+
+        # atomic operation...
+        os.rename(tmp_filename, filename)
+
+        self.__unsaved_acks = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __segment_path(self, number):
+        return os.path.join(self.__directory, self.segment_name(number))
+
+
+    def __first_segment(self):
+        return next(iter(self.__sizes)) if self.__sizes else None
+
+
+    def __last_segment(self):
+        return next(reversed(self.__sizes)) if self.__sizes else -1
+
+
+    def __next_segment(self, number):
+        return min(segment for segment in self.__sizes if segment > number)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        return self.__directory
+
+
+    @property
+    def size(self):
+        return sum(self.__sizes.values())
+
+
+    @property
+    def backlog(self):
+        with self.__condition:
+            if self.__read_segment is None:
+                return 0
+
+            return sum(size for segment, size in self.__sizes.items() if segment >= self.__read_segment) - \
+                self.__read_offset
+
+
+    @property
+    def report(self):
+        self.__report.backlog = self.backlog
+
+        return self.__report
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationSpool:{directory:%s, max_size:%s, segment_size:%s, segments:%s, read_segment:%s, " \
+               "read_offset:%s}" % \
+               (self.directory, self.__max_size, self.__segment_size, len(self.__sizes), self.__read_segment,
+                self.__read_offset)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PublicationSpoolReport(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.appended = 0                   # int       documents written to the spool
+        self.acknowledged = 0               # int       documents published
+        self.syncs = 0                      # int       fsync operations
+        self.evicted = 0                    # int       segments deleted by the size cap
+        self.backlog = 0                    # int       bytes awaiting publication
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def summary(self):
+        return "appended:%d acknowledged:%d backlog:%d evicted:%d" % \
+               (self.appended, self.acknowledged, self.backlog, self.evicted)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['appended'] = self.appended
+        jdict['acknowledged'] = self.acknowledged
+        jdict['syncs'] = self.syncs
+        jdict['evicted'] = self.evicted
+        jdict['backlog'] = self.backlog
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "PublicationSpoolReport:{appended:%s, acknowledged:%s, syncs:%s, evicted:%s, backlog:%s}" % \
+               (self.appended, self.acknowledged, self.syncs, self.evicted, self.backlog)
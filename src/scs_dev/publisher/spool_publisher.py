@@ -0,0 +1,116 @@
+"""
+Created on 19 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Drains a PublicationSpool to an MQTT client, on a background thread. Each document is published until the publication
+succeeds, then acknowledged to the spool.
+"""
+
+import json
+import threading
+import time
+
+from collections import OrderedDict
+
+from scs_core.data.publication import Publication
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SpoolPublisher(object):
+    """
+    classdocs
+    """
+
+    __WAIT_TIMEOUT =        1.0                 # seconds
+    __STOP_TIMEOUT =        4.0                 # seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, publish, reporter, spool, retry_interval=2.0):
+        """
+        Constructor
+        """
+        self.__publish = publish                        # callable: Publication -> bool
+        self.__reporter = reporter                      # MQTTReporter
+        self.__spool = spool                            # PublicationSpool
+        self.__retry_interval = retry_interval          # float seconds
+
+        self.__worker = None                            # Thread
+        self.__running = False                          # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        if self.__running:
+            return
+
+        self.__running = True
+
+        self.__worker = threading.Thread(target=self.__run, name="SpoolPublisher", daemon=True)
+        self.__worker.start()
+
+
+    def stop(self):
+        self.__running = False
+
+        if self.__worker:
+            self.__worker.join(self.__STOP_TIMEOUT)
+            self.__worker = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        while self.__running:
+            entry = self.__spool.next()
+
+            if entry is None:
+                self.__spool.wait(self.__WAIT_TIMEOUT)
+                continue
+
+            document, position = entry
+
+            try:
+                jdict = json.loads(document, object_pairs_hook=OrderedDict)
+            except ValueError:
+                self.__reporter.print("bad spooled datum: %s" % document)
+                self.__spool.ack(position)
+                continue
+
+            publication = Publication.construct_from_jdict(jdict)
+
+            if self.__publish_until_done(publication):
+                self.__spool.ack(position)
+
+
+    def __publish_until_done(self, publication):
+        while self.__running:
+            try:
+                success = self.__publish(publication)
+
+                if success:
+                    self.__reporter.print("done: %s" % self.__spool.report.summary())
+                    self.__reporter.set_led("G")
+                    return True
+
+                self.__reporter.print("failed")
+
+            except Exception as ex:
+                self.__reporter.print("%s: %s" % (ex.__class__.__name__, ex))
+
+            self.__reporter.set_led("R")
+
+            time.sleep(self.__retry_interval)                   # wait for auto-reconnect
+
+        return False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SpoolPublisher:{reporter:%s, spool:%s, retry_interval:%s, running:%s}" % \
+               (self.__reporter, self.__spool, self.__retry_interval, self.__running)
@@ -0,0 +1,183 @@
+"""
+Created on 11 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Reads documents from any number of sources - named pipes or files - at once, and wraps each in a publication for the
+topic of its source. The sources are multiplexed with a single selector, so that one process can publish for every
+channel, rather than one topic publisher per channel.
+
+A named pipe is held open for writing as well as for reading, so that it is never seen to close: writers may come and
+go, as when a sampler is restarted. A regular file is read to its end, then dropped.
+
+Documents are wrapped either by parsing them, as by the topic publishers, or - in passthrough mode - textually, by a
+PublicationEnvelope for each source. Documents from any one source are published in order. Lines that are not valid
+JSON are ignored.
+
+Documents that are read together are returned together, so that the caller can flush its output once per batch.
+"""
+
+import json
+import os
+import selectors
+import stat
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+from scs_core.data.publication import Publication
+
+from scs_dev.data.publication_envelope import PublicationEnvelope
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TopicMultiplexer(object):
+    """
+    classdocs
+    """
+
+    __READ_SIZE =       65536                           # bytes
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, sources, passthrough=False, validation_period=None):
+        """
+        Constructor
+        """
+        self.__sources = list(sources)                  # list of (topic, path)
+        self.__passthrough = passthrough                # bool
+        self.__validation_period = validation_period    # int
+
+        self.__selector = None                          # PollSelector
+        self.__fds = []                                 # list of int
+        self.__count = 0                                # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def open(self):
+        self.__selector = selectors.PollSelector()      # regular files cannot be registered with epoll
+
+        for topic, path in self.__sources:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            self.__fds.append(fd)
+
+            if stat.S_ISFIFO(os.fstat(fd).st_mode):
+                self.__fds.append(os.open(path, os.O_WRONLY | os.O_NONBLOCK))       # keep the pipe open
+
+            envelope = PublicationEnvelope(topic, validation_period=self.__validation_period) \
+                if self.__passthrough else None
+
+            self.__selector.register(fd, selectors.EVENT_READ, _Source(topic, path, envelope))
+
+
+    def close(self):
+        if self.__selector is not None:
+            self.__selector.close()
+            self.__selector = None
+
+        for fd in self.__fds:
+            os.close(fd)
+
+        self.__fds = []
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def publications(self, timeout=None):
+        """
+        yield lists of JSON publications, as their documents are read, until every source is exhausted
+        """
+        while self.__selector.get_map():
+            batch = []
+
+            for key, _ in self.__selector.select(timeout):
+                source = key.data
+                chunk = os.read(key.fd, self.__READ_SIZE)
+
+                if not chunk:
+                    self.__selector.unregister(key.fd)                          # end of a regular file
+                    lines = source.flush()
+
+                else:
+                    lines = source.receive(chunk)
+
+                for line in lines:
+                    publication = self.__wrap(source, line)
+
+                    if publication is not None:
+                        batch.append(publication)
+
+            self.__count += len(batch)
+
+            yield batch
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __wrap(source, line):
+        if source.envelope:
+            return source.envelope.wrap(line)
+
+        try:
+            jdict = json.loads(line, object_pairs_hook=OrderedDict)
+        except ValueError:
+            return None
+
+        return JSONify.dumps(Publication(source.topic, jdict))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def sources(self):
+        return self.__sources
+
+
+    @property
+    def passthrough(self):
+        return self.__passthrough
+
+
+    @property
+    def count(self):
+        return self.__count
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TopicMultiplexer:{sources:%s, passthrough:%s, validation_period:%s, count:%s}" % \
+               (self.sources, self.passthrough, self.__validation_period, self.count)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _Source(object):
+    """
+    the line buffer for one source
+    """
+
+    def __init__(self, topic, path, envelope):
+        self.topic = topic                              # string
+        self.path = path                                # string
+        self.envelope = envelope                        # PublicationEnvelope or None
+
+        self.__pending = b''                            # bytes         incomplete line
+
+
+    def receive(self, chunk):
+        lines = (self.__pending + chunk).split(b'\n')
+        self.__pending = lines.pop()
+
+        return [line.decode('utf-8', 'replace') for line in lines if line.strip()]
+
+
+    def flush(self):
+        line = self.__pending
+        self.__pending = b''
+
+        return [line.decode('utf-8', 'replace')] if line.strip() else []
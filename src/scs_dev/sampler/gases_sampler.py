@@ -2,16 +2,26 @@
 Created on 20 Oct 2016
 
 @author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+In concurrent mode, the NDIR is read on a worker thread, while the SHT and then the AFE are read on the caller's
+thread. Sample latency is then bounded by the slower of the two chains, rather than by the sum of all three reads.
+
+In diagnostics mode, the read time for each device - and the elapsed time for the whole acquisition - is reported in
+a diagnostics block of the sample.
 """
 
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sample.gases_sample import GasesSample
 
 from scs_core.sampler.sampler import Sampler
 
+from scs_dev.sampler.timed_gases_sample import TimedGasesSample
+
 
 # --------------------------------------------------------------------------------------------------------------------
 
@@ -22,7 +32,7 @@ class GasesSampler(Sampler):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, runner, tag, ndir_monitor, sht, afe):
+    def __init__(self, runner, tag, ndir_monitor, sht, afe, concurrent=False, diagnostics=False):
         """
         Constructor
         """
@@ -33,6 +43,11 @@ class GasesSampler(Sampler):
         self.__sht = sht
         self.__afe = afe
 
+        self.__concurrent = concurrent
+        self.__diagnostics = diagnostics
+
+        self.__executor = None
+
 
     # ----------------------------------------------------------------------------------------------------------------
 
@@ -40,6 +55,9 @@ class GasesSampler(Sampler):
         if self.__ndir_monitor is None:
             return
 
+        if self.__concurrent:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+
         self.__ndir_monitor.start()
 
         # wait for data...
@@ -48,6 +66,10 @@ class GasesSampler(Sampler):
 
 
     def stop(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
         if self.__ndir_monitor is None:
             return
 
@@ -61,28 +83,67 @@ class GasesSampler(Sampler):
 
 
     def sample(self):
-        try:
-            ndir_datum = None if self.__ndir_monitor is None else self.__ndir_monitor.sample()
-        except OSError:
-            ndir_datum = self.__ndir_monitor.null_datum()
+        start = time.monotonic()
+
+        # NDIR (concurrent)...
+        ndir_future = None if self.__executor is None else self.__executor.submit(self.__ndir_sample)
+
+        if ndir_future is None:
+            ndir_datum, ndir_time = self.__ndir_sample()
+
+        # SHT...
+        sht_start = time.monotonic()
 
         try:
             sht_datum = None if self.__sht is None else self.__sht.sample()
         except OSError:
             sht_datum = self.__sht.null_datum()
 
+        sht_time = None if self.__sht is None else time.monotonic() - sht_start
+
+        # AFE...
+        afe_start = time.monotonic()
+
         try:
             afe_datum = None if self.__afe is None else self.__afe.sample(sht_datum)
         except OSError:
             afe_datum = self.__afe.null_datum()
 
+        afe_time = None if self.__afe is None else time.monotonic() - afe_start
+
+        # NDIR (concurrent)...
+        if ndir_future is not None:
+            ndir_datum, ndir_time = ndir_future.result()
+
         recorded = LocalizedDatetime.now()      # after sampling, so that we can monitor resource contention
 
-        return GasesSample(self.__tag, recorded, ndir_datum, afe_datum, sht_datum)
+        if not self.__diagnostics:
+            return GasesSample(self.__tag, recorded, ndir_datum, afe_datum, sht_datum)
+
+        elapsed = time.monotonic() - start
+
+        return TimedGasesSample(self.__tag, recorded, ndir_datum, afe_datum, sht_datum,
+                                ndir_time, sht_time, afe_time, elapsed)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __ndir_sample(self):
+        if self.__ndir_monitor is None:
+            return None, None
+
+        start = time.monotonic()
+
+        try:
+            ndir_datum = self.__ndir_monitor.sample()
+        except OSError:
+            ndir_datum = self.__ndir_monitor.null_datum()
+
+        return ndir_datum, time.monotonic() - start
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return "GasesSampler:{runner:%s, tag:%s, ndir_monitor:%s, sht:%s}" % \
-                    (self.runner, self.__tag, self.__ndir_monitor, self.__sht)
+        return "GasesSampler:{runner:%s, tag:%s, ndir_monitor:%s, sht:%s, concurrent:%s, diagnostics:%s}" % \
+                    (self.runner, self.__tag, self.__ndir_monitor, self.__sht, self.__concurrent, self.__diagnostics)
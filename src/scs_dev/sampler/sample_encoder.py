@@ -0,0 +1,253 @@
+"""
+Created on 13 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A JSON encoder for a stream of samples of the same shape, as an alternative to JSONify.dumps on the sampler hot path.
+
+The first sample is walked once, and an encoding function is compiled for its shape: the keys and punctuation of the
+document are fixed in a format string, and only the values are visited for each sample, without the recursive type
+dispatch of the generic encoder. The output is identical to that of JSONify.dumps.
+
+Each sample is checked against the compiled shape as it is encoded. If the shape has changed - a field is missing or
+added, or a value has a different type - the sample is encoded by JSONify.dumps. If the shape changes for several
+samples in a row, the encoder is compiled afresh for the new shape. A shape that cannot be compiled - for example,
+one with non-string keys - is always encoded by JSONify.dumps.
+"""
+
+from collections import OrderedDict
+from json.encoder import encode_basestring
+
+from scs_core.data.json import JSONable, JSONify
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SampleEncoder(object):
+    """
+    classdocs
+    """
+
+    RECOMPILE_AFTER =       3                       # consecutive mismatched samples
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__encode = None                            # function
+        self.__compilable = True                        # bool
+        self.__mismatches = 0                           # int
+
+        self.__compiled = 0                             # int
+        self.__fallbacks = 0                            # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def encode(self, sample):
+        if self.__encode is None and self.__compilable:
+            self.__compile(sample)
+
+        if self.__encode is not None:
+            try:
+                jstr = self.__encode(sample)
+                self.__mismatches = 0
+
+                return jstr
+
+            except _ShapeError:
+                self.__mismatches += 1
+
+                if self.__mismatches >= self.RECOMPILE_AFTER:
+                    self.__encode = None
+                    self.__compilable = True
+                    self.__mismatches = 0
+
+        self.__fallbacks += 1
+
+        return JSONify.dumps(sample)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __compile(self, sample):
+        try:
+            self.__encode = _ShapeCompiler().compile(sample)
+            self.__compiled += 1
+
+        except _ShapeError:
+            self.__compilable = False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def compiled(self):
+        return self.__compiled
+
+
+    @property
+    def fallbacks(self):
+        return self.__fallbacks
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SampleEncoder:{compiled:%s, fallbacks:%s}" % (self.compiled, self.fallbacks)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _ShapeError(Exception):
+    """
+    the sample does not have the compiled shape, or its shape cannot be compiled
+    """
+    pass
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def _float_str(value, _repr=float.__repr__, _inf=float('inf')):
+    # as the json module, with allow_nan...
+    if value != value:
+        return 'NaN'
+
+    if value == _inf:
+        return 'Infinity'
+
+    if value == -_inf:
+        return '-Infinity'
+
+    return _repr(value)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class _ShapeCompiler(object):
+    """
+    generates the source of an encoding function for the shape of one sample
+    """
+
+    __LEAVES = {
+        str: ('str', 'encode_basestring(%s)'),
+        float: ('float', '_float_str(%s)'),
+        int: ('int', 'int.__repr__(%s)'),
+        bool: ('bool', "('true' if %s else 'false')"),
+        type(None): ('NoneType', None)
+    }
+
+    __NAMESPACE = {
+        'OrderedDict': OrderedDict,
+        'NoneType': type(None),
+        'encode_basestring': encode_basestring,
+        '_float_str': _float_str,
+        '_ShapeError': _ShapeError
+    }
+
+    def __init__(self):
+        self.__lines = []                               # list of string        function body
+        self.__format = []                              # list of string        format string fragments
+        self.__args = []                                # list of string        format arguments
+        self.__count = 0                                # int                   variable names
+
+
+    def compile(self, sample):
+        self.__node(sample, 'sample')
+
+        body = '\n'.join('    ' + line for line in self.__lines)
+        jstr = ''.join(self.__format)
+
+        source = "def encode(sample):\n%s\n    return %r %% (%s, )\n" % (body, jstr, ', '.join(self.__args))
+
+        namespace = dict(self.__NAMESPACE)
+        exec(compile(source, '<SampleEncoder>', 'exec'), namespace)
+
+        encode = namespace['encode']
+
+        def checked_encode(obj):
+            try:
+                return encode(obj)
+
+            except (AttributeError, KeyError, IndexError, TypeError):
+                raise _ShapeError()
+
+        return checked_encode
+
+
+    def __node(self, value, expr):
+        # JSONable...
+        while isinstance(value, JSONable):
+            name = self.__var()
+            self.__lines.append("%s = %s.as_json()" % (name, expr))
+
+            value = value.as_json()
+            expr = name
+
+        # object...
+        if isinstance(value, dict):
+            name = self.__var()
+            keys = tuple(value.keys())
+
+            if any(type(key) is not str for key in keys):
+                raise _ShapeError()
+
+            self.__lines.append("%s = %s" % (name, expr))
+            self.__lines.append("if not isinstance(%s, dict) or tuple(%s) != %r: raise _ShapeError()" %
+                                (name, name, keys))
+
+            self.__append('{')
+
+            for i, key in enumerate(keys):
+                self.__append((', ' if i > 0 else '') + encode_basestring(key) + ': ')
+                self.__node(value[key], "%s[%r]" % (name, key))
+
+            self.__append('}')
+            return
+
+        # array...
+        if isinstance(value, (list, tuple)):
+            name = self.__var()
+
+            self.__lines.append("%s = %s" % (name, expr))
+            self.__lines.append("if not isinstance(%s, (list, tuple)) or len(%s) != %d: raise _ShapeError()" %
+                                (name, name, len(value)))
+
+            self.__append('[')
+
+            for i, item in enumerate(value):
+                self.__append(', ' if i > 0 else '')
+                self.__node(item, "%s[%d]" % (name, i))
+
+            self.__append(']')
+            return
+
+        # leaf...
+        if type(value) not in self.__LEAVES:
+            raise _ShapeError()
+
+        type_name, encoding = self.__LEAVES[type(value)]
+        name = self.__var()
+
+        self.__lines.append("%s = %s" % (name, expr))
+        self.__lines.append("if type(%s) is not %s: raise _ShapeError()" % (name, type_name))
+
+        if encoding is None:
+            self.__append('null')
+            return
+
+        self.__format.append('%s')
+        self.__args.append(encoding % name)
+
+
+    def __append(self, text):
+        self.__format.append(text.replace('%', '%%'))
+
+
+    def __var(self):
+        self.__count += 1
+
+        return "v%d" % self.__count
@@ -0,0 +1,146 @@
+"""
+Created on 26 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Constructs the sampler for a schedule item, from the host's configuration, as the individual sampler utilities do.
+"""
+
+from scs_core.climate.mpl115a2_calib import MPL115A2Calib
+
+from scs_dev.sampler.climate_sampler import ClimateSampler
+from scs_dev.sampler.gases_sampler import GasesSampler
+from scs_dev.sampler.particulates_sampler import ParticulatesSampler
+from scs_dev.sampler.pressure_sampler import PressureSampler
+from scs_dev.sampler.sht_cache import SHTCache
+from scs_dev.sampler.status_sampler import StatusSampler
+
+from scs_dfe.board.dfe_conf import DFEConf
+from scs_dfe.climate.mpl115a2 import MPL115A2
+from scs_dfe.climate.mpl115a2_conf import MPL115A2Conf
+from scs_dfe.climate.sht_conf import SHTConf
+from scs_dfe.gps.gps_conf import GPSConf
+from scs_dfe.particulate.opc_conf import OPCConf
+
+try:
+    from scs_ndir.gas.ndir_conf import NDIRConf
+except ImportError:
+    from scs_core.gas.ndir_conf import NDIRConf
+
+try:
+    from scs_psu.psu.psu_conf import PSUConf
+except ImportError:
+    from scs_core.psu.psu_conf import PSUConf
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SamplerFactory(object):
+    """
+    classdocs
+    """
+
+    CLIMATE =           "scs-climate"
+    GASES =             "scs-gases"
+    PARTICULATES =      ParticulatesSampler.SCHEDULE_SEMAPHORE
+    PRESSURE =          "scs-pressure"
+    STATUS =            "scs-status"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host, tag):
+        """
+        Constructor
+        """
+        self.__host = host                              # Host
+        self.__tag = tag                                # string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def sampler(self, name, runner):
+        if name == self.CLIMATE:
+            return self.climate_sampler(runner)
+
+        if name == self.GASES:
+            return self.gases_sampler(runner)
+
+        if name == self.PARTICULATES:
+            return self.particulates_sampler(runner)
+
+        if name == self.PRESSURE:
+            return self.pressure_sampler(runner)
+
+        if name == self.STATUS:
+            return self.status_sampler(runner)
+
+        return None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def climate_sampler(self, runner):
+        sht_conf = SHTConf.load(self.__host)
+
+        if sht_conf is None:
+            return None
+
+        return ClimateSampler(runner, self.__tag, SHTCache(sht_conf.ext_sht(), sht_conf.ext_addr))
+
+
+    def gases_sampler(self, runner):
+        # NDIR...
+        ndir_conf = NDIRConf.load(self.__host)
+        ndir_monitor = None if ndir_conf is None else ndir_conf.ndir_monitor(self.__host)
+
+        # SHT...
+        sht_conf = SHTConf.load(self.__host)
+        sht = None if sht_conf is None else SHTCache(sht_conf.int_sht(), sht_conf.int_addr)
+
+        # AFE...
+        dfe_conf = DFEConf.load(self.__host)
+        afe = None if dfe_conf is None else dfe_conf.afe(self.__host)
+
+        return GasesSampler(runner, self.__tag, ndir_monitor, sht, afe)
+
+
+    def particulates_sampler(self, runner):
+        opc_conf = OPCConf.load(self.__host)
+
+        if opc_conf is None:
+            return None
+
+        return ParticulatesSampler(runner, self.__tag, opc_conf.opc_monitor(self.__host))
+
+
+    def pressure_sampler(self, runner):
+        barometer_conf = MPL115A2Conf.load(self.__host)
+        altitude = None if barometer_conf is None else barometer_conf.altitude
+
+        barometer_calib = MPL115A2Calib.load(self.__host)
+        barometer = MPL115A2.construct(barometer_calib)
+
+        return PressureSampler(runner, self.__tag, barometer, altitude)
+
+
+    def status_sampler(self, runner):
+        # board...
+        dfe_conf = DFEConf.load(self.__host)
+        board = None if dfe_conf is None else dfe_conf.board_temp_sensor()
+
+        # GPS...
+        gps_conf = GPSConf.load(self.__host)
+        gps_monitor = None if gps_conf is None else gps_conf.gps_monitor(self.__host)
+
+        # PSUMonitor...
+        psu_conf = PSUConf.load(self.__host)
+        psu_monitor = None if psu_conf is None else psu_conf.psu_monitor(self.__host)
+
+        return StatusSampler(runner, self.__tag, board, gps_monitor, psu_monitor)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SamplerFactory:{tag:%s}" % self.__tag
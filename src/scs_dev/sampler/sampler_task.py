@@ -0,0 +1,109 @@
+"""
+Created on 26 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Runs a sampler on its own thread, writing each sample to a TaggedWriter under the name of its schedule item.
+
+If metrics are requested, the runner's ScheduleMetrics are written after each sample, under the name of the schedule
+item with the suffix "-metrics". The sampler's runner must then be a MonotonicRunner.
+"""
+
+import sys
+import threading
+
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SamplerTask(object):
+    """
+    classdocs
+    """
+
+    __STOP_TIMEOUT =        4.0                 # seconds
+
+    METRICS_SUFFIX =        "-metrics"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, name, sampler, writer, metrics=False, verbose=False):
+        """
+        Constructor
+        """
+        self.__name = name                              # string            schedule item name
+        self.__sampler = sampler                        # Sampler
+        self.__writer = writer                          # TaggedWriter
+        self.__metrics = metrics                        # bool
+        self.__verbose = verbose                        # bool
+
+        self.__thread = None                            # Thread
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__run, name=self.__name, daemon=True)
+        self.__thread.start()
+
+
+    def stop(self):
+        self.__sampler.runner.stop()
+
+        if self.__thread:
+            self.__thread.join(self.__STOP_TIMEOUT)
+
+        stop = getattr(self.__sampler, 'stop', None)
+
+        if stop:
+            stop()
+
+
+    def is_alive(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __run(self):
+        # start...
+        init = getattr(self.__sampler, 'init', None) or getattr(self.__sampler, 'start', None)
+
+        if init:
+            init()
+
+        # run...
+        for sample in self.__sampler.samples():
+            if sample is None:
+                continue
+
+            if self.__verbose:
+                now = LocalizedDatetime.now()
+                print("%s: %12s: %s" % (now.as_time(), self.__name, sample.rec.as_time()), file=sys.stderr)
+                sys.stderr.flush()
+
+            self.__writer.write(self.__name, sample)
+
+            if self.__metrics:
+                self.__writer.write(self.__name + self.METRICS_SUFFIX, self.__sampler.runner.metrics)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def sampler(self):
+        return self.__sampler
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SamplerTask:{name:%s, sampler:%s, metrics:%s, alive:%s}" % \
+               (self.name, self.sampler, self.__metrics, self.is_alive())
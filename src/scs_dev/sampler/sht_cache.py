@@ -0,0 +1,174 @@
+"""
+Created on 17 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A cache of the latest reading of an SHT sensor, shared between the processes - or sampler tasks - that read the same
+device, so that a reading taken by one can be reused by another while it is fresh, rather than reading the device
+again.
+
+The cache for each device - identified by its I2C address - is a 24-byte record on a memory-backed filesystem, holding
+the time of the reading, on the system-wide monotonic clock, and its humidity and temperature. The record is replaced
+atomically, so it is read without locking. When the reading is older than its time-to-live, the device is read by
+whichever process takes an exclusive lock on the cache: a process that waits for the lock then finds the fresh reading
+of its owner, so that the device is read once, rather than once per process. A failed read is not cached.
+
+The time-to-live should be short in relation to the sampling intervals, so that each sampler reports a reading of its
+own time. Samplers that read a device at the same moment - on the same schedule - then share a single reading.
+"""
+
+import fcntl
+import math
+import os
+import struct
+import tempfile
+import time
+
+from scs_core.climate.sht_datum import SHTDatum
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SHTCache(object):
+    """
+    classdocs
+    """
+
+    DEFAULT_TTL =       1.0                             # seconds
+
+    __DIRECTORY =       "/dev/shm"                      # memory-backed, cleared on reboot
+    __PREFIX =          "scs_sht_"
+
+    __RECORD =          struct.Struct('<ddd')           # monotonic time, humidity, temperature
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def filename(cls, addr):
+        directory = cls.__DIRECTORY if os.path.isdir(cls.__DIRECTORY) else tempfile.gettempdir()
+
+        return os.path.join(directory, "%s%s_0x%02x" % (cls.__PREFIX, os.getuid(), addr))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, sht, addr, ttl=DEFAULT_TTL):
+        """
+        Constructor
+        """
+        self.__sht = sht                                # SHT31
+        self.__addr = addr                              # int           I2C address
+        self.__ttl = ttl                                # float         seconds
+
+        self.__filename = self.filename(addr)           # string
+        self.__lock_fd = None                           # int           held for the life of the process
+
+        self.__reads = 0                                # int
+        self.__hits = 0                                 # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def reset(self):
+        self.__sht.reset()
+
+
+    def sample(self):
+        datum = self.__cached()
+
+        if datum is not None:
+            self.__hits += 1
+            return datum
+
+        if self.__lock_fd is None:
+            self.__lock_fd = os.open(self.__filename + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+
+        fcntl.flock(self.__lock_fd, fcntl.LOCK_EX)
+
+        try:
+            datum = self.__cached()                     # read by the owner of the lock, while we waited
+
+            if datum is not None:
+                self.__hits += 1
+                return datum
+
+            datum = self.__sht.sample()
+            self.__reads += 1
+
+            self.__store(datum)
+
+            return datum
+
+        finally:
+            fcntl.flock(self.__lock_fd, fcntl.LOCK_UN)
+
+
+    def null_datum(self):
+        return self.__sht.null_datum()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __cached(self):
+        try:
+            with open(self.__filename, "rb") as f:
+                record = f.read(self.__RECORD.size)
+
+        except FileNotFoundError:
+            return None
+
+        if len(record) != self.__RECORD.size:
+            return None
+
+        recorded, humid, temp = self.__RECORD.unpack(record)
+
+        if not 0 <= time.monotonic() - recorded < self.__ttl:
+            return None
+
+        return SHTDatum(None if math.isnan(humid) else humid, None if math.isnan(temp) else temp)
+
+
+    def __store(self, datum):
+        humid = float('nan') if datum.humid is None else datum.humid
+        temp = float('nan') if datum.temp is None else datum.temp
+
+        tmp_filename = "%s.%d" % (self.__filename, os.getpid())
+
+        fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        try:
+            os.write(fd, self.__RECORD.pack(time.monotonic(), humid, temp))
+        finally:
+            os.close(fd)
+
+        os.replace(tmp_filename, self.__filename)       # atomic
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def addr(self):
+        return self.__addr
+
+
+    @property
+    def ttl(self):
+        return self.__ttl
+
+
+    @property
+    def reads(self):
+        return self.__reads
+
+
+    @property
+    def hits(self):
+        return self.__hits
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "SHTCache:{sht:%s, addr:0x%02x, ttl:%s, reads:%s, hits:%s}" % \
+               (self.__sht, self.addr, self.ttl, self.reads, self.hits)
@@ -2,9 +2,10 @@
 Created on 20 Oct 2016
 
 @author: Bruno Beloff (bruno.beloff@southcoastscience.com)
-"""
 
-import subprocess
+The timezone and schedule configurations are held in a ConfCache, so that they are re-loaded only when their files
+change. Uptime is read from /proc, rather than from the uptime utility.
+"""
 
 from scs_core.data.localized_datetime import LocalizedDatetime
 
@@ -17,7 +18,9 @@ from scs_core.sampler.sampler import Sampler
 from scs_core.sync.schedule import Schedule
 
 from scs_core.sys.system_temp import SystemTemp
-from scs_core.sys.uptime_datum import UptimeDatum
+
+from scs_dev.sys.conf_cache import ConfCache
+from scs_dev.sys.uptime_reader import UptimeReader
 
 from scs_host.sys.host import Host
 
@@ -42,6 +45,8 @@ class StatusSampler(Sampler):
         self.__gps_monitor = gps_monitor
         self.__psu_monitor = psu_monitor
 
+        self.__conf_cache = ConfCache(Host)
+
 
     # ----------------------------------------------------------------------------------------------------------------
 
@@ -64,7 +69,7 @@ class StatusSampler(Sampler):
 
     def sample(self):
         # timezone...
-        timezone_conf = TimezoneConf.load(Host)
+        timezone_conf = self.__conf_cache.load(TimezoneConf)
         timezone = timezone_conf.timezone()
 
         # position...
@@ -81,13 +86,10 @@ class StatusSampler(Sampler):
         temperature = SystemTemp.construct(board_sample, mcu_sample)
 
         # schedule...
-        schedule = Schedule.load(Host)
+        schedule = self.__conf_cache.load(Schedule)
 
         # uptime...
-        raw = subprocess.check_output('uptime')
-        report = raw.decode()
-
-        uptime = UptimeDatum.construct_from_report(None, report)
+        uptime = UptimeReader.datum()
 
         # psu_monitor...
         psu_monitor_status = None if self.__psu_monitor is None else self.__psu_monitor.sample()
@@ -0,0 +1,94 @@
+"""
+Created on 30 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A GasesSample with a diagnostics block, giving the read time for each device, and the elapsed time for the whole
+acquisition, in seconds. Devices that are not present are not reported.
+
+example document:
+{"tag": "scs-ap1-6", "rec": "2018-04-05T09:16:12.751+00:00",
+"val": {"CO": {"weV": 0.34863, "aeV": 0.268817, "weC": 0.064464, "cnc": 237.0},
+"sht": {"hmd": 54.4, "tmp": 21.6}},
+"dgn": {"ndir": 0.004, "sht": 0.021, "afe": 0.314, "elapsed": 0.336}}
+"""
+
+from collections import OrderedDict
+
+from scs_core.sample.gases_sample import GasesSample
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TimedGasesSample(GasesSample):
+    """
+    classdocs
+    """
+
+    DIAGNOSTICS_TAG =       "dgn"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, tag, rec, ndir_datum, electrochem_datum, sht_datum, ndir_time, sht_time, afe_time, elapsed):
+        """
+        Constructor
+        """
+        super().__init__(tag, rec, ndir_datum, electrochem_datum, sht_datum)
+
+        self.__ndir_time = ndir_time                    # float seconds
+        self.__sht_time = sht_time                      # float seconds
+        self.__afe_time = afe_time                      # float seconds
+        self.__elapsed = elapsed                        # float seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = super().as_json()
+
+        diagnostics = OrderedDict()
+
+        if self.ndir_time is not None:
+            diagnostics['ndir'] = round(self.ndir_time, 3)
+
+        if self.sht_time is not None:
+            diagnostics['sht'] = round(self.sht_time, 3)
+
+        if self.afe_time is not None:
+            diagnostics['afe'] = round(self.afe_time, 3)
+
+        diagnostics['elapsed'] = round(self.elapsed, 3)
+
+        jdict[self.DIAGNOSTICS_TAG] = diagnostics
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def ndir_time(self):
+        return self.__ndir_time
+
+
+    @property
+    def sht_time(self):
+        return self.__sht_time
+
+
+    @property
+    def afe_time(self):
+        return self.__afe_time
+
+
+    @property
+    def elapsed(self):
+        return self.__elapsed
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TimedGasesSample:{sample:%s, ndir_time:%s, sht_time:%s, afe_time:%s, elapsed:%s}" % \
+               (super().__str__(), self.ndir_time, self.sht_time, self.afe_time, self.elapsed)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""
+Created on 26 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+DESCRIPTION
+The sampler_host utility runs all of the sampling processes - climate, gases, particulates, pressure and status - as
+tasks within a single process. It is an alternative to running the scheduler utility together with one sampler utility
+per sensor, and saves both memory and I2C bus contention.
+
+The sampler_host reads the schedule configuration, and starts one task for each of its items, sampling at the
+interval given for the item. The I2C bus is opened once, and access to it is serialised between the tasks. Schedule
+items that are not recognised, or whose sensors are not configured, are ignored.
+
+Each task is timed on the monotonic clock, against absolute deadlines, so that neither sampler run time nor changes
+to the system clock cause drift. If a sampler overruns, any ticks that it has missed entirely are skipped, rather than
+being run back-to-back. If the --metrics flag is set, then each task also reports its timing metrics after each
+sample: release jitter (actual less scheduled release time), sampler run duration, overruns and skipped ticks.
+
+Samples are written to stdout, each wrapped in a JSON document whose only field has the name of the schedule item.
+Alternatively, if a directory is specified, the samples for each item are written unwrapped to a file (or named pipe)
+in that directory, named for the schedule item. A named pipe is never waited for: if it has no reader, or is full,
+the sample is dropped, and counted.
+
+SYNOPSIS
+sampler_host.py [-d DIRECTORY] [-m] [-v]
+
+EXAMPLES
+./sampler_host.py -v -d ~/SCS/pipes
+
+FILES
+~/SCS/conf/schedule.json
+~/SCS/conf/system_id.json
+
+DOCUMENT EXAMPLE - OUTPUT
+{"scs-climate": {"tag": "scs-ap1-6", "rec": "2018-04-04T13:09:49.648+00:00", "val": {"hmd": 66.2, "tmp": 21.7}}}
+
+DOCUMENT EXAMPLE - METRICS
+{"scs-climate-metrics": {"interval": 10.0, "ticks": 360, "overruns": 0, "skipped": 0,
+"jitter": {"last": 0.001, "avg": 0.002, "max": 0.093}, "duration": {"last": 0.081, "avg": 0.083, "max": 0.174}}}
+
+SEE ALSO
+scs_dev/climate_sampler
+scs_dev/csv_logger_host
+scs_dev/gases_sampler
+scs_dev/particulates_sampler
+scs_dev/pressure_sampler
+scs_dev/scheduler
+scs_dev/status_sampler
+scs_mfr/schedule
+
+BUGS
+Sensor monitors that run as background processes - such as those for the OPC, NDIR, GPS and PSU - access their
+devices independently of the sampler_host's bus serialisation.
+"""
+
+import sys
+import threading
+import time
+
+from scs_core.sync.schedule import Schedule
+
+from scs_core.sys.system_id import SystemID
+
+from scs_dev.cmd.cmd_sampler_host import CmdSamplerHost
+from scs_dev.comms.tagged_writer import TaggedWriter
+from scs_dev.sampler.sampler_factory import SamplerFactory
+from scs_dev.sampler.sampler_task import SamplerTask
+from scs_dev.sync.monotonic_runner import MonotonicRunner
+
+from scs_host.bus.i2c import I2C
+from scs_host.sys.host import Host
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    tasks = []
+    writer = None
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # cmd...
+
+    cmd = CmdSamplerHost()
+
+    if cmd.verbose:
+        print("sampler_host: %s" % cmd, file=sys.stderr)
+
+    try:
+        I2C.open(Host.I2C_SENSORS)
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # resources...
+
+        # SystemID...
+        system_id = SystemID.load(Host)
+
+        tag = None if system_id is None else system_id.message_tag()
+
+        if system_id and cmd.verbose:
+            print("sampler_host: %s" % system_id, file=sys.stderr)
+
+        # Schedule...
+        schedule = Schedule.load(Host)
+
+        if schedule is None:
+            print("sampler_host: Schedule not available.", file=sys.stderr)
+            exit(1)
+
+        if cmd.verbose:
+            print("sampler_host: %s" % schedule, file=sys.stderr)
+
+        # TaggedWriter...
+        writer = TaggedWriter(cmd.directory)
+
+        # tasks...
+        factory = SamplerFactory(Host, tag)
+        bus_lock = threading.Lock()
+
+        for item in schedule.items:
+            sampler = factory.sampler(item.name, MonotonicRunner(item.interval, bus_lock))
+
+            if sampler is None:
+                print("sampler_host: no sampler available for %s" % item.name, file=sys.stderr)
+                continue
+
+            tasks.append(SamplerTask(item.name, sampler, writer, cmd.metrics, cmd.verbose))
+
+        if not tasks:
+            print("sampler_host: no samplers available.", file=sys.stderr)
+            exit(1)
+
+        if cmd.verbose:
+            for task in tasks:
+                print("sampler_host: %s" % task, file=sys.stderr)
+
+            sys.stderr.flush()
+
+
+        # ------------------------------------------------------------------------------------------------------------
+        # run...
+
+        for task in tasks:
+            task.start()
+
+        while any(task.is_alive() for task in tasks):
+            time.sleep(1.0)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # end...
+
+    except KeyboardInterrupt:
+        if cmd.verbose:
+            print("sampler_host: KeyboardInterrupt", file=sys.stderr)
+
+    finally:
+        for task in tasks:
+            task.stop()
+
+            if cmd.verbose:
+                print("sampler_host: %s: %s" % (task.name, task.sampler.runner.metrics), file=sys.stderr)
+
+        if writer:
+            writer.close()
+
+            if cmd.verbose:
+                print("sampler_host: %s" % writer, file=sys.stderr)
+
+        I2C.close()
@@ -38,6 +38,7 @@ SEE ALSO
 scs_dev/climate_sampler
 scs_dev/gases_sampler
 scs_dev/particulates_sampler
+scs_dev/sampler_host
 scs_dev/status_sampler
 scs_mfr/schedule
 """
@@ -66,7 +66,6 @@ https://en.wikipedia.org/wiki/ISO_8601
 
 import sys
 
-from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
 from scs_core.sync.timed_runner import TimedRunner
@@ -74,6 +73,7 @@ from scs_core.sync.timed_runner import TimedRunner
 from scs_core.sys.system_id import SystemID
 
 from scs_dev.cmd.cmd_sampler import CmdSampler
+from scs_dev.sampler.sample_encoder import SampleEncoder
 from scs_dev.sampler.status_sampler import StatusSampler
 
 from scs_dfe.board.dfe_conf import DFEConf
@@ -150,6 +150,9 @@ if __name__ == '__main__':
             print("status_sampler: %s" % sampler, file=sys.stderr)
             sys.stderr.flush()
 
+        # encoder...
+        encoder = SampleEncoder()
+
 
         # ------------------------------------------------------------------------------------------------------------
         # run...
@@ -162,7 +165,7 @@ if __name__ == '__main__':
                 print("%s:       status: %s" % (now.as_time(), sample.rec.as_time()), file=sys.stderr)
                 sys.stderr.flush()
 
-            print(JSONify.dumps(sample))
+            print(encoder.encode(sample))
             sys.stdout.flush()
 
 
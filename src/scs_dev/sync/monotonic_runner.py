@@ -0,0 +1,99 @@
+"""
+Created on 30 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A timed runner for samplers, driven by a drift-free MonotonicTimer. If a lock is given, each call to sampler.sample()
+is made while holding it - this serialises samplers that share a resource, such as the I2C bus, within one process.
+
+The runner maintains ScheduleMetrics for its sampler. The run duration is measured once the lock is held, so that time
+spent waiting for the lock appears as release jitter on the following tick, rather than as sampler run time.
+"""
+
+import time
+
+from scs_core.sync.runner import Runner
+
+from scs_dev.sync.monotonic_timer import MonotonicTimer
+from scs_dev.sync.schedule_metrics import ScheduleMetrics
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MonotonicRunner(Runner):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, interval, lock=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Constructor
+        """
+        self.__timer = MonotonicTimer(interval, clock, sleep)          # MonotonicTimer
+        self.__lock = lock                                              # Lock
+
+        self.__metrics = ScheduleMetrics(self.__timer.interval)        # ScheduleMetrics
+        self.__tick = None                                              # Tick
+
+        self.__running = True                                           # bool
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def reset(self):
+        self.__timer.reset()
+
+
+    def samples(self, sampler):
+        clock = self.__timer.clock
+
+        while self.__running:
+            tick = self.__timer.wait()
+
+            if not self.__running:
+                break
+
+            if self.__lock is None:
+                start = clock()
+                sample = sampler.sample()
+                duration = clock() - start
+
+            else:
+                with self.__lock:
+                    start = clock()
+                    sample = sampler.sample()
+                    duration = clock() - start
+
+            self.__metrics.update(tick, duration)
+            self.__tick = tick
+
+            yield sample
+
+
+    def stop(self):
+        self.__running = False
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def timer(self):
+        return self.__timer
+
+
+    @property
+    def metrics(self):
+        return self.__metrics
+
+
+    @property
+    def tick(self):
+        return self.__tick
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "MonotonicRunner:{timer:%s, running:%s, metrics:%s}" % (self.__timer, self.__running, self.__metrics)
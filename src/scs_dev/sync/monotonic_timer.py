@@ -0,0 +1,144 @@
+"""
+Created on 30 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A drift-free interval timer, on the monotonic clock.
+
+Ticks are due at absolute deadlines - origin + n * interval - so the time taken by the caller between ticks does not
+accumulate as drift. A tick released late, but within one interval of its deadline, is released immediately. Ticks
+that are overdue by a whole interval or more are skipped, rather than being released in a burst: the most recent
+overdue tick is released immediately, and reports how many ticks it stands for.
+
+The clock and sleep functions may be replaced, for testing.
+"""
+
+import time
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MonotonicTimer(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, interval, clock=time.monotonic, sleep=time.sleep):
+        """
+        Constructor
+        """
+        self.__interval = float(interval)               # float seconds
+        self.__clock = clock                            # callable: -> float seconds
+        self.__sleep = sleep                            # callable: float seconds ->
+
+        self.__origin = None                            # float seconds
+        self.__index = 0                                # int
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def reset(self):
+        self.__origin = None
+        self.__index = 0
+
+
+    def wait(self):
+        now = self.__clock()
+
+        if self.__origin is None:
+            self.__origin = now
+
+        self.__index += 1
+
+        # missed ticks...
+        lateness = now - self.__deadline()
+        skipped = 0
+
+        if lateness >= self.__interval:
+            skipped = int(lateness // self.__interval)
+            self.__index += skipped
+
+        # wait...
+        scheduled = self.__deadline()
+
+        if scheduled > now:
+            self.__sleep(scheduled - now)
+
+        return Tick(scheduled, self.__clock(), skipped)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __deadline(self):
+        return self.__origin + self.__index * self.__interval
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    @property
+    def clock(self):
+        return self.__clock
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "MonotonicTimer:{interval:%s, origin:%s, index:%s}" % (self.interval, self.__origin, self.__index)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class Tick(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, scheduled, released, skipped):
+        """
+        Constructor
+        """
+        self.__scheduled = scheduled                    # float seconds     deadline on the monotonic clock
+        self.__released = released                      # float seconds     actual release on the monotonic clock
+        self.__skipped = skipped                        # int               overdue ticks skipped before this one
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def scheduled(self):
+        return self.__scheduled
+
+
+    @property
+    def released(self):
+        return self.__released
+
+
+    @property
+    def skipped(self):
+        return self.__skipped
+
+
+    @property
+    def jitter(self):
+        return self.released - self.scheduled
+
+
+    @property
+    def tally(self):
+        return self.skipped + 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "Tick:{scheduled:%0.3f, released:%0.3f, skipped:%s}" % (self.scheduled, self.released, self.skipped)
@@ -0,0 +1,171 @@
+"""
+Created on 30 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Timing metrics for one schedule item: release jitter (actual release time less scheduled release time), sampler run
+duration, overruns (runs that took longer than the interval) and skipped ticks.
+
+example document:
+{"interval": 5.0, "ticks": 120, "overruns": 1, "skipped": 2,
+"jitter": {"last": 0.001, "avg": 0.004, "max": 0.512},
+"duration": {"last": 0.802, "avg": 0.811, "max": 5.734}}
+"""
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ScheduleMetrics(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, interval):
+        """
+        Constructor
+        """
+        self.__interval = interval                      # float seconds
+
+        self.__ticks = 0                                # int
+        self.__overruns = 0                             # int
+        self.__skipped = 0                              # int
+
+        self.__jitter = TimingStats()                   # TimingStats
+        self.__duration = TimingStats()                 # TimingStats
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def update(self, tick, duration):
+        self.__ticks += 1
+        self.__skipped += tick.skipped
+
+        if duration > self.__interval:
+            self.__overruns += 1
+
+        self.__jitter.update(tick.jitter)
+        self.__duration.update(duration)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['interval'] = self.interval
+        jdict['ticks'] = self.ticks
+        jdict['overruns'] = self.overruns
+        jdict['skipped'] = self.skipped
+
+        jdict['jitter'] = self.jitter
+        jdict['duration'] = self.duration
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    @property
+    def ticks(self):
+        return self.__ticks
+
+
+    @property
+    def overruns(self):
+        return self.__overruns
+
+
+    @property
+    def skipped(self):
+        return self.__skipped
+
+
+    @property
+    def jitter(self):
+        return self.__jitter
+
+
+    @property
+    def duration(self):
+        return self.__duration
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ScheduleMetrics:{interval:%s, ticks:%s, overruns:%s, skipped:%s, jitter:%s, duration:%s}" % \
+               (self.interval, self.ticks, self.overruns, self.skipped, self.jitter, self.duration)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TimingStats(JSONable):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__count = 0                                # int
+        self.__last = None                              # float seconds
+        self.__max = None                               # float seconds
+        self.__total = 0.0                              # float seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def update(self, value):
+        self.__count += 1
+        self.__last = value
+        self.__max = value if self.__max is None else max(self.__max, value)
+        self.__total += value
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['last'] = None if self.last is None else round(self.last, 3)
+        jdict['avg'] = None if self.avg is None else round(self.avg, 3)
+        jdict['max'] = None if self.max is None else round(self.max, 3)
+
+        return jdict
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def last(self):
+        return self.__last
+
+
+    @property
+    def avg(self):
+        return None if self.__count == 0 else self.__total / self.__count
+
+
+    @property
+    def max(self):
+        return self.__max
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "TimingStats:{last:%s, avg:%s, max:%s}" % (self.last, self.avg, self.max)
@@ -0,0 +1,68 @@
+"""
+Created on 31 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+A cache for PersistentJSONable configuration documents. A document is re-loaded only if its file has changed - that
+is, if its modification time or size has changed, or it has been created or deleted - since it was last loaded. The
+cost of an unchanged document is then a single stat() call.
+"""
+
+import os
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ConfCache(object):
+    """
+    classdocs
+    """
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host):
+        """
+        Constructor
+        """
+        self.__host = host                              # Host
+
+        self.__entries = {}                             # dict of class: (signature, PersistentJSONable)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def load(self, cls):
+        filename = os.path.join(*cls.persistence_location(self.__host))
+        signature = self.__signature(filename)
+
+        entry = self.__entries.get(cls)
+
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        conf = cls.load(self.__host)
+        self.__entries[cls] = (signature, conf)
+
+        return conf
+
+
+    def clear(self):
+        self.__entries = {}
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __signature(filename):
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ConfCache:{classes:%s}" % sorted(cls.__name__ for cls in self.__entries.keys())
@@ -0,0 +1,177 @@
+"""
+Created on 31 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Builds PsDatum reports directly from /proc, for those processes whose command line contains a given pattern, without
+running the ps and grep utilities. The scanning process itself is excluded.
+
+By default, pcpu is given as for ps - CPU time as a percentage of elapsed time, over the life of the process. If the
+scanner is used repeatedly, then interval=True gives pcpu as a percentage over the time since the previous scan
+instead - the first scan of a process is then reported over its lifetime.
+"""
+
+import os
+
+from scs_core.data.timedelta import Timedelta
+
+from scs_core.sys.ps_datum import PsDatum
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ProcScanner(object):
+    """
+    classdocs
+    """
+
+    PROC =              "/proc"
+
+    __CLOCK_TICKS =     os.sysconf('SC_CLK_TCK')
+    __PAGE_SIZE =       os.sysconf('SC_PAGE_SIZE')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def mem_total(cls):
+        with open(os.path.join(cls.PROC, "meminfo"), "r") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024           # kB
+
+        return None
+
+
+    @classmethod
+    def uptime(cls):
+        with open(os.path.join(cls.PROC, "uptime"), "r") as f:
+            return float(f.read().split()[0])
+
+
+    @staticmethod
+    def tty(tty_nr):
+        major = (tty_nr >> 8) & 0xfff
+        minor = (tty_nr & 0xff) | ((tty_nr >> 12) & 0xfff00)
+
+        if 136 <= major <= 143:
+            return "pts/%d" % (minor + (major - 136) * 256)
+
+        if major == 4:
+            return "tty%d" % minor if minor < 64 else "ttyS%d" % (minor - 64)
+
+        return "?"
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, pattern="SCS", interval=False):
+        """
+        Constructor
+        """
+        self.__pattern = pattern                        # string
+        self.__interval = interval                      # bool
+
+        self.__mem_total = self.mem_total()             # int bytes
+        self.__previous = {}                            # dict of (pid, start): (uptime, cpu seconds)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def scan(self):
+        uptime = self.uptime()
+        own_pid = os.getpid()
+
+        data = []
+        current = {}
+
+        for entry in os.listdir(self.PROC):
+            if not entry.isdigit() or int(entry) == own_pid:
+                continue
+
+            try:
+                datum, key, cpu_seconds = self.__datum(entry, uptime)
+            except (OSError, ValueError, IndexError):
+                continue                                # the process has exited, or is not readable
+
+            if datum is None:
+                continue
+
+            current[key] = (uptime, cpu_seconds)
+            data.append(datum)
+
+        self.__previous = current
+
+        return data
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __datum(self, entry, uptime):
+        path = os.path.join(self.PROC, entry)
+
+        # cmd...
+        with open(os.path.join(path, "cmdline"), "rb") as f:
+            cmd = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+
+        if not cmd or self.__pattern not in cmd:
+            return None, None, None
+
+        # stat - fields following the parenthesised command name...
+        with open(os.path.join(path, "stat"), "r") as f:
+            stat = f.read()
+
+        fields = stat[stat.rindex(')') + 2:].split()
+
+        ppid = int(fields[1])
+        tty_nr = int(fields[4])
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self.__CLOCK_TICKS
+        start_seconds = int(fields[19]) / self.__CLOCK_TICKS
+        rss = int(fields[21]) * self.__PAGE_SIZE
+
+        uid = os.stat(path).st_uid
+        pid = int(entry)
+        key = (pid, fields[19])
+
+        # pcpu...
+        elapsed_seconds = max(uptime - start_seconds, 0.0)
+        previous = self.__previous.get(key) if self.__interval else None
+
+        if previous is None:
+            period = elapsed_seconds
+            used = cpu_seconds
+
+        else:
+            period = uptime - previous[0]
+            used = cpu_seconds - previous[1]
+
+        pcpu = round(100.0 * used / period, 1) if period > 0 else 0.0
+
+        # pmem...
+        pmem = round(100.0 * rss / self.__mem_total, 1) if self.__mem_total else 0.0
+
+        cpu_time = Timedelta(seconds=int(cpu_seconds))
+        elapsed_time = Timedelta(seconds=int(elapsed_seconds))
+
+        datum = PsDatum(ppid, pid, uid, self.tty(tty_nr), pcpu, pmem, cpu_time, elapsed_time, cmd)
+
+        return datum, key, cpu_seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def pattern(self):
+        return self.__pattern
+
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return "ProcScanner:{pattern:%s, interval:%s, mem_total:%s}" % \
+               (self.pattern, self.interval, self.__mem_total)
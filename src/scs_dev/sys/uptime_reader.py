@@ -0,0 +1,85 @@
+"""
+Created on 31 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+Constructs an UptimeDatum from /proc/uptime, /proc/loadavg and the utmp login records, without running the uptime
+utility. As for the uptime report, the period is given to the whole minute, and users are counted by login session.
+
+/proc/uptime example:
+212345.67 401234.56
+
+/proc/loadavg example:
+0.66 0.65 0.60 1/123 4567
+"""
+
+import struct
+
+from scs_core.data.timedelta import Timedelta
+
+from scs_core.sys.uptime_datum import UptimeDatum, UptimeLoad
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class UptimeReader(object):
+    """
+    classdocs
+    """
+
+    UPTIME =            "/proc/uptime"
+    LOADAVG =           "/proc/loadavg"
+    UTMP =              "/var/run/utmp"
+
+    __UTMP_RECORD =     struct.Struct("hi32s4s32s")     # ut_type, ut_pid, ut_line, ut_id, ut_user
+    __UTMP_SIZE =       384                             # bytes per record (glibc, all architectures)
+    __USER_PROCESS =    7
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def period(cls):
+        with open(cls.UPTIME, "r") as f:
+            seconds = float(f.read().split()[0])
+
+        return Timedelta(minutes=int(seconds // 60))
+
+
+    @classmethod
+    def load(cls):
+        with open(cls.LOADAVG, "r") as f:
+            fields = f.read().split()
+
+        return UptimeLoad(fields[0], fields[1], fields[2])
+
+
+    @classmethod
+    def users(cls):
+        try:
+            f = open(cls.UTMP, "rb")
+        except FileNotFoundError:
+            return 0
+
+        users = 0
+
+        with f:
+            while True:
+                record = f.read(cls.__UTMP_SIZE)
+
+                if len(record) < cls.__UTMP_SIZE:
+                    break
+
+                ut_type, _, _, _, ut_user = cls.__UTMP_RECORD.unpack_from(record)
+
+                if ut_type == cls.__USER_PROCESS and ut_user.strip(b'\0'):
+                    users += 1
+
+        return users
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def datum(cls, time=None):
+        return UptimeDatum(time, cls.period(), cls.users(), cls.load())
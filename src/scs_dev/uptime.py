@@ -6,8 +6,10 @@ Created on 29 May 2017
 @author: Bruno Beloff (bruno.beloff@southcoastscience.com)
 
 DESCRIPTION
-The uptime utility is used to run the Unix uptime command. The utility present the output of the uptime command
-as a JSON document, making it suitable for analysis by a remote device management system.
+The uptime utility reports the same information as the Unix uptime command - the period since the host was started,
+the number of logged-in users, and the load averages - as a JSON document, making it suitable for analysis by a remote
+device management system. The information is read directly from /proc and the utmp login records, rather than by
+running the uptime command.
 
 The uptime report is included in the status_sampler report.
 
@@ -21,16 +23,19 @@ DOCUMENT EXAMPLE - OUTPUT
 {"time": "2018-04-05T14:27:00.877+00:00", "period": "00-00:18:00.000", "users": 3,
 "load": {"av1": 0.14, "av5": 0.09, "av15": 0.09}}
 
+FILES
+/proc/loadavg
+/proc/uptime
+/var/run/utmp
+
 SEE ALSO
 scs_dev/ps
 """
 
-import subprocess
-
 from scs_core.data.json import JSONify
 from scs_core.data.localized_datetime import LocalizedDatetime
 
-from scs_core.sys.uptime_datum import UptimeDatum
+from scs_dev.sys.uptime_reader import UptimeReader
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -42,9 +47,6 @@ if __name__ == '__main__':
 
     now = LocalizedDatetime.now()
 
-    raw = subprocess.check_output('uptime')
-    report = raw.decode()
-
-    datum = UptimeDatum.construct_from_report(now, report)
+    datum = UptimeReader.datum(now)
 
     print(JSONify.dumps(datum))
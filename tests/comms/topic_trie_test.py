@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+"""
+Created on 12 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+from scs_dev.comms.topic_trie import TopicTrie
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+trie = TopicTrie()
+
+trie.add("south-coast-science-dev/production-test/loc/1/gases", "gases")
+trie.add("south-coast-science-dev/production-test/loc/+/climate", "climate")
+trie.add("south-coast-science-dev/#", "all")
+
+print(trie)
+print("-")
+
+for topic in ("south-coast-science-dev/production-test/loc/1/gases",
+              "south-coast-science-dev/production-test/loc/2/climate",
+              "south-coast-science-dev",
+              "south-coast-science/production-test/loc/1/gases"):
+    print("%s: %s" % (topic, trie.match(topic)))
+
+print("-")
+
+for topic_filter in ("a/+/b", "a/#", "a/#/b", "a+"):
+    print("%s: %s" % (topic_filter, TopicTrie.is_valid_filter(topic_filter)))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+"""
+Created on 16 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import json
+
+from collections import OrderedDict
+
+from scs_dev.data.deadband_conf import DeadbandConf
+from scs_dev.data.deadband_filter import DeadbandFilter
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+conf_jstr = '{"heartbeat": 600, "fields": {"val.hmd": {"abs": 0.5}, "val.tmp": {"abs": 0.2, "rel": 0.01}, ' \
+            '"dgn": null}}'
+
+conf = DeadbandConf.construct_from_jdict(json.loads(conf_jstr, object_pairs_hook=OrderedDict))
+print(conf)
+print("-")
+
+jstrs = [
+    '{"rec": "2018-04-04T14:50:00.000+00:00", "val": {"hmd": 59.6, "tmp": 23.8}, "dgn": {"elapsed": 0.1}}',
+    '{"rec": "2018-04-04T14:50:10.000+00:00", "val": {"hmd": 59.9, "tmp": 23.9}, "dgn": {"elapsed": 0.2}}',
+    '{"rec": "2018-04-04T14:50:20.000+00:00", "val": {"hmd": 60.2, "tmp": 23.9}, "dgn": {"elapsed": 0.3}}',
+    '{"rec": "2018-04-04T14:50:30.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3}, "dgn": {"elapsed": 0.1}}',
+    '{"rec": "2018-04-04T14:55:30.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3}, "dgn": {"elapsed": 0.2}}',
+    '{"rec": "2018-04-04T15:00:30.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3}, "dgn": {"elapsed": 0.3}}',
+    '{"rec": "2018-04-04T15:00:40.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3}}',
+    '{"rec": "2018-04-04T15:00:50.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3}, "dgn": {"elapsed": 0.2}}',
+    '{"rec": "2018-04-04T15:01:00.000+00:00", "val": {"hmd": 60.2, "tmp": 24.3, "pm1": 1.2}}'
+]
+
+deadband = DeadbandFilter(conf)
+
+for jstr in jstrs:
+    document = json.loads(jstr, object_pairs_hook=OrderedDict)
+    print("%5s: %s" % (deadband.accept(document), jstr))
+
+print("-")
+print(deadband)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+"""
+Created on 9 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import json
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+
+from scs_dev.data.node_projection import NodeProjection
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+jstr = '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:27.641+00:00", ' \
+       '"val": {"CO": {"weV": 0.321, "cnc": 301.2}, "NO2": {"weV": 0.299, "cnc": 18.3}, "sht": {"hmd": 59.6}}}'
+
+document = json.loads(jstr, object_pairs_hook=OrderedDict)
+print(JSONify.dumps(document))
+print("-")
+
+projection = NodeProjection.construct(["val.sht"])
+print(projection)
+print(JSONify.dumps(projection.node(document)))
+print("-")
+
+projection = NodeProjection.construct(["rec", "val.*.cnc"])
+print(projection)
+print(JSONify.dumps(projection.project(document)))
+print("-")
+
+projection = NodeProjection.construct(["rec", "val.*.tmp"])
+print(projection)
+print(JSONify.dumps(projection.project(document)))
+print("missing: %s" % projection.missing)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Created on 15 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+import json
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONify
+
+from scs_dev.data.window_aggregator import WindowAggregator
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+jstrs = [
+    '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:05.000+00:00", "val": {"hmd": 59.6, "tmp": 23.8, "bin": [1, 2]}}',
+    '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:35.000+00:00", "val": {"hmd": 59.8, "tmp": 23.9, "bin": [3, 4]}}',
+    '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:51:05.000+00:00", "val": {"hmd": 60.1, "tmp": null, "bin": [5, 6]}}',
+    '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:50:55.000+00:00", "val": {"hmd": 60.2, "tmp": 24.0, "bin": [7, 8]}}',
+    '{"tag": "scs-ap1-6", "rec": "2018-04-04T14:51:35.000+00:00", "val": {"hmd": 60.4, "tmp": 24.1, "bin": [9, 0]}}'
+]
+
+samples = [json.loads(jstr, object_pairs_hook=OrderedDict) for jstr in jstrs]
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+aggregator = WindowAggregator(60)
+print(aggregator)
+print("tumbling...")
+
+for sample in samples:
+    for document in aggregator.append(sample):
+        print(JSONify.dumps(document))
+
+for document in aggregator.flush():
+    print(JSONify.dumps(document))
+
+print(aggregator)
+print("-")
+
+
+aggregator = WindowAggregator(60, 30)
+print(aggregator)
+print("sliding...")
+
+for sample in samples:
+    for document in aggregator.append(sample):
+        print(JSONify.dumps(document))
+
+for document in aggregator.flush():
+    print(JSONify.dumps(document))
+
+print(aggregator)
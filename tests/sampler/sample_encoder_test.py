@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Created on 13 Aug 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+
+microbenchmark: serialisation cost per sample, JSONify.dumps vs. SampleEncoder
+"""
+
+import json
+import timeit
+
+from collections import OrderedDict
+
+from scs_core.data.json import JSONable, JSONify
+from scs_core.data.localized_datetime import LocalizedDatetime
+
+from scs_dev.sampler.sample_encoder import SampleEncoder
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class Datum(JSONable):
+    """
+    classdocs
+    """
+
+    def __init__(self, jdict):
+        self.__jdict = jdict
+
+
+    def as_json(self):
+        return OrderedDict(self.__jdict)
+
+
+class Sample(JSONable):
+    """
+    classdocs
+    """
+
+    def __init__(self, tag, rec, val):
+        self.__tag = tag
+        self.__rec = rec
+        self.__val = val
+
+
+    def as_json(self):
+        jdict = OrderedDict()
+
+        jdict['tag'] = self.__tag
+        jdict['rec'] = self.__rec
+        jdict['val'] = self.__val
+
+        return jdict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+def load(jstr):
+    return json.loads(jstr, object_pairs_hook=OrderedDict)
+
+
+gases = OrderedDict((key, Datum(value)) for key, value in load(
+    '{"CO": {"weV": 0.34863, "aeV": 0.268817, "weC": 0.064464, "cnc": 237.0}, '
+    '"SO2": {"weV": 0.277004, "aeV": 0.276129, "weC": -0.000801, "cnc": 2.2}, '
+    '"H2S": {"weV": 0.258504, "aeV": 0.222316, "weC": -0.091086, "cnc": 7.2}, '
+    '"VOC": {"weV": 0.102127, "weC": 0.101793, "cnc": 1294.8}, '
+    '"sht": {"hmd": 54.4, "tmp": 21.6}}').items())
+
+particulates = Datum(load(
+    '{"per": 10.0, "pm1": 4.4, "pm2p5": 6.6, "pm10": 11.1, '
+    '"bins": {"0": 265, "1": 38, "2": 45, "3": 18, "4": 7, "5": 9, "6": 11, "7": 3, "8": 3, "9": 1, '
+    '"10": 0, "11": 0, "12": 0, "13": 0, "14": 0, "15": 0}, '
+    '"mtf1": 19, "mtf3": 27, "mtf5": 29, "mtf7": 29}'))
+
+samples = (("gases", Sample("scs-ap1-6", LocalizedDatetime.now(), gases)),
+           ("particulates", Sample("scs-ap1-6", LocalizedDatetime.now(), particulates)))
+
+iterations = 10000
+
+for name, sample in samples:
+    encoder = SampleEncoder()
+
+    print("%s: %s" % (name, encoder.encode(sample)))
+    print("%s: identical: %s" % (name, encoder.encode(sample) == JSONify.dumps(sample)))
+
+    before = min(timeit.repeat(lambda: JSONify.dumps(sample), number=iterations, repeat=5)) / iterations
+    after = min(timeit.repeat(lambda: encoder.encode(sample), number=iterations, repeat=5)) / iterations
+
+    print("%s: JSONify.dumps: %0.1f us  SampleEncoder: %0.1f us" % (name, before * 1e6, after * 1e6))
+    print(encoder)
+    print("-")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Created on 30 Jul 2018
+
+@author: Bruno Beloff (bruno.beloff@southcoastscience.com)
+"""
+
+from scs_core.data.json import JSONify
+
+from scs_dev.sync.monotonic_timer import MonotonicTimer
+from scs_dev.sync.schedule_metrics import ScheduleMetrics
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeClock(object):
+    """
+    classdocs
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+
+    def clock(self):
+        return self.now
+
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+fake = FakeClock()
+
+timer = MonotonicTimer(5.0, fake.clock, fake.sleep)
+metrics = ScheduleMetrics(timer.interval)
+
+print(timer)
+print("-")
+
+# sampler run durations: on time, a small overrun, then an overrun that misses two whole ticks...
+durations = [0.5, 0.5, 6.0, 0.5, 14.0, 0.5, 0.5]
+
+for duration in durations:
+    tick = timer.wait()
+
+    fake.now += duration
+    metrics.update(tick, duration)
+
+    print("%s jitter:%0.3f tally:%s" % (tick, tick.jitter, tick.tally))
+
+print("-")
+
+print(metrics)
+print(JSONify.dumps(metrics))